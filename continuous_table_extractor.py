@@ -2,29 +2,96 @@ import os
 import pandas as pd
 import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from webdriver_pool import WebDriverPool
+from page_wait import PageReadinessWaiter
+from host_scheduler import HostScheduler
+from tiled_capture import capture_page_tiled
+from http_fetch import HTTPFetcher
+from result_store import ResultStore
+from site_strategy import (SiteStrategyTable, analyze_static_html, decide_strategy, find_data_tables,
+                           STRATEGY_STATIC, STRATEGY_BROWSER)
 from PIL import Image
 import io
-import requests
 from bs4 import BeautifulSoup
 import matplotlib.pyplot as plt
 import numpy as np
 import urllib3
 import tempfile
 import base64
-import ssl
+import threading
 from urllib.parse import urlparse
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 모든 <table>의 메타데이터를 한 번에 수집하는 스크립트
+# (위치는 문서 기준 좌표, 행/열 수는 find_elements 기반 계산과 동일한 방식)
+TABLE_METADATA_SCRIPT = """
+var scrollX = window.scrollX || window.pageXOffset;
+var scrollY = window.scrollY || window.pageYOffset;
+return Array.prototype.map.call(document.getElementsByTagName('table'), function(table) {
+    var rect = table.getBoundingClientRect();
+    var style = window.getComputedStyle(table);
+    var visible = style.display !== 'none' && style.visibility !== 'hidden' &&
+        parseFloat(style.opacity || '1') > 0 && (rect.width > 0 || rect.height > 0);
+    var rows = table.getElementsByTagName('tr');
+    var columns = rows.length > 0 ? rows[0].querySelectorAll('th, td').length : 0;
+    return {
+        visible: visible,
+        x: rect.left + scrollX,
+        y: rect.top + scrollY,
+        width: rect.width,
+        height: rect.height,
+        text: (table.innerText || '').substring(0, 1000),
+        rows: rows.length,
+        columns: columns,
+        outer_html: table.outerHTML
+    };
+});
+"""
+
 class ContinuousPNGTableExtractor:
-    def __init__(self, excel_filename="Medical_Table_Results.xlsx"):
+    def __init__(self, excel_filename="Medical_Table_Results.xlsx", pool_size=1,
+                 max_pages_per_driver=50, max_memory_mb=1500, wait_mode='adaptive', page_timeout=60,
+                 workers=1, max_per_host=1, host_interval=2.0, crop_from_full_page=False,
+                 tiled_threshold=10000, static_first=True, refresh=False):
         self.excel_filename = excel_filename
+        
+        # 공유 HTTP 계층 (호스트별 연결 재사용, 재시도, 조건부 GET 캐시)
+        self.http_fetcher = HTTPFetcher(pool_maxsize=max(10, workers))
+        # 이미 처리한 URL도 조건부 GET으로 변경 여부를 확인하여 변경된 페이지만 재처리
+        self.refresh = refresh
+        self.refresh_origins = {}  # 재처리할 기존 URL → 기존 Origin Number (제자리 갱신)
+        
+        # 정적 HTML 우선 처리 (테이블이 없거나 스크립트로 생성될 때만 브라우저 사용)
+        self.static_first = static_first
+        self.strategy_table = SiteStrategyTable()
+        
+        # 이 높이(px)를 넘는 페이지는 스트립 단위 타일 캡처 (렌더러 메모리 제한)
+        self.tiled_threshold = tiled_threshold
+        
+        # 전체 페이지를 한 번만 캡처하고 테이블은 메모리에서 잘라내기
+        self.crop_from_full_page = crop_from_full_page
+        
+        # 동시 처리 설정 (워커마다 브라우저 1개, 호스트별 동시 접속/요청 간격 제한)
+        self.workers = max(1, workers)
+        self.max_per_host = max_per_host
+        self.host_interval = host_interval
+        self.save_lock = threading.Lock()
+        
+        # 페이지 대기 방식 ('adaptive': 이벤트 기반, 'fixed': 고정 sleep)
+        self.wait_mode = wait_mode
+        self.page_timeout = page_timeout
+        
+        # WebDriver 풀 설정 (브라우저 재사용)
+        self.pool_size = max(pool_size, self.workers)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_memory_mb = max_memory_mb
+        self.driver_pool = None
+        self.render_pool = None
+        
         self.setup_directories()
         self.existing_data = self.load_existing_data()
         
@@ -35,37 +102,22 @@ class ContinuousPNGTableExtractor:
         print("디렉토리 설정 완료")
         
     def load_existing_data(self):
-        """기존 엑셀 파일에서 데이터 로드"""
+        """결과 저장소(SQLite)에서 기존 URL과 최대 Origin Number 로드"""
         try:
-            if os.path.exists(self.excel_filename):
-                main_df = pd.read_excel(self.excel_filename, sheet_name='Main Results')
-                table_df = pd.read_excel(self.excel_filename, sheet_name='Table Details')
-                
-                print(f"기존 엑셀 파일 로드: {len(main_df)}개 URL 기록")
-                
-                return {
-                    'main_data': main_df.to_dict('records'),
-                    'table_data': table_df.to_dict('records'),
-                    'existing_urls': set(main_df['URL'].tolist()),
-                    'max_origin_number': main_df['Origin Number'].max() if len(main_df) > 0 else -1
-                }
-            else:
-                print("새로운 엑셀 파일을 생성합니다.")
-                return {
-                    'main_data': [],
-                    'table_data': [],
-                    'existing_urls': set(),
-                    'max_origin_number': -1
-                }
-                
-        except Exception as e:
-            print(f"기존 엑셀 파일 로드 실패: {e}")
+            # 저장소가 처음 생성되면 기존 엑셀 파일 기록을 가져옴
+            self.result_store = ResultStore(self.excel_filename)
+            max_origin_number = self.result_store.max_origin_number()
+            
+            print(f"결과 저장소 로드: {self.result_store.count_main()}개 URL 기록")
+            
             return {
-                'main_data': [],
-                'table_data': [],
-                'existing_urls': set(),
-                'max_origin_number': -1
+                'existing_urls': self.result_store.existing_urls(),
+                'max_origin_number': max_origin_number if max_origin_number is not None else -1
             }
+                
+        except Exception as e:
+            print(f"결과 저장소 로드 실패: {e}")
+            raise
     
     def get_next_origin_number(self):
         """다음 Origin Number 반환"""
@@ -88,9 +140,43 @@ class ContinuousPNGTableExtractor:
         
         print(f"총 {len(new_urls)}개의 새로운 URL을 처리합니다.")
         return new_urls
+    
+    def find_changed_urls(self, urls):
+        """이미 처리한 URL 중 변경이 확인된 URL만 반환 (304 또는 본문 해시가 같으면 건너뜀)
+
+        변경된 URL은 기존 Origin Number와 함께 refresh_origins에 기록하여 같은 Origin으로 재처리
+        """
+        existing_urls = self.existing_data['existing_urls']
+        changed_urls = []
         
-    def setup_webdriver(self):
-        """Chrome WebDriver 설정 - 데스크톱 버전 강제"""
+        print(f"\n=== 기존 URL 변경 확인 (조건부 GET) ===")
+        
+        for url in urls:
+            if url not in existing_urls:
+                continue
+            try:
+                unchanged = self.http_fetcher.check_unchanged(url)
+            except Exception as e:
+                print(f"변경 확인 실패 (건너뜀): {url} - {e}")
+                continue
+            
+            if unchanged is True:
+                print(f"변경 없음 (건너뜀): {url}")
+            elif unchanged is False:
+                origin_number = self.result_store.origin_for_url(url)
+                if origin_number is None:
+                    continue
+                self.refresh_origins[url] = origin_number
+                changed_urls.append(url)
+                print(f"변경된 URL (Origin {origin_number} 재처리예정): {url}")
+            else:
+                print(f"비교 기준 없음 - 캐시만 기록 (건너뜀): {url}")
+        
+        print(f"총 {len(changed_urls)}개의 변경된 URL을 재처리합니다.")
+        return changed_urls
+        
+    def create_chrome_options(self):
+        """Chrome 옵션 생성 - 데스크톱 버전 강제"""
         chrome_options = Options()
         
         # 데스크톱 버전 강제 설정
@@ -115,17 +201,43 @@ class ContinuousPNGTableExtractor:
         chrome_options.add_experimental_option("useAutomationExtension", False)
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         
+        # 네트워크 유휴 감지를 위한 DevTools performance 로그
+        if self.wait_mode == 'adaptive':
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
+        return chrome_options
+    
+    def create_page_waiter(self):
+        """URL별 페이지 준비 상태 대기 객체 생성"""
+        return PageReadinessWaiter(mode=self.wait_mode, timeout=self.page_timeout)
+    
+    def get_driver_pool(self):
+        """WebDriver 풀 반환 (최초 호출 시 생성)"""
+        if self.driver_pool is None:
+            self.driver_pool = WebDriverPool(
+                self.create_chrome_options,
+                size=self.pool_size,
+                max_pages_per_driver=self.max_pages_per_driver,
+                max_memory_mb=self.max_memory_mb
+            )
+        return self.driver_pool
+    
+    def setup_webdriver(self):
+        """Chrome WebDriver 설정 - 풀에서 브라우저 가져오기"""
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # 윈도우 크기 명시적 설정
-            driver.set_window_size(1920, 1080)
-            
-            return driver
+            return self.get_driver_pool().acquire()
         except Exception as e:
             print(f"WebDriver 설정 실패: {e}")
             return None
+    
+    def close_webdrivers(self):
+        """풀의 모든 브라우저 종료"""
+        if self.driver_pool is not None:
+            self.driver_pool.close_all()
+            self.driver_pool = None
+        if self.render_pool is not None:
+            self.render_pool.close_all()
+            self.render_pool = None
         
     def read_urls(self, filename="urls.txt"):
         """URL 파일 읽기"""
@@ -138,13 +250,14 @@ class ContinuousPNGTableExtractor:
             print(f"URL 파일 '{filename}'을 찾을 수 없습니다.")
             return []
     
-    def scroll_page_completely(self, driver):
+    def scroll_page_completely(self, driver, waiter=None):
         """페이지 전체를 천천히 스크롤하여 모든 콘텐츠 로드"""
         print("페이지 스크롤 시작...")
+        waiter = waiter or self.create_page_waiter()
         
         # 페이지 상단으로 이동
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(3)
+        waiter.wait_for_settle(driver, 3)
         
         # 페이지 높이 가져오기
         last_height = driver.execute_script("return document.body.scrollHeight")
@@ -155,7 +268,7 @@ class ContinuousPNGTableExtractor:
             # 현재 위치에서 500px씩 스크롤 (속도 향상)
             scroll_position += 500
             driver.execute_script(f"window.scrollTo(0, {scroll_position});")
-            time.sleep(0.2)
+            waiter.wait_for_settle(driver, 0.2, quiet_ms=100)
             
             # 페이지 높이 다시 확인 (동적 콘텐츠 로딩)
             current_height = driver.execute_script("return document.body.scrollHeight")
@@ -164,29 +277,30 @@ class ContinuousPNGTableExtractor:
         
         # 페이지 맨 끝까지 스크롤
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
+        waiter.wait_for_settle(driver, 1)
         
         # 페이지 상단으로 돌아가기
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
+        waiter.wait_for_settle(driver, 1)
         
         print("페이지 스크롤 완료")
     
-    def save_page_as_png(self, driver, url, png_filename):
+    def save_page_as_png(self, driver, url, png_filename, waiter=None):
         """웹페이지를 PNG로 저장 (전체 페이지)"""
         try:
             print(f"PNG 저장 시작: {png_filename}")
+            waiter = waiter or self.create_page_waiter()
             
             # 페이지 로딩 대기
             WebDriverWait(driver, 20).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # 추가 로딩 대기
-            time.sleep(5)
+            # 추가 로딩 대기 (readyState + 네트워크 유휴 + DOM 정지)
+            waiter.wait_until_ready(driver, fallback_seconds=5)
             
             # 페이지 전체 스크롤
-            self.scroll_page_completely(driver)
+            self.scroll_page_completely(driver, waiter)
             
             # 전체 페이지 높이와 너비 가져오기
             total_height = driver.execute_script("return Math.max( document.body.scrollHeight, document.body.offsetHeight, document.documentElement.clientHeight, document.documentElement.scrollHeight, document.documentElement.offsetHeight );")
@@ -194,13 +308,20 @@ class ContinuousPNGTableExtractor:
             
             print(f"페이지 크기: {total_width} x {total_height}")
             
+            # 매우 긴 페이지는 스트립 단위로 캡처하여 PNG로 스트리밍 저장
+            if total_height > self.tiled_threshold:
+                print(f"긴 페이지 감지 ({total_height}px > {self.tiled_threshold}px) - 타일 캡처 사용")
+                capture_page_tiled(driver, png_filename, total_width, total_height, waiter)
+                print(f"PNG 저장 완료: {png_filename}")
+                return True
+            
             # 윈도우 크기를 페이지 크기에 맞게 조정
             driver.set_window_size(total_width, total_height)
-            time.sleep(2)
+            waiter.wait_for_settle(driver, 2)
             
             # 페이지 상단으로 이동
             driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(2)
+            waiter.wait_for_settle(driver, 2)
             
             # 전체 페이지 스크린샷
             screenshot = driver.get_screenshot_as_png()
@@ -216,36 +337,117 @@ class ContinuousPNGTableExtractor:
             print(f"PNG 저장 실패: {e}")
             return False
     
-    def capture_tables_as_images(self, driver, origin_number):
-        """페이지의 테이블들을 이미지로 캡처"""
+    def capture_full_page_image(self, driver):
+        """CDP Page.captureScreenshot(captureBeyondViewport)으로 윈도우 크기 변경 없이 전체 페이지 캡처"""
+        metrics = driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+        content_size = metrics.get('cssContentSize') or metrics['contentSize']
+        width = int(content_size['width'])
+        height = int(content_size['height'])
+        
+        print(f"페이지 크기: {width} x {height}")
+        
+        screenshot = driver.execute_cdp_cmd('Page.captureScreenshot', {
+            'format': 'png',
+            'captureBeyondViewport': True,
+            'clip': {'x': 0, 'y': 0, 'width': width, 'height': height, 'scale': 1}
+        })
+        png_bytes = base64.b64decode(screenshot['data'])
+        page_image = Image.open(io.BytesIO(png_bytes))
+        page_image.load()
+        
+        # CSS 픽셀 → 비트맵 픽셀 배율
+        scale = page_image.width / width if width else 1.0
+        return page_image, png_bytes, scale
+    
+    def save_page_as_png_cdp(self, driver, url, png_filename, waiter=None):
+        """웹페이지를 한 번의 CDP 캡처로 PNG 저장하고, 테이블 잘라내기용 비트맵 반환
+        
+        반환: (성공 여부, 페이지 비트맵, 배율) - 타일 캡처한 긴 페이지는 비트맵 없이 (True, None, None)
+        """
+        try:
+            print(f"PNG 저장 시작 (CDP 전체 캡처): {png_filename}")
+            waiter = waiter or self.create_page_waiter()
+            
+            # 페이지 로딩 대기
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+            waiter.wait_until_ready(driver, fallback_seconds=5)
+            
+            # 페이지 전체 스크롤 (지연 로딩 콘텐츠)
+            self.scroll_page_completely(driver, waiter)
+            
+            # 매우 긴 페이지는 전체 비트맵을 만들지 않고 타일 캡처 (테이블은 요소별 캡처)
+            metrics = driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+            content_size = metrics.get('cssContentSize') or metrics['contentSize']
+            if content_size['height'] > self.tiled_threshold:
+                print(f"긴 페이지 감지 ({int(content_size['height'])}px > {self.tiled_threshold}px) - 타일 캡처 사용")
+                capture_page_tiled(driver, png_filename, int(content_size['width']), int(content_size['height']), waiter)
+                print(f"PNG 저장 완료: {png_filename}")
+                return True, None, None
+            
+            page_image, png_bytes, scale = self.capture_full_page_image(driver)
+            
+            # PNG 파일 저장
+            with open(png_filename, 'wb') as f:
+                f.write(png_bytes)
+            
+            print(f"PNG 저장 완료: {png_filename}")
+            return True, page_image, scale
+            
+        except Exception as e:
+            print(f"PNG 저장 실패: {e}")
+            return False, None, None
+    
+    def crop_table_from_page_image(self, page_image, scale, meta, table_filename):
+        """전체 페이지 비트맵에서 테이블 영역을 잘라 저장"""
+        left = max(0, int(round(meta['x'] * scale)))
+        top = max(0, int(round(meta['y'] * scale)))
+        right = min(page_image.width, int(round((meta['x'] + meta['width']) * scale)))
+        bottom = min(page_image.height, int(round((meta['y'] + meta['height']) * scale)))
+        
+        if right <= left or bottom <= top:
+            raise ValueError(f"잘라낼 영역이 페이지 밖에 있습니다: ({left}, {top}, {right}, {bottom})")
+        
+        page_image.crop((left, top, right, bottom)).save(table_filename, "PNG")
+    
+    def collect_table_metadata(self, driver):
+        """한 번의 JavaScript 호출로 모든 테이블의 표시 여부, 위치, 크기, 텍스트, 행/열 수, HTML 수집"""
+        return driver.execute_script(TABLE_METADATA_SCRIPT)
+    
+    def capture_tables_as_images(self, driver, origin_number, waiter=None, page_image=None, page_scale=1.0):
+        """페이지의 테이블들을 이미지로 캡처
+        
+        page_image가 주어지면 요소별 스크린샷 대신 전체 페이지 비트맵에서 잘라냄
+        """
         try:
             print("테이블 검색 및 캡처 시작...")
+            waiter = waiter or self.create_page_waiter()
             
-            # 모든 테이블 요소 찾기
-            tables = driver.find_elements(By.TAG_NAME, "table")
+            # 모든 테이블 메타데이터를 한 번에 수집 (테이블별 WebDriver 왕복 제거)
+            metadata = self.collect_table_metadata(driver)
             
-            if not tables:
+            if not metadata:
                 print("테이블을 찾을 수 없습니다.")
                 return []
             
-            print(f"{len(tables)}개의 테이블을 발견했습니다.")
+            print(f"{len(metadata)}개의 테이블을 발견했습니다.")
+            
+            # 스크린샷용 요소 목록 (문서 순서가 메타데이터와 동일)
+            tables = driver.find_elements(By.TAG_NAME, "table") if page_image is None else []
             
             table_info = []
             
-            for i, table in enumerate(tables):
+            for i, meta in enumerate(metadata):
                 try:
                     # 테이블이 보이는지 확인
-                    if not table.is_displayed():
+                    if not meta['visible']:
                         print(f"테이블 {i}이 숨겨져 있어 건너뜁니다. (엑셀 기록 제외)")
                         continue
                     
-                    # 테이블이 화면에 보이도록 스크롤
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", table)
-                    time.sleep(2)
-                    
                     # 테이블 크기 확인
-                    size = table.size
-                    location = table.location
+                    size = {'width': int(round(meta['width'])), 'height': int(round(meta['height']))}
+                    location = {'x': int(round(meta['x'])), 'y': int(round(meta['y']))}
                     
                     print(f"테이블 {i} 정보: 위치({location['x']}, {location['y']}), 크기({size['width']}x{size['height']})")
                     
@@ -253,44 +455,43 @@ class ContinuousPNGTableExtractor:
                         print(f"테이블 {i}이 너무 작아 건너뜁니다. (엑셀 기록 제외)")
                         continue
                     
-                    # 테이블 스크린샷 촬영
                     table_filename = f"Medical/Table/M_table_{origin_number}_{i}.png"
-                    table.screenshot(table_filename)
                     
-                    # 테이블 정보 수집
-                    try:
-                        # 텍스트 추출을 더 안전하게
-                        try:
-                            table_text = table.text
-                            if not table_text or table_text.strip() == "":
-                                table_text = "텍스트 없음"
-                            else:
-                                table_text = table_text[:200].replace('\n', ' ').strip()
-                        except:
-                            table_text = "텍스트 추출 실패"
+                    if page_image is not None:
+                        # 전체 페이지 비트맵에서 잘라내기 (스크롤/대기/추가 캡처 없음)
+                        self.crop_table_from_page_image(page_image, page_scale, meta, table_filename)
+                    else:
+                        if i >= len(tables):
+                            print(f"테이블 {i} 요소를 찾을 수 없어 건너뜁니다.")
+                            continue
+                        table = tables[i]
                         
-                        # 테이블 행/열 수 계산
-                        try:
-                            rows = len(table.find_elements(By.TAG_NAME, "tr"))
-                            if rows > 0:
-                                first_row_elements = table.find_elements(By.TAG_NAME, "tr")
-                                if first_row_elements:
-                                    first_row = first_row_elements[0]
-                                    th_elements = first_row.find_elements(By.TAG_NAME, "th")
-                                    td_elements = first_row.find_elements(By.TAG_NAME, "td")
-                                    cols = len(th_elements) + len(td_elements)
-                                else:
-                                    cols = 0
-                            else:
-                                cols = 0
-                        except Exception as row_error:
-                            print(f"테이블 {i} 행/열 계산 오류: {row_error}")
-                            rows, cols = 0, 0
+                        # 테이블이 화면에 보이도록 스크롤
+                        if waiter.mode == 'adaptive':
+                            driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", table)
+                        else:
+                            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", table)
+                        waiter.wait_for_settle(driver, 2, quiet_ms=100)
                         
-                    except Exception as text_error:
-                        print(f"테이블 {i} 정보 추출 오류: {text_error}")
-                        table_text = f"Table {i} (정보 추출 실패)"
-                        rows, cols = 0, 0
+                        # 테이블 스크린샷 촬영
+                        table.screenshot(table_filename)
+                    
+                    # 테이블 HTML 원본 저장
+                    html_filename = f"Medical/Context/Origin/M_table_{origin_number}_{i}.html"
+                    try:
+                        with open(html_filename, 'w', encoding='utf-8') as f:
+                            f.write(meta['outer_html'])
+                    except Exception as html_error:
+                        print(f"테이블 {i} HTML 저장 실패: {html_error}")
+                    
+                    # 테이블 정보 (수집된 메타데이터 사용)
+                    table_text = meta['text'] or ""
+                    if table_text.strip() == "":
+                        table_text = "텍스트 없음"
+                    else:
+                        table_text = table_text[:200].replace('\n', ' ').strip()
+                    rows = meta['rows']
+                    cols = meta['columns'] if rows > 0 else 0
                     
                     table_info.append({
                         'table_number': i,
@@ -316,27 +517,41 @@ class ContinuousPNGTableExtractor:
             print(f"테이블 캡처 중 오류 발생: {e}")
             return []
 
-    def render_html_table_as_image(self, table_html, table_counter, origin_number):
-        """HTML 테이블을 웹브라우저처럼 렌더링하여 이미지로 캡처"""
-        try:
-            # Chrome 옵션 설정
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1200,800')
-            
-            # 한글 폰트 지원을 위한 설정
-            chrome_options.add_argument('--font-render-hinting=none')
-            chrome_options.add_argument('--disable-font-subpixel-positioning')
-            
-            # WebDriver 초기화
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # 스타일이 포함된 HTML 생성
-            html_content = f"""
+    def create_render_options(self):
+        """HTML 테이블 렌더링용 Chrome 옵션 생성"""
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1200,800')
+        
+        # 한글 폰트 지원을 위한 설정
+        chrome_options.add_argument('--font-render-hinting=none')
+        chrome_options.add_argument('--disable-font-subpixel-positioning')
+        
+        return chrome_options
+    
+    def get_render_pool(self):
+        """HTML 테이블 렌더링용 WebDriver 풀 반환 (최초 호출 시 생성)"""
+        if self.render_pool is None:
+            self.render_pool = WebDriverPool(
+                self.create_render_options,
+                size=self.pool_size,
+                max_pages_per_driver=self.max_pages_per_driver,
+                max_memory_mb=self.max_memory_mb,
+                window_size=(1200, 800)
+            )
+        return self.render_pool
+    
+    def build_tables_html_document(self, tables):
+        """여러 HTML 테이블을 하나의 스타일 적용 문서로 합치기"""
+        panels_html = "\n".join(
+            f'<div class="panel" id="render_table_{table_counter}">{table_html}</div>'
+            for table_counter, table_html in tables
+        )
+        
+        return f"""
             <!DOCTYPE html>
             <html>
             <head>
@@ -376,88 +591,129 @@ class ContinuousPNGTableExtractor:
                 </style>
             </head>
             <body>
-                <div class="panel">
-                    {table_html}
-                </div>
+                {panels_html}
             </body>
             </html>
             """
+    
+    def wait_for_render_ready(self, driver, timeout=10):
+        """문서 로딩과 웹폰트 로딩이 끝날 때까지 대기 (고정 sleep 대신)"""
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script(
+                "return document.readyState === 'complete' && "
+                "(!document.fonts || document.fonts.status === 'loaded');"
+            )
+        )
+    
+    def render_html_tables_as_images(self, tables, origin_number):
+        """여러 HTML 테이블을 한 번의 브라우저 세션에서 렌더링하여 각각 이미지로 캡처
+        
+        tables: (table_counter, table_html) 목록
+        반환: {table_counter: png_filename} (실패한 테이블은 None)
+        """
+        rendered = {table_counter: None for table_counter, _ in tables}
+        if not tables:
+            return rendered
+        
+        pool = self.get_render_pool()
+        driver = None
+        driver_broken = False
+        temp_html_path = None
+        
+        try:
+            driver = pool.acquire()
             
-            # 임시 HTML 파일 생성
+            # 모든 테이블을 하나의 임시 HTML 파일로 저장
             with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
+                f.write(self.build_tables_html_document(tables))
                 temp_html_path = f.name
             
-            try:
-                # HTML 파일 로드
-                driver.get(f'file://{temp_html_path}')
-                time.sleep(2)  # 렌더링 대기
-                
-                # 테이블 요소 찾기 및 캡처
-                table_element = driver.find_element(By.TAG_NAME, 'table')
-                
-                # PNG 파일명
-                png_filename = f"Medical/Table/M_table_{origin_number}_{table_counter}.png"
-                os.makedirs(os.path.dirname(png_filename), exist_ok=True)
-                
-                # 스크린샷 저장
-                table_element.screenshot(png_filename)
-                
-                return png_filename
-                
-            finally:
-                driver.quit()
-                # 임시 파일 삭제
+            # HTML 파일 한 번만 로드
+            driver.get(f'file://{temp_html_path}')
+            self.wait_for_render_ready(driver)
+            
+            os.makedirs("Medical/Table", exist_ok=True)
+            
+            for table_counter, _ in tables:
+                try:
+                    panel = driver.find_element(By.ID, f"render_table_{table_counter}")
+                    table_element = panel.find_element(By.TAG_NAME, 'table')
+                    
+                    # PNG 파일명
+                    png_filename = f"Medical/Table/M_table_{origin_number}_{table_counter}.png"
+                    
+                    # 스크린샷 저장
+                    table_element.screenshot(png_filename)
+                    rendered[table_counter] = png_filename
+                    
+                except Exception as e:
+                    print(f"HTML 테이블 {table_counter} 렌더링 실패: {e}")
+            
+            print(f"HTML 테이블 일괄 렌더링 완료: {sum(1 for v in rendered.values() if v)}/{len(tables)}개")
+            
+        except Exception as e:
+            print(f"HTML 테이블 일괄 렌더링 실패: {e}")
+            driver_broken = True
+            
+        finally:
+            if driver:
+                pool.release(driver, broken=driver_broken)
+            # 임시 파일 삭제
+            if temp_html_path:
                 try:
                     os.unlink(temp_html_path)
                 except:
                     pass
-                    
-        except Exception as e:
-            print(f"HTML 테이블 렌더링 실패: {e}")
-            return None
+        
+        return rendered
+
+    def render_html_table_as_image(self, table_html, table_counter, origin_number):
+        """HTML 테이블을 웹브라우저처럼 렌더링하여 이미지로 캡처"""
+        return self.render_html_tables_as_images([(table_counter, table_html)], origin_number)[table_counter]
 
-    def extract_hidden_tables_from_url(self, url, origin_number):
-        """URL에서 HTML 직접 다운로드하여 panel 블록의 테이블 추출"""
+    def fetch_static_html(self, url):
+        """공유 HTTP 계층으로 HTML 다운로드 (SSL 인증 우회, 캐시/재시도 포함)"""
+        result = self.http_fetcher.fetch(url)
+        if result.not_modified:
+            print(f"변경 없음 (304) - 캐시된 HTML 사용: {url}")
+        return result.text
+    
+    def extract_hidden_tables_from_url(self, url, origin_number, html_text=None, soup=None):
+        """URL에서 HTML 직접 다운로드하여 panel 블록(없으면 페이지 전체)의 테이블 추출"""
         try:
             print(f"HTML 직접 다운로드 및 테이블 추출: {url}")
             
-            # SSL 인증 우회 설정
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # requests로 HTML 다운로드
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, verify=False, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
+            if html_text is None:
+                html_text = self.fetch_static_html(url)
             
             # BeautifulSoup으로 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
+            if soup is None:
+                soup = BeautifulSoup(html_text, 'html.parser')
             
-            # davoshospital.co.kr에서만 전체 HTML 저장
-            if 'davoshospital.co.kr' in url:
-                html_filename = f"Medical/Context/Origin/M_origin_{origin_number}.html"
-                os.makedirs(os.path.dirname(html_filename), exist_ok=True)
-                with open(html_filename, 'w', encoding='utf-8') as f:
-                    f.write(response.text)
-                print(f"전체 HTML 페이지 저장: {html_filename}")
+            # 브라우저 캡처가 없으므로 전체 HTML을 원본으로 저장
+            html_filename = f"Medical/Context/Origin/M_origin_{origin_number}.html"
+            os.makedirs(os.path.dirname(html_filename), exist_ok=True)
+            with open(html_filename, 'w', encoding='utf-8') as f:
+                f.write(html_text)
+            print(f"전체 HTML 페이지 저장: {html_filename}")
             
-            # panel 블록 찾기
+            # panel 블록 찾기 (없으면 페이지의 데이터 테이블 - 레이아웃 테이블 안쪽의 실제 표)
             panels = soup.find_all('div', class_='panel')
             print(f"발견된 panel 블록 수: {len(panels)}")
+            
+            if panels:
+                containers = [(f"panel[{p_idx}]", panel.find_all('table')) for p_idx, panel in enumerate(panels)]
+                extraction_method = 'html_panel_table_extraction'
+            else:
+                containers = [("page", find_data_tables(soup))]
+                extraction_method = 'html_static_table_extraction'
 
-            table_info = []
+            parsed_tables = []
             table_counter = 0
 
-            for p_idx, panel in enumerate(panels):
+            for container_label, tables in containers:
                 # panel 내부의 모든 table 태그
-                tables = panel.find_all('table')
-                print(f" panel {p_idx}: 테이블 {len(tables)}개 발견")
+                print(f" {container_label}: 테이블 {len(tables)}개 발견")
 
                 for t_idx, table in enumerate(tables):
                     # 판다스로 테이블 파싱 시도 (PNG 생성용)
@@ -472,47 +728,51 @@ class ContinuousPNGTableExtractor:
                         print(f"테이블 {table_counter}에 파싱 가능한 데이터가 없습니다. 건너뜀니다.")
                         continue
 
-                    df = dfs[0]
-                    
-                    # 테이블 HTML은 이미 전체 페이지로 저장됨
+                    parsed_tables.append((table_counter, str(table), dfs[0], f"{container_label} table[{t_idx}]"))
+                    table_counter += 1
 
-                    # 저장: PNG (웹브라우저 스타일 렌더링)
-                    print(f"HTML 테이블 렌더링 시도 중: 테이블 {table_counter}")
-                    png_filename = self.render_html_table_as_image(str(table), table_counter, origin_number)
-                    print(f"HTML 렌더링 결과: {png_filename}")
-                    if png_filename is None:
-                        # 실패시 fallback - 간단한 텍스트 이미지 생성
-                        png_filename = f"Medical/Table/M_table_{origin_number}_{table_counter}.png"
-                        try:
-                            fig, ax = plt.subplots(figsize=(10, 6))
-                            ax.text(0.5, 0.5, f'테이블 {table_counter}\n({len(df)} 행 x {len(df.columns)} 열)\n\n웹 렌더링 실패', 
-                                   ha='center', va='center', fontsize=14, 
-                                   bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
-                            ax.set_xlim(0, 1)
-                            ax.set_ylim(0, 1)
-                            ax.axis('off')
-                            plt.tight_layout()
-                            fig.savefig(png_filename, dpi=150, bbox_inches='tight')
-                            plt.close(fig)
-                        except Exception as e:
-                            print(f"fallback 이미지 생성 실패: {e}")
-                            png_filename = f"Medical/Table/M_table_{origin_number}_{table_counter}.png"
+            # 저장: PNG (웹브라우저 스타일 렌더링) - 페이지의 모든 테이블을 한 세션에서 렌더링
+            print(f"HTML 테이블 일괄 렌더링 시도 중: {len(parsed_tables)}개")
+            rendered = self.render_html_tables_as_images(
+                [(counter, table_html) for counter, table_html, _, _ in parsed_tables],
+                origin_number
+            )
 
-                    # 기본 메타 정보
-                    table_entry = {
-                        'table_number': table_counter,
-                        'filename': png_filename,
-                        'preview_text': ' | '.join(df.head(2).astype(str).fillna('').values.flatten()[:10]),
-                        'rows': len(df),
-                        'columns': len(df.columns),
-                        'size': f"{len(df)}x{len(df.columns)}",
-                        'image_size': None,
-                        'position': f"panel[{p_idx}] table[{t_idx}]",
-                        'extraction_method': 'html_panel_table_extraction'
-                    }
+            table_info = []
 
-                    table_info.append(table_entry)
-                    table_counter += 1
+            for counter, _, df, position in parsed_tables:
+                png_filename = rendered.get(counter)
+                if png_filename is None:
+                    # 실패시 fallback - 간단한 텍스트 이미지 생성
+                    png_filename = f"Medical/Table/M_table_{origin_number}_{counter}.png"
+                    try:
+                        fig, ax = plt.subplots(figsize=(10, 6))
+                        ax.text(0.5, 0.5, f'테이블 {counter}\n({len(df)} 행 x {len(df.columns)} 열)\n\n웹 렌더링 실패', 
+                               ha='center', va='center', fontsize=14, 
+                               bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
+                        ax.set_xlim(0, 1)
+                        ax.set_ylim(0, 1)
+                        ax.axis('off')
+                        plt.tight_layout()
+                        fig.savefig(png_filename, dpi=150, bbox_inches='tight')
+                        plt.close(fig)
+                    except Exception as e:
+                        print(f"fallback 이미지 생성 실패: {e}")
+
+                # 기본 메타 정보
+                table_entry = {
+                    'table_number': counter,
+                    'filename': png_filename,
+                    'preview_text': ' | '.join(df.head(2).astype(str).fillna('').values.flatten()[:10]),
+                    'rows': len(df),
+                    'columns': len(df.columns),
+                    'size': f"{len(df)}x{len(df.columns)}",
+                    'image_size': None,
+                    'position': position,
+                    'extraction_method': extraction_method
+                }
+
+                table_info.append(table_entry)
 
             print(f"총 {len(table_info)}개의 테이블을 HTML에서 추출했습니다.")
             return table_info
@@ -521,32 +781,71 @@ class ContinuousPNGTableExtractor:
             print(f"HTML 테이블 추출 실패: {e}")
             return []
     
+    def process_url_static(self, url, origin_number):
+        """정적 HTML 우선 처리 - 실패하거나 브라우저가 필요하면 None 반환 (브라우저로 승격)"""
+        strategy = self.strategy_table.lookup(url)
+        if strategy == STRATEGY_BROWSER:
+            print("사이트 전략: 브라우저 처리")
+            return None
+        if strategy is None and not self.static_first:
+            return None
+        
+        try:
+            html_text = self.fetch_static_html(url)
+        except Exception as e:
+            print(f"정적 HTML 다운로드 실패 - 브라우저로 처리합니다: {e}")
+            return None
+        
+        soup = BeautifulSoup(html_text, 'html.parser')
+        reason = "기억된 전략"
+        
+        # 처음 보는 패턴이면 정적 HTML을 분석하여 결정
+        if strategy is None:
+            strategy, reason = decide_strategy(analyze_static_html(soup, html_text))
+            if strategy == STRATEGY_BROWSER:
+                self.strategy_table.remember(url, STRATEGY_BROWSER, reason)
+                print(f"정적 HTML 분석: {reason} - 브라우저로 처리합니다.")
+                return None
+        
+        print(f"정적 HTML 처리 ({reason}) - 브라우저 없이 테이블을 추출합니다.")
+        table_info = self.extract_hidden_tables_from_url(url, origin_number, html_text=html_text, soup=soup)
+        
+        if not table_info:
+            self.strategy_table.remember(url, STRATEGY_BROWSER, "정적 HTML에서 추출된 테이블 없음")
+            print("정적 HTML에서 테이블을 추출하지 못했습니다 - 브라우저로 처리합니다.")
+            return None
+        
+        self.strategy_table.remember(url, STRATEGY_STATIC, reason)
+        
+        page_title = soup.title.get_text(strip=True)[:50] if soup.title and soup.title.get_text(strip=True) else url
+        
+        # 결과 정리 (간단한 메타)
+        result = {
+            'origin_number': origin_number,
+            'url': url,
+            'page_title': page_title,
+            'png_filename': '',
+            'table_count': len(table_info),
+            'table_info': table_info,
+            'processing_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'user_agent': 'N/A',
+            'window_size': 'N/A'
+        }
+        print(f"HTML 직접 파싱 처리 완료: {len(table_info)}개 테이블 추출")
+        return result
+    
     def process_url(self, url, origin_number):
         """URL 처리 - PNG 저장 및 테이블 이미지 추출"""
         driver = None
+        driver_broken = False
         try:
             print(f"\n{'='*50}")
             print(f"처리 중: {url}")
             print(f"Origin Number: {origin_number}")
             print(f"{'='*50}")
-            # 특정 사이트(단일 HTML에 모든 표가 숨겨진 경우)는 requests+BS4 방식으로 처리
-            if 'davoshospital.co.kr' in url or 'page06_new.html' in url:
-                print("특정 단일페이지 형식 감지 - HTML 직접 파싱으로 처리합니다.")
-                table_info = self.extract_hidden_tables_from_url(url, origin_number)
-
-                # 결과 정리 (간단한 메타)
-                result = {
-                    'origin_number': origin_number,
-                    'url': url,
-                    'page_title': url,
-                    'png_filename': '',
-                    'table_count': len(table_info),
-                    'table_info': table_info,
-                    'processing_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'user_agent': 'N/A',
-                    'window_size': 'N/A'
-                }
-                print(f"HTML 직접 파싱 처리 완료: {len(table_info)}개 테이블 추출")
+            # 정적 HTML로 처리 가능한 페이지는 브라우저 없이 처리
+            result = self.process_url_static(url, origin_number)
+            if result:
                 return result
 
             # WebDriver 설정
@@ -560,8 +859,10 @@ class ContinuousPNGTableExtractor:
             # 윈도우 크기 확인
             window_size = driver.get_window_size()
             
-            # 웹페이지 로드
+            # 웹페이지 로드 (URL별 제한 시간 시작)
             print("웹페이지 로딩 중...")
+            waiter = self.create_page_waiter()
+            waiter.start(driver)
             driver.get(url)
             
             # 페이지 제목 가져오기
@@ -575,12 +876,17 @@ class ContinuousPNGTableExtractor:
             png_filename = f"Medical/Context/Origin/M_origin_{origin_number}.png"
             
             # PNG 저장
-            png_success = self.save_page_as_png(driver, url, png_filename)
+            page_image, page_scale = None, 1.0
+            if self.crop_from_full_page:
+                png_success, page_image, page_scale = self.save_page_as_png_cdp(driver, url, png_filename, waiter)
+            else:
+                png_success = self.save_page_as_png(driver, url, png_filename, waiter)
             if not png_success:
                 return None
             
             # 테이블 이미지 캡처
-            table_info = self.capture_tables_as_images(driver, origin_number)
+            table_info = self.capture_tables_as_images(driver, origin_number, waiter,
+                                                       page_image=page_image, page_scale=page_scale)
             
             # 결과 정리
             result = {
@@ -600,15 +906,17 @@ class ContinuousPNGTableExtractor:
             
         except Exception as e:
             print(f"URL 처리 실패 ({url}): {e}")
+            driver_broken = True
             return None
             
         finally:
             if driver:
-                driver.quit()
-                print("WebDriver 종료")
+                # 브라우저는 종료하지 않고 상태 초기화 후 풀에 반환
+                self.get_driver_pool().release(driver, broken=driver_broken)
+                print("WebDriver 풀에 반환")
     
     def update_excel_data(self, new_results):
-        """기존 엑셀 데이터에 새로운 결과 추가"""
+        """결과 저장소에 새로운 결과 추가 (항목마다 O(1) 기록)"""
         # 메인 데이터 업데이트
         for result in new_results:
             if result:
@@ -622,9 +930,8 @@ class ContinuousPNGTableExtractor:
                     'User Agent': result.get('user_agent', 'Unknown'),
                     'Window Size': result.get('window_size', 'Unknown')
                 }
-                self.existing_data['main_data'].append(main_entry)
-                
                 # 테이블 데이터 업데이트
+                table_entries = []
                 for table in result['table_info']:
                     table_entry = {
                         'Origin Number': result['origin_number'],
@@ -638,7 +945,12 @@ class ContinuousPNGTableExtractor:
                         'Columns': table['columns'],
                         'Preview Text': table['preview_text']
                     }
-                    self.existing_data['table_data'].append(table_entry)
+                    table_entries.append(table_entry)
+                
+                if self.refresh_origins.get(result['url']) == result['origin_number']:
+                    self.replace_result(result['origin_number'], main_entry, table_entries)
+                else:
+                    self.result_store.append_result(main_entry, table_entries)
                 
                 # URL 집합 업데이트
                 self.existing_data['existing_urls'].add(result['url'])
@@ -647,20 +959,26 @@ class ContinuousPNGTableExtractor:
                 if result['origin_number'] > self.existing_data['max_origin_number']:
                     self.existing_data['max_origin_number'] = result['origin_number']
     
+    def replace_result(self, origin_number, main_entry, table_entries):
+        """변경된 URL의 재처리 결과로 기존 Origin 행을 제자리에서 갱신하고 더 이상 쓰지 않는 테이블 이미지 삭제"""
+        old_filenames = {record.get('Table Filename') for record in self.result_store.table_records(origin_number)}
+        self.result_store.replace_tables(origin_number, table_entries, main_updates=main_entry)
+        
+        for filename in old_filenames - {entry['Table Filename'] for entry in table_entries}:
+            if filename and os.path.exists(filename):
+                try:
+                    os.remove(filename)
+                except OSError as e:
+                    print(f"이전 테이블 이미지 삭제 실패 ({filename}): {e}")
+        print(f"기존 Origin {origin_number} 결과 갱신 (테이블 {len(table_entries)}개)")
+    
     def save_to_excel(self):
-        """전체 데이터를 엑셀 파일로 저장"""
+        """결과 저장소 전체를 엑셀 파일로 내보내기 (실행 종료 시)"""
         try:
-            print(f"\n엑셀 파일 업데이트 중: {self.excel_filename}")
+            print(f"\n엑셀 파일 내보내기 중: {self.excel_filename}")
             
-            # 엑셀 파일 작성
-            with pd.ExcelWriter(self.excel_filename, engine='openpyxl') as writer:
-                # 메인 결과 시트
-                main_df = pd.DataFrame(self.existing_data['main_data'])
-                main_df.to_excel(writer, sheet_name='Main Results', index=False)
-                
-                # 테이블 상세 시트
-                table_df = pd.DataFrame(self.existing_data['table_data'])
-                table_df.to_excel(writer, sheet_name='Table Details', index=False)
+            # 엑셀 파일 작성 (Main Results, Table Details 시트)
+            total_urls, total_tables_in_excel = self.result_store.export_excel(self.excel_filename)
             
             print(f"엑셀 파일 저장 완료: {self.excel_filename}")
             
@@ -674,9 +992,6 @@ class ContinuousPNGTableExtractor:
                 print(f"실제 파일 개수 확인 실패: {e}")
             
             # 결과 요약
-            total_urls = len(self.existing_data['main_data'])
-            total_tables_in_excel = len(self.existing_data['table_data'])
-            
             print(f"\n{'='*60}")
             print(f"전체 데이터베이스 현황")
             print(f"{'='*60}")
@@ -695,6 +1010,56 @@ class ContinuousPNGTableExtractor:
         except Exception as e:
             print(f"엑셀 저장 실패: {e}")
     
+    def run_concurrent(self, urls):
+        """여러 워커로 URL 동시 처리 - 호스트별 스케줄러로 동시 접속/요청 간격 제한"""
+        # Origin Number는 입력 순서대로 미리 배정
+        tasks = []
+        for url in urls:
+            if url in self.refresh_origins:
+                tasks.append((self.refresh_origins[url], url))
+                continue
+            origin_number = self.get_next_origin_number()
+            self.existing_data['max_origin_number'] = origin_number
+            tasks.append((origin_number, url))
+        
+        print(f"동시 처리 모드: 워커 {self.workers}개, 호스트당 최대 {self.max_per_host}개, 요청 간격 {self.host_interval}초")
+        
+        # 풀은 스레드 시작 전에 생성
+        self.get_driver_pool()
+        self.get_render_pool()
+        
+        scheduler = HostScheduler(tasks, max_per_host=self.max_per_host, min_interval=self.host_interval)
+        results = []
+        completed = [0]
+        
+        def worker():
+            while True:
+                task = scheduler.acquire_next()
+                if task is None:
+                    return
+                origin_number, url = task
+                try:
+                    result = self.process_url(url, origin_number)
+                finally:
+                    scheduler.release(url)
+                
+                # 완료되는 즉시 결과 저장
+                with self.save_lock:
+                    completed[0] += 1
+                    results.append(result)
+                    print(f"\n진행상황: {completed[0]}/{len(tasks)} (Origin {origin_number})")
+                    if result:
+                        self.update_excel_data([result])
+                        print(f"결과 저장소 기록 완료 (Origin {origin_number})")
+        
+        threads = [threading.Thread(target=worker, name=f"url-worker-{i}") for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        return results
+    
     def run(self):
         """메인 실행 함수"""
         print("연속 PNG 및 테이블 이미지 추출 시작")
@@ -709,6 +1074,10 @@ class ContinuousPNGTableExtractor:
         # 새로운 URL만 필터링
         new_urls = self.filter_new_urls(all_urls)
         
+        # 재확인 모드: 기존 URL 중 변경된 페이지 추가 (기존 Origin Number로 재처리)
+        if self.refresh:
+            new_urls += self.find_changed_urls(all_urls)
+        
         if not new_urls:
             print("처리할 새로운 URL이 없습니다. 모든 URL이 이미 처리되었습니다.")
             
@@ -729,31 +1098,41 @@ class ContinuousPNGTableExtractor:
         # 새로운 결과 저장용
         new_results = []
         
-        # 각 URL 처리
-        for i, url in enumerate(new_urls):
-            print(f"\n진행상황: {i+1}/{len(new_urls)}")
-            
-            # Origin Number 계산
-            origin_number = self.get_next_origin_number()
-            self.existing_data['max_origin_number'] = origin_number  # 즉시 업데이트
-            
-            result = self.process_url(url, origin_number)
-            new_results.append(result)
-            
-            # 처리 결과를 즉시 엑셀에 저장 (중간 저장)
-            if result:
-                self.update_excel_data([result])
-                self.save_to_excel()
-                print(f"중간 저장 완료 (Origin {origin_number})")
+        # 각 URL 처리 (브라우저는 풀에서 재사용)
+        try:
+            if self.workers > 1:
+                new_results = self.run_concurrent(new_urls)
+                new_urls = []
             
-            # 다음 URL 처리 전 잠시 대기
-            if i < len(new_urls) - 1:
-                print("다음 URL 처리를 위해 2초 대기...")
-                time.sleep(2)
+            for i, url in enumerate(new_urls):
+                print(f"\n진행상황: {i+1}/{len(new_urls)}")
+                
+                # Origin Number 계산 (변경된 기존 URL은 기존 Origin 유지)
+                if url in self.refresh_origins:
+                    origin_number = self.refresh_origins[url]
+                else:
+                    origin_number = self.get_next_origin_number()
+                    self.existing_data['max_origin_number'] = origin_number  # 즉시 업데이트
+                
+                result = self.process_url(url, origin_number)
+                new_results.append(result)
+                
+                # 처리 결과를 즉시 결과 저장소에 기록 (엑셀은 종료 시 내보내기)
+                if result:
+                    self.update_excel_data([result])
+                    print(f"결과 저장소 기록 완료 (Origin {origin_number})")
+                
+                # 다음 URL 처리 전 잠시 대기
+                if i < len(new_urls) - 1:
+                    print("다음 URL 처리를 위해 2초 대기...")
+                    time.sleep(2)
+        finally:
+            self.close_webdrivers()
+            self.http_fetcher.close()
         
-        # 최종 저장 (이미 중간에 저장되었지만 확인차 한 번 더)
+        # 최종 엑셀 내보내기 (결과 저장소 → Main Results, Table Details)
         if any(new_results):
-            print("최종 엑셀 파일 저장 확인...")
+            print("최종 엑셀 파일 내보내기...")
             self.save_to_excel()
         
         # 테이블 디렉토리의 파일 개수 확인
@@ -770,5 +1149,23 @@ class ContinuousPNGTableExtractor:
         print(f"완료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 if __name__ == "__main__":
-    extractor = ContinuousPNGTableExtractor()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="연속 PNG 및 테이블 이미지 추출")
+    parser.add_argument('--workers', type=int, default=1, help="동시 처리 워커 수 (워커마다 브라우저 1개)")
+    parser.add_argument('--max-per-host', type=int, default=1, help="호스트당 최대 동시 처리 수")
+    parser.add_argument('--host-interval', type=float, default=2.0, help="같은 호스트 요청 사이 최소 간격 (초)")
+    parser.add_argument('--crop-from-full-page', action='store_true', help="전체 페이지 1회 캡처 후 테이블을 잘라내기")
+    parser.add_argument('--no-static-first', action='store_true', help="정적 HTML 우선 처리 비활성화 (기억된 전략만 사용)")
+    parser.add_argument('--refresh', action='store_true', help="처리된 URL도 조건부 GET으로 확인하여 변경된 페이지만 재처리")
+    args = parser.parse_args()
+    
+    extractor = ContinuousPNGTableExtractor(
+        workers=args.workers,
+        max_per_host=args.max_per_host,
+        host_interval=args.host_interval,
+        crop_from_full_page=args.crop_from_full_page,
+        static_first=not args.no_static_first,
+        refresh=args.refresh
+    )
     extractor.run()
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+페이지별 테이블 감지 결과 캐시 (SQLite)
+PDF 내용 해시, 페이지 인덱스, 감지기 이름, 감지 파라미터 해시를 키로 bbox/셀/미리보기/행열 수를 저장.
+패딩이나 출력 DPI는 키에 포함하지 않으므로 잘라내기 설정만 바꾼 재처리는 감지를 건너뛰고 바로 다시 자름.
+크기 한도는 EVICT_EVERY번 저장할 때마다(와 닫을 때) 확인하여 넘으면 가장 오래 사용하지 않은 항목부터 제거
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.detection_cache.sqlite')
+DEFAULT_MAX_MB = 256
+EVICT_EVERY = 100  # 크기 한도 확인 주기 (저장 횟수) - 전체 크기 합계는 매번 계산하지 않음
+
+
+def get_params_hash(params):
+    """감지 파라미터 해시 (키 순서와 무관)"""
+    text = json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def get_detector_version(detector, version, params=None):
+    """카탈로그에 기록하는 감지기 버전 문자열 (감지기 이름, 코드 버전, 파라미터 해시)"""
+    return f"{detector}-v{version}-{get_params_hash(params)[:8]}"
+
+
+class DetectionCache:
+    def __init__(self, db_path=CACHE_FILE, max_mb=DEFAULT_MAX_MB):
+        self.db_path = db_path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.lock = threading.Lock()
+        self.unchecked_puts = 0  # 마지막 크기 한도 확인 이후 저장 횟수
+
+        # 페이지 분할 워커가 동시에 열 수 있도록 WAL 사용
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS detections (
+                    doc_hash TEXT NOT NULL,
+                    page_index INTEGER NOT NULL,
+                    detector TEXT NOT NULL,
+                    params_hash TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (doc_hash, page_index, detector, params_hash)
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_detections_last_used ON detections(last_used)")
+
+    def get(self, doc_hash, page_index, detector, params=None):
+        """캐시된 감지 결과 반환 (없으면 None)"""
+        if not doc_hash:
+            return None
+        key = (doc_hash, page_index, detector, get_params_hash(params))
+        try:
+            with self.lock, self.conn:
+                row = self.conn.execute(
+                    "SELECT result FROM detections WHERE doc_hash = ? AND page_index = ? AND detector = ? AND params_hash = ?",
+                    key
+                ).fetchone()
+                if row is None:
+                    return None
+                self.conn.execute(
+                    "UPDATE detections SET last_used = ? WHERE doc_hash = ? AND page_index = ? AND detector = ? AND params_hash = ?",
+                    (time.time(),) + key
+                )
+            return json.loads(row[0])
+        except Exception as e:
+            print(f"감지 캐시 읽기 실패: {e}")
+            return None
+
+    def put(self, doc_hash, page_index, detector, params, result):
+        """감지 결과 저장 (EVICT_EVERY번마다 크기 한도 초과분 제거)"""
+        if not doc_hash:
+            return
+        text = json.dumps(result, ensure_ascii=False, default=str)
+        try:
+            with self.lock, self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (doc_hash, page_index, detector, get_params_hash(params), text, len(text.encode('utf-8')), time.time())
+                )
+                self.unchecked_puts += 1
+                if self.unchecked_puts >= EVICT_EVERY:
+                    self.evict()
+        except Exception as e:
+            print(f"감지 캐시 저장 실패: {e}")
+
+    def evict(self):
+        """전체 크기가 한도를 넘으면 오래 사용하지 않은 항목부터 제거 (lock 보유 상태에서 호출)"""
+        self.unchecked_puts = 0
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM detections").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removed = 0
+        rows = self.conn.execute("SELECT rowid, size FROM detections ORDER BY last_used").fetchall()
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM detections WHERE rowid = ?", (rowid,))
+            total -= size
+            removed += 1
+        if removed:
+            print(f"감지 캐시 정리: {removed}개 항목 제거")
+
+    def close(self):
+        """마지막 확인 이후 저장한 항목이 있으면 크기 한도를 확인하고 닫기"""
+        with self.lock:
+            if self.unchecked_puts:
+                try:
+                    with self.conn:
+                        self.evict()
+                except Exception as e:
+                    print(f"감지 캐시 정리 실패: {e}")
+            self.conn.close()
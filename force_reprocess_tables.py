@@ -7,12 +7,29 @@ PDF 테이블 강제 재처리 스크립트
 import os
 import sys
 import shutil
-import fitz  # PyMuPDF
-import pandas as pd
 from datetime import datetime
+from result_store import ResultStore
+from pdf_shards import get_page_count, run_page_shards, finalize_table_files
+from pdf_hashes import file_sha256
+from pdf_find_tables import CROP_PADDED, get_find_tables_detector_version, extract_find_tables_page_range
+
+
+def get_pymupdf_padded_detector_version(dpi=400, adaptive_dpi=True):
+    """강제 재처리 카탈로그 감지기 버전 (PyMuPDF find_tables, bbox 사방 20pt 잘라내기)"""
+    return get_find_tables_detector_version(CROP_PADDED, dpi, adaptive_dpi)
+
+
+def extract_pymupdf_padded_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi=400,
+                                      doc_hash=None, adaptive_dpi=True):
+    """강제 재처리 프로세스 풀 워커 - 페이지 범위의 테이블을 PyMuPDF find_tables로 감지하고 사방 20pt 여백으로 잘라 저장"""
+    return extract_find_tables_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi, doc_hash,
+                                          adaptive_dpi, CROP_PADDED)
+
 
 class PDFTableReprocessor:
-    def __init__(self):
+    def __init__(self, page_workers=1):
+        # 한 PDF의 페이지 범위를 나누어 처리할 프로세스 수
+        self.page_workers = max(1, page_workers)
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.origin_dir = os.path.join(self.base_dir, 'Medical', 'Context', 'Origin')
         self.table_dir = os.path.join(self.base_dir, 'Medical', 'Table')
@@ -22,97 +39,25 @@ class PDFTableReprocessor:
         os.makedirs(self.table_dir, exist_ok=True)
 
     def extract_tables_from_pdf(self, pdf_path, origin_number):
-        """PDF에서 테이블 추출 (수정된 버전)"""
+        """PDF에서 테이블 추출 (수정된 버전)
+        
+        page_workers > 1이면 페이지 범위를 프로세스 풀에 나누어 처리 (결과는 순차 처리와 동일)
+        """
         try:
             print(f"PDF에서 테이블 추출 시작: {pdf_path}")
             
-            pdf_document = fitz.open(pdf_path)
-            table_info = []
+            page_count = get_page_count(pdf_path)
+            doc_hash = file_sha256(pdf_path)  # 감지 캐시 키
+            entries = run_page_shards(extract_pymupdf_padded_page_range, pdf_path, page_count, self.page_workers,
+                                      origin_number, self.table_dir, 400, doc_hash,
+                                      table_dir=self.table_dir, origin_number=origin_number)
             
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                
-                # 테이블 검색
-                try:
-                    tables = page.find_tables()
-                    table_list = list(tables) if tables else []
-                except Exception as table_find_error:
-                    print(f"페이지 {page_num + 1}에서 테이블 검색 실패: {table_find_error}")
-                    table_list = []
-                
-                if table_list:
-                    print(f"페이지 {page_num + 1}에서 {len(table_list)}개의 테이블을 발견했습니다.")
-                    
-                    for table_idx, table in enumerate(table_list):
-                        try:
-                            # 테이블 영역 추출
-                            table_rect = table.bbox
-                            
-                            # bbox가 tuple인 경우 Rect 객체로 변환
-                            if isinstance(table_rect, tuple):
-                                table_rect = fitz.Rect(table_rect)
-                            
-                            # 테이블 영역 확장 (패딩 추가하여 잘림 방지)
-                            padding = 20  # 20 포인트 패딩
-                            expanded_rect = fitz.Rect(
-                                max(0, table_rect.x0 - padding),  # 왼쪽 패딩
-                                max(0, table_rect.y0 - padding),  # 위쪽 패딩
-                                min(page.rect.x1, table_rect.x1 + padding),  # 오른쪽 패딩 (페이지 경계 제한)
-                                min(page.rect.y1, table_rect.y1 + padding)   # 아래쪽 패딩 (페이지 경계 제한)
-                            )
-                            
-                            # 테이블 영역을 이미지로 캡처 (더 높은 해상도)
-                            matrix = fitz.Matrix(400/72, 400/72)  # 400 DPI로 증가
-                            pix = page.get_pixmap(matrix=matrix, clip=expanded_rect)
-                            
-                            # 테이블 이미지 저장 (기존 파일 덮어쓰기)
-                            table_filename = f"M_table_{origin_number}_{table_idx}.png"
-                            table_path = os.path.join(self.table_dir, table_filename)
-                            pix.save(table_path)
-                            
-                            # 테이블 데이터 추출
-                            try:
-                                table_data = table.extract()
-                            except Exception as extract_error:
-                                print(f"테이블 데이터 추출 실패, 기본값 사용: {extract_error}")
-                                table_data = []
-                            
-                            # 미리보기 텍스트 생성
-                            preview_text = ""
-                            if table_data:
-                                # 첫 2-3 행의 텍스트를 미리보기로 사용
-                                for row_idx, row in enumerate(table_data[:3]):
-                                    if row:
-                                        row_text = " | ".join([str(cell) if cell else "" for cell in row])
-                                        preview_text += row_text + " "
-                                        if len(preview_text) > 150:
-                                            break
-                            
-                            if len(preview_text) > 200:
-                                preview_text = preview_text[:200] + "..."
-                            elif not preview_text:
-                                preview_text = f"Page {page_num + 1} Table {table_idx + 1}"
-                            
-                            table_info.append({
-                                'table_number': len(table_info),
-                                'filename': table_path,
-                                'page_number': page_num + 1,
-                                'table_index_in_page': table_idx,
-                                'preview_text': preview_text.strip(),
-                                'rows': len(table_data) if table_data else 0,
-                                'columns': len(table_data[0]) if table_data and len(table_data) > 0 else 0,
-                                'size': f"{len(table_data) if table_data else 0}x{len(table_data[0]) if table_data and len(table_data) > 0 else 0}",
-                                'image_size': f"{int((expanded_rect.x1 - expanded_rect.x0) * 400/72)}x{int((expanded_rect.y1 - expanded_rect.y0) * 400/72)}",
-                                'position': f"Page {page_num + 1}"
-                            })
-                            
-                            print(f"✅ 테이블 재추출 완료: {table_filename} (페이지 {page_num + 1})")
-                            
-                        except Exception as table_error:
-                            print(f"❌ 페이지 {page_num + 1}의 테이블 {table_idx} 추출 실패: {table_error}")
-                            continue
+            # 페이지 순서대로 최종 파일명 부여 (기존 파일 덮어쓰기)
+            table_info = finalize_table_files(
+                entries,
+                lambda entry, table_number: os.path.join(self.table_dir, f"M_table_{origin_number}_{entry['table_index_in_page']}.png")
+            )
             
-            pdf_document.close()
             print(f"총 {len(table_info)}개의 테이블을 재추출했습니다.")
             return table_info
             
@@ -126,20 +71,21 @@ class PDFTableReprocessor:
         print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 70)
         
-        # 기존 엑셀 파일에서 PDF 정보 읽기
+        # 결과 저장소에서 PDF 정보 읽기 (저장소가 없으면 기존 엑셀 파일에서 가져옴)
         try:
-            main_df = pd.read_excel(self.excel_file, sheet_name='Main Results')
-            pdf_entries = main_df[main_df['URL'].str.startswith('PDF_FILE:')]
+            store = ResultStore(self.excel_file)
+            try:
+                pdf_entries = store.pdf_origins()
+            finally:
+                store.close()
             print(f"📋 처리할 PDF: {len(pdf_entries)}개")
         except Exception as e:
-            print(f"❌ 엑셀 파일 읽기 실패: {e}")
+            print(f"❌ 결과 저장소 읽기 실패: {e}")
             return False
         
         total_tables_reprocessed = 0
         
-        for idx, (_, row) in enumerate(pdf_entries.iterrows(), 1):
-            origin_number = row['Origin Number']
-            pdf_filename = row['URL'].replace('PDF_FILE: ', '').strip()
+        for idx, (origin_number, pdf_filename) in enumerate(pdf_entries, 1):
             pdf_path = os.path.join(self.origin_dir, f'M_origin_{origin_number}.pdf')
             
             print(f"\n진행상황: {idx}/{len(pdf_entries)}")
@@ -168,8 +114,14 @@ class PDFTableReprocessor:
 
 def main():
     """메인 실행 함수"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PDF 테이블 강제 재처리")
+    parser.add_argument('--page-workers', type=int, default=1, help="한 PDF의 페이지를 나누어 처리할 프로세스 수")
+    args = parser.parse_args()
+    
     try:
-        reprocessor = PDFTableReprocessor()
+        reprocessor = PDFTableReprocessor(page_workers=args.page_workers)
         
         print("⚠️  이 작업은 기존의 모든 테이블 이미지를 새로운 버전으로 덮어씁니다.")
         print("💡 오른쪽 잘림 문제가 해결된 더 나은 품질의 테이블 이미지가 생성됩니다.")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+호스트별 예의(politeness) 스케줄러
+동시 처리 시 같은 호스트에 대한 동시 접속 수와 요청 간격을 제한
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostScheduler:
+    def __init__(self, tasks, max_per_host=1, min_interval=2.0):
+        """tasks: (origin_number, url) 목록 - 입력 순서대로 우선 처리"""
+        self.pending = list(tasks)
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = min_interval
+
+        self.active_per_host = {}
+        self.last_start_per_host = {}
+        self.condition = threading.Condition()
+
+    @staticmethod
+    def get_host(url):
+        """URL에서 호스트 이름 추출"""
+        return (urlparse(url).hostname or url).lower()
+
+    def host_wait_time(self, host, now):
+        """해당 호스트가 다음 요청을 받을 수 있을 때까지 남은 시간 (None이면 동시 접속 한도)"""
+        if self.active_per_host.get(host, 0) >= self.max_per_host:
+            return None
+        last_start = self.last_start_per_host.get(host)
+        if last_start is None:
+            return 0.0
+        return max(0.0, self.min_interval - (now - last_start))
+
+    def acquire_next(self):
+        """처리 가능한 다음 작업 반환 (모든 작업이 배정되면 None)"""
+        with self.condition:
+            while self.pending:
+                now = time.monotonic()
+                shortest_wait = None
+
+                for index, (origin_number, url) in enumerate(self.pending):
+                    host = self.get_host(url)
+                    wait = self.host_wait_time(host, now)
+                    if wait is None:
+                        continue
+                    if wait <= 0:
+                        self.pending.pop(index)
+                        self.active_per_host[host] = self.active_per_host.get(host, 0) + 1
+                        self.last_start_per_host[host] = now
+                        return origin_number, url
+                    if shortest_wait is None or wait < shortest_wait:
+                        shortest_wait = wait
+
+                # 모든 호스트가 바쁘거나 요청 간격 대기 중
+                self.condition.wait(timeout=shortest_wait)
+            return None
+
+    def release(self, url):
+        """작업 완료 - 호스트 슬롯 반환"""
+        host = self.get_host(url)
+        with self.condition:
+            self.active_per_host[host] = max(0, self.active_per_host.get(host, 0) - 1)
+            self.condition.notify_all()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+핫 폴더 감시
+inotify(inotify_simple 설치 시)로 새 파일 알림을 받고, 없으면 수정 시각/크기 폴링으로 대체.
+크기와 수정 시각이 settle_seconds 동안 변하지 않은 파일(복사 완료)만 처리 대상으로 반환
+"""
+
+import os
+import time
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_POLL_INTERVAL = 2.0
+IDLE_WAIT = 60.0  # inotify 사용 시 알림이 없을 때 최대 대기 (초)
+
+
+class HotFolderWatcher:
+    def __init__(self, directory, suffix='.pdf', settle_seconds=DEFAULT_SETTLE_SECONDS,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        self.directory = directory
+        self.suffix = suffix.lower()
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.candidates = {}  # 경로 → ((크기, 수정 시각), 마지막 변경 확인 시각)
+        self.returned = {}    # 경로 → 이미 반환한 (크기, 수정 시각)
+
+        os.makedirs(directory, exist_ok=True)
+        self.inotify = None
+        if INotify is not None:
+            try:
+                self.inotify = INotify()
+                self.inotify.add_watch(directory, flags.CREATE | flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO)
+            except OSError as e:
+                print(f"inotify 사용 불가, 폴링으로 대체: {e}")
+                self.inotify = None
+
+    @property
+    def mode(self):
+        return 'inotify' if self.inotify else f'폴링 ({self.poll_interval}초)'
+
+    def wait(self):
+        """새 알림이 오거나 다음 확인 시점까지 대기"""
+        settling = len(self.candidates) > len(self.returned)
+        if self.inotify:
+            timeout = self.settle_seconds if settling else IDLE_WAIT
+            self.inotify.read(timeout=int(timeout * 1000))
+        else:
+            time.sleep(min(self.settle_seconds, self.poll_interval) if settling else self.poll_interval)
+
+    def scan(self):
+        """복사가 끝난(settle_seconds 동안 변화 없는) 새 파일 경로 목록 - 같은 파일 상태는 한 번만 반환"""
+        now = time.monotonic()
+        ready = []
+        seen = set()
+
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError as e:
+            print(f"감시 폴더 읽기 실패: {e}")
+            return ready
+
+        for entry in entries:
+            if not entry.name.lower().endswith(self.suffix):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue  # 확인 중에 이동/삭제된 파일
+
+            seen.add(entry.path)
+            signature = (stat.st_size, stat.st_mtime)
+            previous = self.candidates.get(entry.path)
+            if previous is None or previous[0] != signature:
+                # 새 파일이거나 아직 쓰는 중
+                self.candidates[entry.path] = (signature, now)
+            elif (now - previous[1] >= self.settle_seconds and stat.st_size > 0
+                  and self.returned.get(entry.path) != signature):
+                self.returned[entry.path] = signature
+                ready.append(entry.path)
+
+        # 사라진 파일 정리
+        for path in list(self.candidates):
+            if path not in seen:
+                del self.candidates[path]
+                self.returned.pop(path, None)
+
+        return sorted(ready)
+
+    def close(self):
+        if self.inotify:
+            self.inotify.close()
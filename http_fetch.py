@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+공유 HTTP 가져오기 계층
+호스트별 연결 풀 세션, 백오프 재시도, ETag/Last-Modified 조건부 GET을 사용하는 디스크 캐시
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def get_body_hash(text):
+    """본문 SHA-256 (검증자 없이 200을 돌려주는 서버의 변경 여부 비교용)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FetchResult:
+    def __init__(self, url, text, status_code, not_modified=False):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        # 304 응답으로 캐시 본문을 재사용한 경우
+        self.not_modified = not_modified
+
+
+class HTTPFetcher:
+    def __init__(self, cache_dir=CACHE_DIR, retries=3, backoff_factor=0.5, pool_maxsize=10,
+                 timeout=30, headers=None):
+        self.cache_dir = cache_dir
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.headers = dict(headers or DEFAULT_HEADERS)
+
+        self.sessions = {}
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_session(self, url):
+        """호스트별 keep-alive 세션 반환 (재시도 정책 포함)"""
+        host = (urlparse(url).hostname or '').lower()
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                retry = Retry(
+                    total=self.retries,
+                    backoff_factor=self.backoff_factor,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=['GET', 'HEAD'],
+                    respect_retry_after_header=True
+                )
+                adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(self.headers)
+                session.verify = False  # SSL 인증서 문제가 있는 사이트 지원
+                self.sessions[host] = session
+            return session
+
+    def cache_paths(self, url):
+        """URL별 캐시 파일 경로 (메타데이터, 본문)"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return (os.path.join(self.cache_dir, f"{key}.json"),
+                os.path.join(self.cache_dir, f"{key}.html"))
+
+    def load_cache(self, url):
+        """캐시된 메타데이터 로드 (본문 파일이 없으면 None)"""
+        meta_path, body_path = self.cache_paths(url)
+        try:
+            if os.path.exists(meta_path) and os.path.exists(body_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"HTTP 캐시 읽기 실패 ({url}): {e}")
+        return None
+
+    def read_cached_body(self, url):
+        _, body_path = self.cache_paths(url)
+        with open(body_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def store_cache(self, url, response, text):
+        """본문과 검증자(ETag/Last-Modified)를 캐시에 저장"""
+        meta_path, body_path = self.cache_paths(url)
+        try:
+            with open(f"{body_path}.tmp", 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(f"{body_path}.tmp", body_path)
+
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'body_sha256': get_body_hash(text),
+                'fetched': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(f"{meta_path}.tmp", meta_path)
+        except Exception as e:
+            print(f"HTTP 캐시 저장 실패 ({url}): {e}")
+
+    def fetch(self, url):
+        """URL 가져오기 - 캐시 검증자가 있으면 조건부 GET, 304이면 캐시 본문 사용"""
+        cached = self.load_cache(url)
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.get_session(url).get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and cached:
+            return FetchResult(url, self.read_cached_body(url), 304, not_modified=True)
+
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        text = response.text
+        self.store_cache(url, response, text)
+        return FetchResult(url, text, response.status_code)
+
+    def cached_body_hash(self, url, cached):
+        """캐시된 본문의 SHA-256 (메타데이터에 없으면 본문 파일로 계산, 실패하면 None)"""
+        if cached.get('body_sha256'):
+            return cached['body_sha256']
+        try:
+            return get_body_hash(self.read_cached_body(url))
+        except Exception:
+            return None
+
+    def check_unchanged(self, url):
+        """재실행 시 변경 여부 확인 - True(304 또는 본문 동일), False(본문 변경), None(비교 기준 없음)
+
+        304가 아니어도 (검증자 없음, 검증자 무시) 저장된 본문 해시와 같으면 변경 없음으로 판단
+        """
+        cached = self.load_cache(url)
+        previous_hash = self.cached_body_hash(url, cached) if cached else None
+        result = self.fetch(url)
+        if result.not_modified:
+            return True
+        if previous_hash is None:
+            return None
+        return get_body_hash(result.text) == previous_hash
+
+    def close(self):
+        """모든 세션 종료"""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
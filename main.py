@@ -17,6 +17,7 @@ import sys
 import subprocess
 import time
 from datetime import datetime
+from result_store import ResultStore, get_store_path
 
 class MedicalTableExtractorMain:
     def __init__(self):
@@ -148,26 +149,28 @@ class MedicalTableExtractorMain:
         print("📊 처리 완료 - 최종 상태")
         print("=" * 70)
         
-        # Excel 파일 확인
+        # 결과 확인 (엑셀 파일 대신 결과 저장소에서 바로 집계)
         excel_file = os.path.join(self.base_dir, 'Medical_Table_Results.xlsx')
-        if os.path.exists(excel_file):
+        if os.path.exists(excel_file) or os.path.exists(get_store_path(excel_file)):
             try:
-                import pandas as pd
-                main_df = pd.read_excel(excel_file, sheet_name='Main Results')
-                table_df = pd.read_excel(excel_file, sheet_name='Table Details')
+                store = ResultStore(excel_file)
+                try:
+                    main_count = store.count_main()
+                    table_count = store.count_tables()
+                    pdf_count = len(store.pdf_origins())
+                finally:
+                    store.close()
                 
                 print(f"📋 Excel 파일: {excel_file}")
-                print(f"   📄 총 처리된 항목: {len(main_df)}개")
-                print(f"   🖼️  추출된 테이블: {len(table_df)}개")
+                print(f"   📄 총 처리된 항목: {main_count}개")
+                print(f"   🖼️  추출된 테이블: {table_count}개")
                 
                 # URL vs PDF 분류
-                url_count = len(main_df[~main_df['URL'].str.startswith('PDF_FILE:')])
-                pdf_count = len(main_df[main_df['URL'].str.startswith('PDF_FILE:')])
-                print(f"   🌐 URL 처리: {url_count}개")
+                print(f"   🌐 URL 처리: {main_count - pdf_count}개")
                 print(f"   📑 PDF 처리: {pdf_count}개")
                 
             except Exception as e:
-                print(f"   ⚠️  Excel 파일 분석 실패: {e}")
+                print(f"   ⚠️  결과 저장소 분석 실패: {e}")
         else:
             print("   ❌ Excel 파일이 생성되지 않았습니다.")
         
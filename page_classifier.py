@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+PDF 페이지 분류기 (렌더링 없이 페이지 구조만 확인, pdf_backend의 페이지 객체 사용)
+이미지 점유율, 텍스트 레이어 밀도, 서로 다른 벡터 괘선 위치 수로 페이지마다 가장 빠르면서 성공 가능성이 높은 감지기를 선택
+- vector: 수평/수직 괘선이 각각 3줄 이상인 디지털 페이지 (테두리 상자 하나만 있는 페이지 제외) → PyMuPDF find_tables
+- raster: 이미지가 페이지 대부분을 덮는 스캔 페이지 → OpenCV 선 구조 감지
+- skip: 둘 다 아닌 페이지 (괘선 없는 본문, 그림 위주 페이지) → 렌더링하지 않고 건너뜀
+"""
+
+PAGE_VECTOR = 'vector'
+PAGE_RASTER = 'raster'
+PAGE_SKIP = 'skip'
+
+CLASSIFIER_NAME = 'page_classifier'
+CLASSIFIER_PARAMS = {
+    'min_ruling_length_pt': 20,     # 괘선으로 인정할 최소 길이 (PDF 포인트)
+    'max_ruling_width_pt': 2,       # 얇은 사각형을 선으로 볼 최대 두께
+    'min_rulings': 3,               # vector 판정: 서로 다른 수평/수직 괘선 위치 각각 최소 개수 (테두리 상자 하나는 2개)
+    'scan_coverage': 0.6,           # raster 판정: 이미지 점유율 (텍스트와 무관)
+    'partial_scan_coverage': 0.25,  # raster 판정: 이미지 점유율 (텍스트 레이어가 희박한 경우)
+    'sparse_text_density': 200,     # 텍스트 레이어가 희박하다고 볼 밀도 (제곱인치당 글자 수)
+}
+
+
+def get_ruling_positions(page, params=CLASSIFIER_PARAMS):
+    """벡터 그래픽에서 서로 다른 수평 괘선 y좌표 / 수직 괘선 x좌표 집합 (선분, 얇은 사각형, 테두리가 있는 사각형의 변)
+
+    좌표는 포인트 단위로 반올림하여 같은 선을 여러 번 그려도(이중선, 셀마다 그린 테두리) 한 번만 셈
+    """
+    min_length = params['min_ruling_length_pt']
+    max_width = params['max_ruling_width_pt']
+    horizontal = set()
+    vertical = set()
+
+    for path in page.drawings():
+        stroked = path.get('color') is not None
+        for item in path['items']:
+            if item[0] == 'l':
+                dx = abs(item[2].x - item[1].x)
+                dy = abs(item[2].y - item[1].y)
+                if dy <= 1 and dx >= min_length:
+                    horizontal.add(round((item[1].y + item[2].y) / 2))
+                elif dx <= 1 and dy >= min_length:
+                    vertical.add(round((item[1].x + item[2].x) / 2))
+            elif item[0] in ('re', 'qu'):
+                rect = item[1] if item[0] == 're' else item[1].rect
+                if rect.height <= max_width and rect.width >= min_length:
+                    horizontal.add(round((rect.y0 + rect.y1) / 2))
+                elif rect.width <= max_width and rect.height >= min_length:
+                    vertical.add(round((rect.x0 + rect.x1) / 2))
+                elif stroked and rect.width >= min_length and rect.height >= min_length:
+                    # 테두리가 그려진 셀/표 외곽선
+                    horizontal.update((round(rect.y0), round(rect.y1)))
+                    vertical.update((round(rect.x0), round(rect.x1)))
+    return horizontal, vertical
+
+
+def count_rulings(page, params=CLASSIFIER_PARAMS):
+    """서로 다른 수평/수직 괘선 위치 수"""
+    horizontal, vertical = get_ruling_positions(page, params)
+    return len(horizontal), len(vertical)
+
+
+def get_image_coverage(page):
+    """페이지 면적 대비 이미지가 덮는 비율 (겹침은 무시하고 1로 제한)"""
+    page_rect = page.rect
+    page_area = page_rect.width * page_rect.height
+    if page_area <= 0:
+        return 0.0
+
+    covered = 0.0
+    for image_box in page.image_boxes():
+        bbox = image_box & page_rect
+        if not bbox.is_empty:
+            covered += bbox.width * bbox.height
+    return min(1.0, covered / page_area)
+
+
+def get_text_density(page):
+    """텍스트 레이어 밀도 (제곱인치당 글자 수)"""
+    page_rect = page.rect
+    area_in2 = (page_rect.width / 72) * (page_rect.height / 72)
+    if area_in2 <= 0:
+        return 0.0
+    chars = sum(len(word[4]) for word in page.words())
+    return chars / area_in2
+
+
+def get_page_features(page, params=CLASSIFIER_PARAMS):
+    """분류에 쓰는 페이지 특징"""
+    horizontal, vertical = count_rulings(page, params)
+    return {
+        'horizontal_rulings': horizontal,
+        'vertical_rulings': vertical,
+        'image_coverage': get_image_coverage(page),
+        'text_density': get_text_density(page),
+    }
+
+
+def classify_features(features, params=CLASSIFIER_PARAMS):
+    """페이지 특징 → 'vector' / 'raster' / 'skip'
+
+    스캔 판정을 먼저 함 - 스캔 페이지에도 테두리나 OCR 레이어의 선이 있을 수 있으므로
+    이미지가 페이지 대부분을 덮으면 괘선 수와 관계없이 raster
+    """
+    coverage = features['image_coverage']
+    if coverage >= params['scan_coverage']:
+        return PAGE_RASTER
+    if coverage >= params['partial_scan_coverage'] and features['text_density'] < params['sparse_text_density']:
+        return PAGE_RASTER
+
+    if (features['horizontal_rulings'] >= params['min_rulings']
+            and features['vertical_rulings'] >= params['min_rulings']):
+        return PAGE_VECTOR
+
+    return PAGE_SKIP
+
+
+def classify_page(page, page_num, doc_hash=None, cache=None):
+    """페이지 분류 (cache가 주어지면 감지 캐시에 분류 결과도 저장하여 재처리 시 재사용)"""
+    if cache:
+        cached = cache.get(doc_hash, page_num, CLASSIFIER_NAME, CLASSIFIER_PARAMS)
+        if cached is not None:
+            return cached['page_class']
+
+    try:
+        features = get_page_features(page)
+    except Exception as e:
+        # 구조를 읽지 못하는 페이지는 렌더링 기반 감지로 처리
+        print(f"페이지 {page_num + 1} 분류 실패, raster로 처리: {e}")
+        return PAGE_RASTER
+
+    page_class = classify_features(features)
+    if cache:
+        cache.put(doc_hash, page_num, CLASSIFIER_NAME, CLASSIFIER_PARAMS, dict(features, page_class=page_class))
+    return page_class
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+페이지 준비 상태 대기
+document.readyState, 네트워크 유휴(CDP performance 로그), DOM 변경 정지 구간을 이용한
+이벤트 기반 대기. 신호를 얻을 수 없을 때만 고정 sleep으로 대체
+"""
+
+import json
+import time
+
+# 마지막 DOM 변경 이후 경과 시간(ms)을 반환. 최초 호출 시 MutationObserver 설치
+DOM_STATE_SCRIPT = """
+if (!window.__tableExtractorObserver) {
+    window.__tableExtractorLastMutation = Date.now();
+    window.__tableExtractorObserver = new MutationObserver(function() {
+        window.__tableExtractorLastMutation = Date.now();
+    });
+    window.__tableExtractorObserver.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+return [document.readyState, Date.now() - window.__tableExtractorLastMutation];
+"""
+
+
+class PageReadinessWaiter:
+    def __init__(self, mode='adaptive', network_idle_ms=500, dom_quiet_ms=500, timeout=60,
+                 poll_interval=0.1):
+        self.mode = mode
+        self.network_idle_ms = network_idle_ms
+        self.dom_quiet_ms = dom_quiet_ms
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+        self.deadline = None
+        self.pending_requests = set()
+        self.last_network_activity = time.monotonic()
+        self.network_log_available = True
+
+    def start(self, driver):
+        """URL 처리 시작 - 전체 제한 시간 설정 및 이전 페이지의 네트워크 로그 비우기"""
+        self.deadline = time.monotonic() + self.timeout
+        self.pending_requests = set()
+        self.last_network_activity = time.monotonic()
+        self.network_log_available = True
+        if self.mode == 'adaptive':
+            self.poll_network(driver)
+            self.pending_requests = set()
+
+    def remaining(self):
+        """URL 제한 시간까지 남은 시간 (초)"""
+        if self.deadline is None:
+            return self.timeout
+        return max(0.0, self.deadline - time.monotonic())
+
+    def poll_network(self, driver):
+        """performance 로그에서 요청 시작/완료 이벤트를 읽어 대기 중인 요청 집합 갱신"""
+        if not self.network_log_available:
+            return
+
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            # goog:loggingPrefs 미설정 등 - 네트워크 신호 없이 진행
+            self.network_log_available = False
+            return
+
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except Exception:
+                continue
+
+            method = message.get('method', '')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+
+            if method == 'Network.requestWillBeSent':
+                url = params.get('request', {}).get('url', '')
+                if url.startswith('data:'):
+                    continue
+                self.pending_requests.add(request_id)
+                self.last_network_activity = time.monotonic()
+            elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                if request_id in self.pending_requests:
+                    self.pending_requests.discard(request_id)
+                    self.last_network_activity = time.monotonic()
+
+    def is_network_idle(self, idle_ms):
+        """대기 중인 요청이 없고 idle_ms 동안 네트워크 활동이 없었는지 확인"""
+        if not self.network_log_available:
+            return True
+        if self.pending_requests:
+            return False
+        return (time.monotonic() - self.last_network_activity) * 1000 >= idle_ms
+
+    def wait_for_condition(self, driver, max_wait, require_complete, network_idle_ms, dom_quiet_ms):
+        """readyState / 네트워크 유휴 / DOM 정지 조건이 모두 만족될 때까지 폴링"""
+        end_time = time.monotonic() + min(max_wait, self.remaining())
+
+        while True:
+            try:
+                ready_state, dom_quiet_for = driver.execute_script(DOM_STATE_SCRIPT)
+            except Exception as e:
+                print(f"페이지 상태 확인 실패, 고정 대기로 대체: {e}")
+                return False
+
+            self.poll_network(driver)
+
+            ready = (not require_complete) or ready_state == 'complete'
+            if ready and dom_quiet_for >= dom_quiet_ms and self.is_network_idle(network_idle_ms):
+                return True
+
+            if time.monotonic() >= end_time:
+                if self.remaining() <= 0:
+                    print("URL 제한 시간 도달 - 현재 상태로 진행합니다.")
+                return True
+
+            time.sleep(self.poll_interval)
+
+    def wait_until_ready(self, driver, fallback_seconds, max_wait=30):
+        """페이지 최초 로딩 완료 대기 (readyState + 네트워크 유휴 + DOM 정지)"""
+        if self.mode != 'adaptive':
+            time.sleep(fallback_seconds)
+            return
+
+        started = time.monotonic()
+        if not self.wait_for_condition(driver, max_wait, True, self.network_idle_ms, self.dom_quiet_ms):
+            time.sleep(fallback_seconds)
+            return
+        print(f"페이지 준비 완료 ({time.monotonic() - started:.2f}초)")
+
+    def wait_for_settle(self, driver, fallback_seconds, quiet_ms=None, max_wait=None):
+        """스크롤/리사이즈 이후 짧은 안정화 대기 (고정 대기 시간 fallback_seconds를 넘기지 않음)"""
+        if self.mode != 'adaptive':
+            time.sleep(fallback_seconds)
+            return
+
+        quiet_ms = quiet_ms if quiet_ms is not None else min(self.dom_quiet_ms, 200)
+        max_wait = fallback_seconds if max_wait is None else min(max_wait, fallback_seconds)
+        if not self.wait_for_condition(driver, max_wait, False, quiet_ms, quiet_ms):
+            time.sleep(fallback_seconds)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+단일 PDF 백엔드 (PyMuPDF)
+문서를 한 번만 파싱하고 페이지 객체 하나로 테이블 찾기, 텍스트 추출, 영역 렌더링을 제공.
+모든 좌표는 PDF 포인트(좌상단 원점)로 통일되어 감지와 잘라내기 사이에 배율을 따로 맞출 필요가 없음
+"""
+
+import math
+import statistics
+import numpy as np
+import fitz  # PyMuPDF
+
+BACKEND_NAME = 'pymupdf'
+
+# 테이블별 렌더링 DPI 선택: 영역 안 글자 크기(중앙값)가 목표 픽셀 높이가 되도록 하고 이미지 크기 상한 적용
+RENDER_DPI_PARAMS = {
+    'target_text_px': 40,   # 글꼴 크기(em) 목표 픽셀 (10pt → 288 DPI, 6pt → 480 DPI)
+    'min_dpi': 150,
+    'max_dpi': 600,
+    'max_megapixels': 8,    # 이미지 1장 픽셀 상한 (최소 DPI보다 우선)
+}
+
+
+def pixmap_to_array(pix):
+    """Pixmap 샘플 버퍼를 복사 없이 NumPy 배열로 감싸기 (RGB: H x W x 3, 그레이스케일: H x W)
+
+    samples_mv는 Pixmap 메모리를 직접 가리키므로 배열을 쓰는 동안 Pixmap 참조를 유지해야 함
+    """
+    buffer = pix.samples_mv if hasattr(pix, 'samples_mv') else pix.samples
+    array = np.frombuffer(buffer, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+    return array[:, :, 0] if pix.n == 1 else array
+
+
+def get_table_preview(table_data, max_rows, max_length):
+    """테이블 셀 데이터 앞부분으로 미리보기 텍스트 생성"""
+    preview_text = ""
+    for row in table_data[:max_rows]:
+        if row:
+            preview_text += " | ".join([str(cell) if cell else "" for cell in row]) + " "
+            if len(preview_text) > max_length:
+                break
+    return preview_text.strip()
+
+
+class PDFPage:
+    def __init__(self, page, page_num):
+        self.page = page
+        self.page_num = page_num
+
+    @property
+    def rect(self):
+        """페이지 영역 (PDF 포인트)"""
+        return self.page.rect
+
+    def find_tables(self, **settings):
+        """테이블 찾기 (pdfplumber와 같은 방식의 선/텍스트 기반 TableFinder)"""
+        tables = self.page.find_tables(**settings)
+        return list(tables) if tables else []
+
+    def detect_tables(self, preview_rows=2, preview_length=150, **settings):
+        """테이블 감지 결과 - bbox(PDF 포인트), 셀, 미리보기, 행/열 수 (감지 캐시 저장 형식)"""
+        detections = []
+        for table_idx, table in enumerate(self.find_tables(**settings)):
+            try:
+                table_data = table.extract() or []
+            except Exception as extract_error:
+                print(f"테이블 데이터 추출 실패, 기본값 사용: {extract_error}")
+                table_data = []
+
+            preview_text = get_table_preview(table_data, preview_rows, preview_length)
+            if len(preview_text) > preview_length:
+                preview_text = preview_text[:preview_length] + "..."
+            if not preview_text:
+                preview_text = f"Page {self.page_num + 1} Table {table_idx + 1}"
+
+            detections.append({
+                'bbox': list(table.bbox),  # (x0, top, x1, bottom)
+                'cells': table_data,
+                'preview_text': preview_text,
+                'rows': len(table_data),
+                'columns': len(table_data[0]) if table_data else 0,
+            })
+        return detections
+
+    def words(self, clip=None):
+        """단어 목록 (x0, y0, x1, y1, 단어, 블록, 줄, 단어 번호)"""
+        return self.page.get_text('words', clip=clip)
+
+    def text(self, clip=None):
+        """영역(기본값: 페이지 전체)의 텍스트"""
+        return self.page.get_text('text', clip=clip)
+
+    def glyph_sizes(self, clip=None):
+        """영역 안 글자들의 글꼴 크기 목록 (PDF 포인트, 글자 수만큼 반복)"""
+        sizes = []
+        for block in self.page.get_text('dict', clip=clip)['blocks']:
+            for line in block.get('lines', []):
+                for span in line['spans']:
+                    count = len(span['text'].strip())
+                    if count and span['size'] > 0:
+                        sizes.extend([span['size']] * count)
+        return sizes
+
+    def choose_render_dpi(self, clip, fallback_dpi=300, params=RENDER_DPI_PARAMS):
+        """영역 렌더링 DPI - 글자 크기 중앙값 기준 (텍스트가 없으면 fallback_dpi), 픽셀 상한 적용"""
+        clip = fitz.Rect(clip) & self.page.rect
+        sizes = self.glyph_sizes(clip)
+        if sizes:
+            dpi = params['target_text_px'] * 72 / statistics.median(sizes)
+            dpi = min(max(dpi, params['min_dpi']), params['max_dpi'])
+        else:
+            dpi = fallback_dpi
+
+        # 영역 면적 기준 픽셀 상한
+        area = clip.width * clip.height
+        if area > 0:
+            budget_dpi = 72 * math.sqrt(params['max_megapixels'] * 1e6 / area)
+            dpi = min(dpi, budget_dpi)
+        return max(1, int(dpi))
+
+    def drawings(self):
+        """벡터 그래픽 경로 목록"""
+        return self.page.get_drawings()
+
+    def image_boxes(self):
+        """페이지에 배치된 이미지 영역 목록 (PDF 포인트, 이미지 디코딩 없음)"""
+        return [fitz.Rect(info['bbox']) for info in self.page.get_image_info()]
+
+    def pixels_to_rect(self, x, y, width, height, dpi):
+        """dpi 기준 픽셀 영역을 페이지 안쪽의 PDF 포인트 영역으로 변환"""
+        point_per_pixel = 72 / dpi
+        return fitz.Rect(
+            x * point_per_pixel,
+            y * point_per_pixel,
+            (x + width) * point_per_pixel,
+            (y + height) * point_per_pixel
+        ) & self.page.rect
+
+    def render(self, dpi=300, clip=None, gray=False):
+        """페이지(clip이 주어지면 해당 영역만) 렌더링 - 알파 채널 없는 RGB/그레이스케일 Pixmap"""
+        matrix = fitz.Matrix(dpi / 72, dpi / 72)
+        colorspace = fitz.csGRAY if gray else fitz.csRGB
+        return self.page.get_pixmap(matrix=matrix, clip=clip, colorspace=colorspace, alpha=False)
+
+    def render_array(self, dpi=300, clip=None, gray=False):
+        """렌더링 결과를 복사 없이 배열로 반환 - (배열, 버퍼를 소유한 Pixmap)"""
+        pix = self.render(dpi, clip, gray)
+        return pixmap_to_array(pix), pix
+
+
+class PDFDocument:
+    def __init__(self, pdf_path):
+        self.pdf_path = pdf_path
+        self.document = fitz.open(pdf_path)
+
+    def __len__(self):
+        return len(self.document)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def page(self, page_num):
+        """0부터 시작하는 페이지 번호의 페이지 객체"""
+        return PDFPage(self.document[page_num], page_num)
+
+    def pages(self, page_start=0, page_end=None):
+        """페이지 범위 [page_start, page_end)를 순서대로 반환"""
+        page_end = len(self.document) if page_end is None else page_end
+        for page_num in range(page_start, page_end):
+            yield self.page(page_num)
+
+    def close(self):
+        self.document.close()
+
+
+def open_document(pdf_path):
+    """PDF를 한 번 파싱하여 문서 객체 반환"""
+    return PDFDocument(pdf_path)
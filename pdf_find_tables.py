@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+PyMuPDF find_tables 기반 테이블 추출 (기본 엔진, 자동 엔진의 vector 페이지, 강제 재처리 공용)
+감지기는 모두 PyMuPDF의 TableFinder이고 잘라내기 방식(여백)과 미리보기 길이만 다름
+- page_width: 위/아래/왼쪽 30px, 오른쪽은 페이지 끝에서 20px 전까지 (dpi 기준 픽셀, 오른쪽 잘림 방지)
+- padded: 테이블 bbox 사방 20pt
+"""
+
+import fitz  # PyMuPDF
+from pdf_shards import get_temp_table_path
+from detection_cache import DetectionCache, get_detector_version
+from pdf_backend import BACKEND_NAME, RENDER_DPI_PARAMS, open_document
+
+
+FIND_TABLES_DETECTOR = 'pymupdf_find_tables'
+# 감지/잘라내기 방식이 바뀌면 올려서 재처리 대상이 되도록 함
+FIND_TABLES_VERSION = 2
+
+CROP_PAGE_WIDTH = 'page_width'
+CROP_PADDED = 'padded'
+CROP_STYLES = {
+    CROP_PAGE_WIDTH: {'padding_px': 30, 'right_margin_px': 20, 'preview_rows': 2, 'preview_length': 150,
+                      'extraction_method': 'pymupdf_table_detection_page_width'},
+    CROP_PADDED: {'padding_pt': 20, 'preview_rows': 3, 'preview_length': 200,
+                  'extraction_method': 'pymupdf_table_detection'},
+}
+
+
+def get_find_tables_params(style=CROP_PAGE_WIDTH):
+    """감지 캐시 키 (패딩/출력 DPI는 포함하지 않음)"""
+    crop = CROP_STYLES[style]
+    return {'table_settings': 'default', 'preview_rows': crop['preview_rows'],
+            'preview_length': crop['preview_length'], 'backend': BACKEND_NAME}
+
+
+def get_find_tables_detector_version(style=CROP_PAGE_WIDTH, dpi=300, adaptive_dpi=True):
+    """카탈로그에 기록할 감지기 버전 (감지 파라미터 + 잘라내기 방식 + 출력 DPI, 테이블별 DPI 선택 시 그 기준)"""
+    params = dict(get_find_tables_params(style), crop=CROP_STYLES[style], dpi=dpi)
+    if adaptive_dpi:
+        params['render_dpi'] = RENDER_DPI_PARAMS
+    return get_detector_version(FIND_TABLES_DETECTOR, FIND_TABLES_VERSION, params)
+
+
+def get_crop_rect(page, bbox, style=CROP_PAGE_WIDTH, dpi=300):
+    """감지된 테이블 bbox(PDF 포인트)에 잘라내기 방식의 여백을 더한 페이지 안쪽 영역"""
+    crop = CROP_STYLES[style]
+    page_rect = page.rect
+    if 'padding_pt' in crop:
+        padding = crop['padding_pt']
+        right = bbox[2] + padding
+    else:
+        # 픽셀 단위 여백을 PDF 포인트로 환산, 오른쪽은 페이지 끝까지
+        point_per_pixel = 72 / dpi
+        padding = crop['padding_px'] * point_per_pixel
+        right = page_rect.x1 - crop['right_margin_px'] * point_per_pixel
+    return fitz.Rect(bbox[0] - padding, bbox[1] - padding, right, bbox[3] + padding) & page_rect
+
+
+def extract_find_tables_page(page, page_num, origin_number, table_dir, dpi=300, doc_hash=None, cache=None,
+                             adaptive_dpi=True, style=CROP_PAGE_WIDTH):
+    """페이지 1개의 테이블을 find_tables로 감지하고 테이블 영역만 렌더링하여 임시 파일로 저장
+
+    cache가 주어지면 감지 결과를 캐시에서 재사용하고 잘라내기만 다시 수행.
+    adaptive_dpi이면 테이블마다 글자 크기와 픽셀 상한으로 렌더링 DPI를 고름 (dpi는 텍스트가 없을 때 기본값)
+    """
+    crop = CROP_STYLES[style]
+    params = get_find_tables_params(style)
+    entries = []
+
+    detections = cache.get(doc_hash, page_num, FIND_TABLES_DETECTOR, params) if cache else None
+    if detections is None:
+        print(f"페이지 {page_num + 1} 테이블 감지 중...")
+        try:
+            detections = page.detect_tables(preview_rows=crop['preview_rows'], preview_length=crop['preview_length'])
+        except Exception as table_find_error:
+            print(f"페이지 {page_num + 1}에서 테이블 검색 실패: {table_find_error}")
+            return entries
+        if cache:
+            cache.put(doc_hash, page_num, FIND_TABLES_DETECTOR, params, detections)
+    else:
+        print(f"페이지 {page_num + 1} 감지 캐시 사용")
+
+    if not detections:
+        # 테이블이 감지되지 않은 경우 - 건너뜀 (전체 페이지 저장하지 않음)
+        print(f"⚠️ 페이지 {page_num + 1}에서 테이블을 감지하지 못했습니다. (건너뛰기)")
+        return entries
+
+    print(f"페이지 {page_num + 1}에서 {len(detections)}개의 테이블을 발견했습니다.")
+    detector_version = get_find_tables_detector_version(style, dpi, adaptive_dpi)
+
+    for table_idx, detection in enumerate(detections):
+        try:
+            clip = get_crop_rect(page, detection['bbox'], style, dpi)
+
+            # 테이블 영역만 렌더링 (clip)
+            render_dpi = page.choose_render_dpi(clip, dpi) if adaptive_dpi else dpi
+            pix = page.render(render_dpi, clip)
+
+            # 테이블 이미지 임시 저장 (최종 파일명은 병합 후 부여)
+            table_path = get_temp_table_path(table_dir, origin_number, page_num, table_idx)
+            pix.save(table_path)
+            image_width, image_height = pix.width, pix.height
+            pix = None  # 렌더링 버퍼 즉시 해제
+            print(f"  테이블 {table_idx + 1}: {clip} → {image_width} x {image_height} ({render_dpi} DPI)")
+
+            rows, cols = detection['rows'], detection['columns']
+            entries.append({
+                'temp_path': table_path,
+                'page_number': page_num + 1,
+                'table_index_in_page': table_idx,
+                'preview_text': detection['preview_text'],
+                'rows': rows,
+                'columns': cols,
+                'size': f"{rows}x{cols}" if rows > 0 and cols > 0 else "DETECTED",
+                'image_size': f"{image_width}x{image_height}",
+                'position': f"Page {page_num + 1} Table {table_idx + 1}",
+                'render_dpi': render_dpi,
+                'extraction_method': crop['extraction_method'],
+                'detector_version': detector_version
+            })
+
+        except Exception as table_error:
+            print(f"❌ 페이지 {page_num + 1}의 테이블 {table_idx + 1} 추출 실패: {table_error}")
+            continue
+
+    return entries
+
+
+def extract_find_tables_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi=300, doc_hash=None,
+                                   adaptive_dpi=True, style=CROP_PAGE_WIDTH):
+    """페이지 범위 [page_start, page_end)의 테이블을 감지하고 잘라 임시 파일로 저장 (프로세스 풀 워커)
+
+    감지와 렌더링이 같은 문서/페이지 객체를 쓰므로 문서는 한 번만 파싱되고 좌표 환산이 필요 없음.
+    doc_hash가 주어지면 페이지별 감지 결과를 캐시에서 재사용하고 잘라내기만 다시 수행
+    """
+    try:
+        pdf_document = open_document(pdf_path)
+    except Exception as e:
+        print(f"PDF 열기 실패: {e}")
+        return []
+
+    cache = DetectionCache() if doc_hash else None
+    entries = []
+
+    try:
+        for page in pdf_document.pages(page_start, page_end):
+            try:
+                entries.extend(extract_find_tables_page(page, page.page_num, origin_number, table_dir, dpi, doc_hash,
+                                                        cache, adaptive_dpi, style))
+            except Exception as page_error:
+                print(f"❌ 페이지 {page.page_num + 1} 처리 실패: {page_error}")
+                continue
+    except Exception as e:
+        print(f"페이지 {page_start + 1}-{page_end} 테이블 추출 실패: {e}")
+    finally:
+        if cache:
+            cache.close()
+        pdf_document.close()
+
+    return entries
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+PDF 내용 해시
+문서 전체 SHA-256으로 완전히 같은 PDF를 건너뛰고, 페이지별 내용 해시로
+개정본에서 바뀐 페이지만 다시 추출
+"""
+
+import os
+import re
+import hashlib
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """파일 전체의 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# 간접 참조 (N G R)
+REFERENCE = re.compile(r'(\d+)\s+\d+\s+R\b')
+# 페이지 트리/필드 상위 노드 참조 - 따라가면 다른 페이지 내용까지 해시에 포함됨
+PARENT_REFERENCE = re.compile(r'/Parent\s+\d+\s+\d+\s+R\b')
+
+
+class UnresolvedResource(Exception):
+    """페이지가 참조하는 객체를 읽을 수 없음 (해당 페이지는 항상 변경된 것으로 처리)"""
+
+
+def get_inherited_key(document, xref, key):
+    """페이지 딕셔너리 키 값 (페이지에 없으면 페이지 트리 상위에서 상속된 값, 끝까지 없으면 None)"""
+    seen = set()
+    while xref not in seen:
+        seen.add(xref)
+        kind, value = document.xref_get_key(xref, key)
+        if kind != 'null':
+            return value
+        kind, parent = document.xref_get_key(xref, 'Parent')
+        if kind != 'xref':
+            return None
+        xref = int(parent.split()[0])
+    return None
+
+
+def hash_object_tree(document, text, digest, page_xrefs, stream_hashes, visited):
+    """객체 텍스트와 그 안에서 간접 참조로 이어지는 객체/스트림을 재귀적으로 해시
+
+    참조 번호는 개정본 저장 시 바뀔 수 있으므로 내용만 해시하고, 다른 페이지 객체는 따라가지 않음.
+    스트림 해시는 stream_hashes에 xref별로 저장하여 여러 페이지가 같은 글꼴/이미지를 써도 한 번만 읽음
+    """
+    pending = [text]
+    while pending:
+        text = PARENT_REFERENCE.sub('', pending.pop())
+        digest.update(REFERENCE.sub('R', text).encode())
+
+        references = [int(xref) for xref in REFERENCE.findall(text)]
+        for xref in reversed(references):
+            if xref in visited:
+                continue
+            visited.add(xref)
+            if xref in page_xrefs:
+                continue  # 링크 대상 등 다른 페이지
+            if not 0 < xref < document.xref_length():
+                raise UnresolvedResource(f"잘못된 참조 {xref}")
+
+            obj = document.xref_object(xref, compressed=True)
+            if obj.strip() == 'null':
+                raise UnresolvedResource(f"객체 {xref} 없음")
+            if document.xref_is_stream(xref):
+                if xref not in stream_hashes:
+                    stream_hashes[xref] = hashlib.sha256(document.xref_stream_raw(xref) or b'').hexdigest()
+                obj += stream_hashes[xref]
+            pending.append(obj)
+
+
+def page_content_hashes(pdf_path):
+    """페이지별 내용 해시 목록
+
+    페이지 크기/회전, 콘텐츠 스트림, 페이지가 사용하는 리소스(폼 XObject, 이미지, 글꼴 등 상속 포함),
+    주석 외형 스트림까지 포함. 참조를 해석할 수 없는 페이지는 매번 다른 해시(항상 변경으로 처리)
+    """
+    import fitz  # PyMuPDF
+
+    hashes = []
+    with fitz.open(pdf_path) as document:
+        page_xrefs = {page.xref for page in document}
+        stream_hashes = {}
+        for page in document:
+            digest = hashlib.sha256()
+            try:
+                rect = page.rect
+                digest.update(f"{rect.x0},{rect.y0},{rect.x1},{rect.y1},{page.rotation}".encode())
+                digest.update(page.read_contents())
+
+                resources = get_inherited_key(document, page.xref, 'Resources')
+                annotations = document.xref_get_key(page.xref, 'Annots')[1]
+                visited = set()
+                for key, value in (('Resources', resources), ('Annots', annotations)):
+                    digest.update(f"/{key}".encode())
+                    hash_object_tree(document, value or 'null', digest, page_xrefs, stream_hashes, visited)
+            except Exception as e:
+                print(f"페이지 {page.number + 1} 리소스 해시 실패, 변경된 페이지로 처리: {e}")
+                digest.update(os.urandom(16))
+            hashes.append(digest.hexdigest())
+    return hashes
+
+
+def find_changed_pages(page_hashes, previous_hashes):
+    """이전 개정본과 내용이 다른 페이지 인덱스 목록 (0부터)"""
+    return [page_idx for page_idx, page_hash in enumerate(page_hashes)
+            if page_idx >= len(previous_hashes) or previous_hashes[page_idx] != page_hash]
+
+
+def get_record_page_number(record):
+    """테이블 상세 행의 페이지 번호 (1부터, 알 수 없으면 None)"""
+    page_number = record.get('Page Number')
+    if page_number is not None:
+        try:
+            return int(page_number)
+        except (TypeError, ValueError):
+            pass
+    match = re.match(r'Page (\d+)', str(record.get('Position') or ''))
+    return int(match.group(1)) if match else None
@@ -5,15 +5,59 @@ PDF를 PNG로 변환하여 이미지에서 테이블 영역을 감지하고 추
 """
 
 import os
+import queue
+import threading
 import cv2
 import numpy as np
-import fitz  # PyMuPDF
 from PIL import Image
-import pandas as pd
 from datetime import datetime
+from result_store import ResultStore
+from pdf_shards import get_page_count, run_page_shards, get_temp_table_path, finalize_table_files
+from pdf_hashes import file_sha256
+from detection_cache import DetectionCache, get_detector_version
+from table_pyramid import COARSE_DPI, get_pyramid_factor, detect_coarse_to_fine
+from pdf_backend import open_document
+
+# 감지 캐시 키 - 감지는 항상 고정 DPI 이미지에서 수행하므로 출력 DPI/패딩은 키에 포함하지 않음
+IMAGE_DETECTOR = 'opencv_line_morphology'
+IMAGE_DETECT_DPI = 300
+IMAGE_DETECT_PARAMS = {'detect_dpi': IMAGE_DETECT_DPI, 'threshold': 128, 'line_kernel': 40, 'min_area': 5000,
+                       'aspect_ratio': [0.3, 10]}
+# 감지/잘라내기 방식이 바뀌면 올려서 재처리 대상이 되도록 함
+IMAGE_DETECTOR_VERSION = 1
+
+
+# MuPDF는 스레드 안전하지 않으므로 프리페치 스레드와 메인 스레드의 fitz 호출(문서 열기/닫기, 렌더링,
+# Page/Pixmap 해제)을 모두 이 잠금으로 직렬화. 감지(OpenCV)는 잠금 밖에서 렌더링과 겹쳐 실행됨
+FITZ_LOCK = threading.Lock()
+
+
+def get_image_detect_params(pyramid=False):
+    """감지 캐시 키 파라미터 (다중 해상도 감지 시 축소 단계 DPI 포함)"""
+    return dict(IMAGE_DETECT_PARAMS, coarse_dpi=COARSE_DPI) if pyramid else IMAGE_DETECT_PARAMS
+
+
+def get_image_detector_version(dpi=300, pyramid=False):
+    """카탈로그에 기록할 감지기 버전 (감지 파라미터 + 출력 DPI + 패딩)"""
+    return get_detector_version(IMAGE_DETECTOR, IMAGE_DETECTOR_VERSION,
+                                dict(get_image_detect_params(pyramid), dpi=dpi, padding_px=20))
+
+
+def extract_image_page_range(pdf_path, page_start, page_end, origin_number, dpi=300, doc_hash=None, prefetch=0,
+                             pyramid=False):
+    """페이지 범위 [page_start, page_end)를 이미지 기반으로 처리 (프로세스 풀 워커)"""
+    extractor = PDFImageTableExtractor(prefetch=prefetch, pyramid=pyramid)
+    return extractor.extract_tables_from_page_range(pdf_path, page_start, page_end, origin_number, dpi, doc_hash)
+
 
 class PDFImageTableExtractor:
-    def __init__(self):
+    def __init__(self, page_workers=1, prefetch=0, pyramid=False):
+        # 한 PDF의 페이지 범위를 나누어 처리할 프로세스 수
+        self.page_workers = max(1, page_workers)
+        # 미리 렌더링해 둘 페이지 수 (0이면 감지와 렌더링을 번갈아 수행)
+        self.prefetch = max(0, prefetch)
+        # 약 75 DPI에서 후보를 찾고 후보 영역만 원본 해상도로 감지 (선택 사항)
+        self.pyramid = pyramid
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.origin_dir = os.path.join(self.base_dir, 'Medical', 'Context', 'Origin')
         self.table_dir = os.path.join(self.base_dir, 'Medical', 'Table')
@@ -22,83 +66,156 @@ class PDFImageTableExtractor:
         # 디렉토리 생성
         os.makedirs(self.table_dir, exist_ok=True)
 
-    def pdf_to_png_memory(self, pdf_path, dpi=300):
-        """PDF를 PNG로 변환 (메모리에서만 처리, 파일로 저장 안함)"""
+    def render_pages(self, pdf_path, dpi, pages, gray=False):
+        """지정한 페이지를 한 장씩 렌더링하여 반환 (렌더링 실패 페이지는 image=None)
+        
+        image는 Pixmap 버퍼를 그대로 감싼 RGB(gray=True이면 그레이스케일) 배열이며,
+        버퍼를 소유한 Pixmap을 'pixmap'으로 함께 반환
+        """
+        with FITZ_LOCK:
+            pdf_document = open_document(pdf_path)
         try:
-            pdf_document = fitz.open(pdf_path)
-            images = []
-            
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                
-                # 고해상도로 PNG 변환
-                matrix = fitz.Matrix(dpi/72, dpi/72)
-                pix = page.get_pixmap(matrix=matrix)
-                
-                # PIL Image로 변환
-                img_data = pix.tobytes("pil")
-                pil_image = Image.frombytes("RGB", [pix.width, pix.height], img_data)
-                
-                # OpenCV 이미지로 변환
-                cv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-                
-                images.append({
-                    'page_num': page_num,
-                    'image': cv_image,
-                    'width': pix.width,
-                    'height': pix.height
+            for page_num in pages:
+                try:
+                    # 고해상도 렌더링 (감지만 필요하면 그레이스케일로 바로 렌더링)
+                    with FITZ_LOCK:
+                        image, pix = pdf_document.page(page_num).render_array(dpi, gray=gray)
+                    
+                    yield {
+                        'page_num': page_num,
+                        'image': image,
+                        'pixmap': pix,
+                        'width': pix.width,
+                        'height': pix.height
+                    }
+                    image = None
+                    pix = None
+                except Exception as e:
+                    print(f"페이지 {page_num + 1} PNG 변환 실패: {e}")
+                    yield {'page_num': page_num, 'image': None, 'pixmap': None, 'width': 0, 'height': 0}
+        finally:
+            with FITZ_LOCK:
+                pdf_document.close()
+
+    def pdf_to_png_memory(self, pdf_path, dpi=300, page_start=0, page_end=None, pages=None, prefetch=None,
+                          gray=False):
+        """PDF 페이지를 한 장씩 PNG 이미지로 변환하는 생성기 (메모리에서만 처리, 파일로 저장 안함)
+        
+        호출 측이 페이지를 처리하고 다음 페이지를 요청하는 동안 이전 이미지는 해제되므로
+        메모리 사용량은 문서 길이와 관계없이 1~2페이지 수준. prefetch > 0이면 백그라운드 스레드가
+        최대 prefetch장까지 미리 렌더링하여 다음 페이지 렌더링과 현재 페이지 감지를 겹침
+        (호출 측은 받은 페이지의 Pixmap을 FITZ_LOCK 안에서 해제해야 함)
+        """
+        if pages is None:
+            if page_end is None:
+                page_end = get_page_count(pdf_path)
+            pages = range(page_start, page_end)
+        pages = list(pages)
+        prefetch = self.prefetch if prefetch is None else prefetch
+        
+        if prefetch <= 0:
+            yield from self.render_pages(pdf_path, dpi, pages, gray)
+            return
+        
+        page_queue = queue.Queue(maxsize=prefetch)
+        stop_event = threading.Event()
+        done = object()
+        
+        def put(item):
+            # 소비 측이 중단되면 대기하지 않고 종료
+            while not stop_event.is_set():
+                try:
+                    page_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for page_data in self.render_pages(pdf_path, dpi, pages, gray):
+                    if not put(page_data):
+                        return
+            except Exception as e:
+                print(f"PDF를 PNG로 변환 실패: {e}")
+            finally:
+                put(done)
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                page_data = page_queue.get()
+                if page_data is done:
+                    break
+                yield page_data
+                with FITZ_LOCK:
+                    page_data = None  # 다음 페이지를 기다리는 동안 이전 이미지 참조 해제
+        finally:
+            stop_event.set()
+            producer.join()
+
+    def find_line_regions(self, horizontal_binary, vertical_binary, scale=1.0, coarse=False, min_area=5000):
+        """이진 이미지에서 수평/수직선 구조의 윤곽 영역 찾기 (커널 크기와 면적은 해상도 비율 scale로 환산)"""
+        # 후보 단계에서는 블록 경계에 걸친 선도 남도록 한 블록 짧은 커널 사용
+        line_kernel = max(1, int(40 * scale) - (1 if coarse else 0))
+        
+        # 수평선 감지
+        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (line_kernel, 1))
+        horizontal_lines = cv2.morphologyEx(horizontal_binary, cv2.MORPH_OPEN, horizontal_kernel)
+        
+        # 수직선 감지
+        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, line_kernel))
+        vertical_lines = cv2.morphologyEx(vertical_binary, cv2.MORPH_OPEN, vertical_kernel)
+        
+        # 수평선과 수직선 결합
+        table_mask = cv2.addWeighted(horizontal_lines, 0.5, vertical_lines, 0.5, 0.0)
+        
+        # 노이즈 제거
+        table_mask = cv2.morphologyEx(table_mask, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+        
+        # 컨투어 찾기
+        contours, _ = cv2.findContours(table_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # 최소 면적 필터 (후보 단계는 놓치지 않도록 절반으로 완화)
+        area_limit = min_area * scale * scale * (0.5 if coarse else 1.0)
+        regions = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area > area_limit:
+                x, y, w, h = cv2.boundingRect(contour)
+                regions.append({
+                    'x': x,
+                    'y': y,
+                    'width': w,
+                    'height': h,
+                    'area': area
                 })
-            
-            pdf_document.close()
-            return images
-            
-        except Exception as e:
-            print(f"PDF를 PNG로 변환 실패: {e}")
-            return []
+        return regions
 
-    def detect_table_regions(self, cv_image, min_area=5000):
-        """이미지에서 테이블 영역 감지"""
+    def detect_table_regions(self, cv_image, min_area=5000, pyramid=None):
+        """이미지(RGB 또는 그레이스케일)에서 테이블 영역 감지
+        
+        pyramid이면 축소 이미지에서 후보를 찾고 후보 영역만 원본 해상도에서 다시 감지
+        """
         try:
-            # 그레이스케일 변환
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            
-            # 이진화
-            _, binary = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY_INV)
-            
-            # 수평선 감지
-            horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (40, 1))
-            horizontal_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, horizontal_kernel)
-            
-            # 수직선 감지
-            vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 40))
-            vertical_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, vertical_kernel)
-            
-            # 수평선과 수직선 결합
-            table_mask = cv2.addWeighted(horizontal_lines, 0.5, vertical_lines, 0.5, 0.0)
+            # 그레이스케일 변환 (이미 그레이스케일이면 그대로 사용)
+            gray = cv_image if cv_image.ndim == 2 else cv2.cvtColor(cv_image, cv2.COLOR_RGB2GRAY)
             
-            # 노이즈 제거
-            table_mask = cv2.morphologyEx(table_mask, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+            pyramid = self.pyramid if pyramid is None else pyramid
+            factor = get_pyramid_factor(IMAGE_DETECT_DPI) if pyramid else 1
+            # 이진화 - 축소 감지 시에는 축소 이미지와 후보 영역에만 적용
+            regions = detect_coarse_to_fine(
+                gray,
+                lambda source: cv2.threshold(source, 128, 255, cv2.THRESH_BINARY_INV)[1],
+                lambda horizontal, vertical, scale, coarse: self.find_line_regions(horizontal, vertical, scale, coarse,
+                                                                                   min_area),
+                factor,
+                margin=40 + 2 * factor + 4
+            )
             
-            # 컨투어 찾기
-            contours, _ = cv2.findContours(table_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # 테이블 영역 후보 필터링
-            table_regions = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > min_area:  # 최소 면적 필터
-                    x, y, w, h = cv2.boundingRect(contour)
-                    
-                    # 종횡비 체크 (너무 세로로 긴 것 제외)
-                    aspect_ratio = w / h
-                    if 0.3 < aspect_ratio < 10:
-                        table_regions.append({
-                            'x': x,
-                            'y': y,
-                            'width': w,
-                            'height': h,
-                            'area': area
-                        })
+            # 종횡비 체크 (너무 세로로 긴 것 제외)
+            table_regions = [region for region in regions if 0.3 < region['width'] / region['height'] < 10]
             
             # 면적 기준으로 정렬
             table_regions.sort(key=lambda r: r['area'], reverse=True)
@@ -127,69 +244,160 @@ class PDFImageTableExtractor:
             print(f"테이블 이미지 추출 실패: {e}")
             return None, None
 
-    def extract_tables_from_pdf_image(self, pdf_path, origin_number):
-        """PDF를 이미지로 변환 후 테이블 추출"""
+    def render_table_region(self, page, region, dpi=300, padding=20):
+        """감지 DPI 기준 영역을 출력 DPI로 환산하여 해당 영역만 렌더링 (감지 캐시 사용 시)"""
         try:
-            print(f"PDF 이미지 변환 후 테이블 추출 시작: {pdf_path}")
+            scale = dpi / IMAGE_DETECT_DPI
+            x = max(0, int(region['x'] * scale) - padding)
+            y = max(0, int(region['y'] * scale) - padding)
+            x2 = int((region['x'] + region['width']) * scale) + padding
+            y2 = int((region['y'] + region['height']) * scale) + padding
             
-            # PDF를 PNG 이미지로 변환 (메모리에서만)
-            page_images = self.pdf_to_png_memory(pdf_path, dpi=300)
+            # 픽셀 좌표를 PDF 포인트로 변환하여 잘라 렌더링
+            clip = page.pixels_to_rect(x, y, x2 - x, y2 - y, dpi)
+            pix = page.render(dpi, clip)
+            # 작은 영역이므로 샘플을 복사해 Pixmap 수명과 분리
+            table_image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
             
-            if not page_images:
-                print("PDF를 이미지로 변환할 수 없습니다.")
-                return []
+            return table_image, (x, y, pix.width, pix.height)
             
-            table_info = []
+        except Exception as e:
+            print(f"테이블 영역 렌더링 실패: {e}")
+            return None, None
+
+    def extract_tables_from_page_range(self, pdf_path, page_start, page_end, origin_number, dpi=300, doc_hash=None):
+        """페이지 범위의 테이블 영역을 감지하여 임시 파일로 저장 (최종 번호는 병합 후 부여)
+        
+        doc_hash가 주어지면 감지 캐시에 있는 페이지는 렌더링/감지 없이 영역만 잘라 렌더링
+        """
+        cache = DetectionCache() if doc_hash else None
+        detect_params = get_image_detect_params(self.pyramid)
+        detector_version = get_image_detector_version(dpi, self.pyramid)
+        
+        # 1. 캐시된 감지 결과
+        page_regions = {}
+        if cache:
+            for page_num in range(page_start, page_end):
+                regions = cache.get(doc_hash, page_num, IMAGE_DETECTOR, detect_params)
+                if regions is not None:
+                    page_regions[page_num] = regions
+            if page_regions:
+                print(f"감지 캐시 사용: {len(page_regions)}개 페이지")
+        
+        # 2. 페이지 순서대로 처리 - 캐시에 없는 페이지만 한 장씩 렌더링하여 감지하고, 자른 뒤 바로 해제
+        missing_pages = [page_num for page_num in range(page_start, page_end) if page_num not in page_regions]
+        # 출력 DPI가 다르면 잘라내기는 영역 렌더링으로 하므로 감지용 그레이스케일만 렌더링
+        rendered_pages = self.pdf_to_png_memory(pdf_path, dpi=IMAGE_DETECT_DPI, pages=missing_pages,
+                                                gray=(dpi != IMAGE_DETECT_DPI))
+        
+        entries = []
+        pdf_document = None
+        
+        for page_num in range(page_start, page_end):
+            cv_image = None
+            page_data = None
+            table_regions = page_regions.get(page_num)
             
-            for page_data in page_images:
-                page_num = page_data['page_num']
-                cv_image = page_data['image']
-                
+            if table_regions is None:
+                page_data = next(rendered_pages, None)
+                if page_data is None or page_data['image'] is None:
+                    continue
                 print(f"페이지 {page_num + 1} 처리 중... (크기: {page_data['width']}x{page_data['height']})")
                 
                 # 테이블 영역 감지
-                table_regions = self.detect_table_regions(cv_image)
+                table_regions = self.detect_table_regions(page_data['image'])
+                if cache:
+                    cache.put(doc_hash, page_num, IMAGE_DETECTOR, detect_params, table_regions)
                 
-                if table_regions:
-                    print(f"페이지 {page_num + 1}에서 {len(table_regions)}개의 테이블 영역을 발견했습니다.")
-                    
-                    for table_idx, region in enumerate(table_regions):
-                        try:
-                            # 테이블 이미지 추출
+                # 출력 DPI가 감지 DPI와 같으면 렌더링한 페이지 한 장에서 모든 영역을 자름
+                if dpi == IMAGE_DETECT_DPI:
+                    cv_image = page_data['image']
+            
+            if table_regions:
+                print(f"페이지 {page_num + 1}에서 {len(table_regions)}개의 테이블 영역을 발견했습니다.")
+                
+                for table_idx, region in enumerate(table_regions):
+                    try:
+                        # 테이블 이미지 추출
+                        if cv_image is not None:
                             table_image, final_region = self.extract_table_from_region(cv_image, region)
+                        else:
+                            with FITZ_LOCK:
+                                if pdf_document is None:
+                                    pdf_document = open_document(pdf_path)
+                                table_image, final_region = self.render_table_region(pdf_document.page(page_num),
+                                                                                     region, dpi)
+                        
+                        if table_image is not None:
+                            # 테이블 이미지 임시 저장
+                            table_path = get_temp_table_path(self.table_dir, origin_number, page_num, table_idx)
+                            
+                            # RGB 배열을 PIL로 감싸 저장 (색 변환 없음)
+                            pil_image = Image.fromarray(np.ascontiguousarray(table_image))
+                            pil_image.save(table_path, "PNG", quality=95)
                             
-                            if table_image is not None:
-                                # 테이블 이미지 저장
-                                table_filename = f"M_table_{origin_number}_{len(table_info)}.png"
-                                table_path = os.path.join(self.table_dir, table_filename)
-                                
-                                # OpenCV 이미지를 PIL로 변환 후 저장
-                                pil_image = Image.fromarray(cv2.cvtColor(table_image, cv2.COLOR_BGR2RGB))
-                                pil_image.save(table_path, "PNG", quality=95)
-                                
-                                # 테이블 정보 기록
-                                table_info.append({
-                                    'table_number': len(table_info),
-                                    'filename': table_path,
-                                    'page_number': page_num + 1,
-                                    'table_index_in_page': table_idx,
-                                    'preview_text': f"Image-based table from Page {page_num + 1}",
-                                    'rows': 0,  # 이미지 기반에서는 행 수 계산 어려움
-                                    'columns': 0,  # 이미지 기반에서는 열 수 계산 어려움
-                                    'size': f"Image-based",
-                                    'image_size': f"{final_region[2]}x{final_region[3]}",
-                                    'position': f"Page {page_num + 1}",
-                                    'detection_method': 'image_based',
-                                    'region_area': region['area']
-                                })
-                                
-                                print(f"✅ 이미지 기반 테이블 추출 완료: {table_filename} (페이지 {page_num + 1}, 영역 {table_idx + 1})")
+                            # 테이블 정보 기록
+                            entries.append({
+                                'temp_path': table_path,
+                                'page_number': page_num + 1,
+                                'table_index_in_page': table_idx,
+                                'preview_text': f"Image-based table from Page {page_num + 1}",
+                                'rows': 0,  # 이미지 기반에서는 행 수 계산 어려움
+                                'columns': 0,  # 이미지 기반에서는 열 수 계산 어려움
+                                'size': f"Image-based",
+                                'image_size': f"{final_region[2]}x{final_region[3]}",
+                                'position': f"Page {page_num + 1}",
+                                'render_dpi': dpi,
+                                'detection_method': 'image_based',
+                                'extraction_method': 'image_based_table_detection',
+                                'detector_version': detector_version,
+                                'region_area': region['area']
+                            })
                             
-                        except Exception as table_error:
-                            print(f"❌ 페이지 {page_num + 1}의 테이블 {table_idx + 1} 추출 실패: {table_error}")
-                            continue
-                else:
-                    print(f"페이지 {page_num + 1}에서 테이블을 찾을 수 없습니다.")
+                            print(f"✅ 이미지 기반 테이블 추출 완료: 페이지 {page_num + 1}, 영역 {table_idx + 1}")
+                        
+                    except Exception as table_error:
+                        print(f"❌ 페이지 {page_num + 1}의 테이블 {table_idx + 1} 추출 실패: {table_error}")
+                        continue
+            else:
+                print(f"페이지 {page_num + 1}에서 테이블을 찾을 수 없습니다.")
+            
+            # 페이지 이미지와 버퍼(Pixmap) 해제
+            with FITZ_LOCK:
+                cv_image = None
+                page_data = None
+        
+        rendered_pages.close()
+        if cache:
+            cache.close()
+        if pdf_document is not None:
+            with FITZ_LOCK:
+                pdf_document.close()
+        return entries
+
+    def extract_tables_from_pdf_image(self, pdf_path, origin_number):
+        """PDF를 이미지로 변환 후 테이블 추출
+        
+        page_workers > 1이면 페이지 범위를 프로세스 풀에 나누어 처리 (번호는 순차 처리와 동일)
+        """
+        try:
+            print(f"PDF 이미지 변환 후 테이블 추출 시작: {pdf_path}")
+            
+            page_count = get_page_count(pdf_path)
+            if page_count == 0:
+                print("PDF를 이미지로 변환할 수 없습니다.")
+                return []
+            
+            doc_hash = file_sha256(pdf_path)  # 감지 캐시 키
+            entries = run_page_shards(extract_image_page_range, pdf_path, page_count, self.page_workers,
+                                      origin_number, 300, doc_hash, self.prefetch, self.pyramid,
+                                      table_dir=self.table_dir, origin_number=origin_number)
+            
+            # 페이지 순서대로 최종 파일명 부여
+            table_info = finalize_table_files(
+                entries,
+                lambda entry, table_number: os.path.join(self.table_dir, f"M_table_{origin_number}_{table_number}.png")
+            )
             
             print(f"총 {len(table_info)}개의 테이블을 이미지 기반으로 추출했습니다.")
             return table_info
@@ -204,20 +412,21 @@ class PDFImageTableExtractor:
         print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 70)
         
-        # 기존 엑셀 파일에서 PDF 정보 읽기
+        # 결과 저장소에서 PDF 정보 읽기 (저장소가 없으면 기존 엑셀 파일에서 가져옴)
         try:
-            main_df = pd.read_excel(self.excel_file, sheet_name='Main Results')
-            pdf_entries = main_df[main_df['URL'].str.startswith('PDF_FILE:')]
+            store = ResultStore(self.excel_file)
+            try:
+                pdf_entries = store.pdf_origins()
+            finally:
+                store.close()
             print(f"📋 처리할 PDF: {len(pdf_entries)}개")
         except Exception as e:
-            print(f"❌ 엑셀 파일 읽기 실패: {e}")
+            print(f"❌ 결과 저장소 읽기 실패: {e}")
             return False
         
         total_tables_extracted = 0
         
-        for idx, (_, row) in enumerate(pdf_entries.iterrows(), 1):
-            origin_number = row['Origin Number']
-            pdf_filename = row['URL'].replace('PDF_FILE: ', '').strip()
+        for idx, (origin_number, pdf_filename) in enumerate(pdf_entries, 1):
             pdf_path = os.path.join(self.origin_dir, f'M_origin_{origin_number}.pdf')
             
             print(f"\n진행상황: {idx}/{len(pdf_entries)}")
@@ -246,8 +455,17 @@ class PDFImageTableExtractor:
 
 def main():
     """메인 실행 함수"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PDF 이미지 기반 테이블 추출")
+    parser.add_argument('--page-workers', type=int, default=1, help="한 PDF의 페이지를 나누어 처리할 프로세스 수")
+    parser.add_argument('--pyramid', action='store_true', help="약 75 DPI 축소 이미지에서 후보를 찾고 후보 영역만 원본 해상도로 감지")
+    parser.add_argument('--prefetch', type=int, default=1, help="감지 중 미리 렌더링해 둘 페이지 수 (0이면 사용 안함)")
+    args = parser.parse_args()
+    
     try:
-        extractor = PDFImageTableExtractor()
+        extractor = PDFImageTableExtractor(page_workers=args.page_workers, prefetch=args.prefetch,
+                                           pyramid=args.pyramid)
         
         print("🖼️  PDF를 이미지로 변환 후 테이블 영역을 감지하여 추출합니다.")
         print("💡 이미지 인식 기반으로 더 정확한 테이블 감지가 가능합니다.")
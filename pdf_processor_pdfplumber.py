@@ -1,23 +1,310 @@
 #!/usr/bin/env python3
 """
-PDF 처리기 - pdfplumber 기반 테이블 추출
-pdfplumber와 pdf2image를 사용하여 정확한 테이블 영역만 추출
+PDF 처리기 - 테이블 영역 추출
+기본 엔진(--engine pymupdf): PyMuPDF find_tables(선/텍스트 기반 TableFinder)로 정확한 테이블 영역만 추출
+(감지/렌더링 모두 단일 PyMuPDF 백엔드, 문서당 1회 파싱, 카탈로그에는 pymupdf_table_detection_page_width로 기록,
+ --engine pdfplumber는 이전 이름으로 남겨 둔 별칭)
+--engine auto: 페이지마다 괘선/스캔 여부를 분류하여 PyMuPDF 또는 OpenCV 감지기 선택 (둘 다 아니면 건너뜀)
+--engine opencv: 브라우저 없이 PyMuPDF로 렌더링한 페이지에서 OpenCV로 테이블 구조를 감지하여 원본 해상도로 잘라냄
 """
 
 import os
 import sys
 import shutil
-import fitz  # PyMuPDF
-import pandas as pd
 import time
+import importlib
 from datetime import datetime
-import tempfile
-import base64
+from result_store import ResultStore
+from pdf_shards import get_page_count, run_page_shards, get_temp_table_path, finalize_table_files
+from detection_cache import DetectionCache, get_detector_version
+from table_pyramid import COARSE_DPI, get_pyramid_factor, detect_coarse_to_fine
+from pdf_hashes import file_sha256, page_content_hashes, find_changed_pages, get_record_page_number
+from pdf_watchdog import DEFAULT_DEADLINE, DEFAULT_RSS_LIMIT_MB, QUARANTINE_AFTER, Supervisor, run_supervised
+from hot_folder import DEFAULT_SETTLE_SECONDS, DEFAULT_POLL_INTERVAL, HotFolderWatcher
+from pdf_backend import open_document
+from page_classifier import CLASSIFIER_PARAMS, PAGE_VECTOR, PAGE_RASTER, classify_page
+from pdf_find_tables import (CROP_PAGE_WIDTH, get_find_tables_detector_version,
+                             extract_find_tables_page, extract_find_tables_page_range)
+
+# 이전 엔진 이름 → 현재 이름 (CLI 호환용 별칭)
+ENGINE_ALIASES = {'pdfplumber': 'pymupdf'}
+
+
+def get_pymupdf_detector_version(dpi=300, adaptive_dpi=True):
+    """기본 엔진 카탈로그 감지기 버전 (PyMuPDF find_tables, 페이지 너비 잘라내기)"""
+    return get_find_tables_detector_version(CROP_PAGE_WIDTH, dpi, adaptive_dpi)
+
+
+def build_table_entry(origin_number, url, table_info):
+    """Table Details 시트 행 생성 (PDF 처리/재처리 공용)"""
+    return {
+        'Origin Number': origin_number,
+        'URL': url,
+        'Table Number': table_info['table_number'],
+        'Table Filename': os.path.basename(table_info['filename']),
+        'Preview Text': table_info['preview_text'],
+        'Rows': table_info['rows'],
+        'Columns': table_info['columns'],
+        'Size': table_info['size'],
+        'Image Size': table_info['image_size'],
+        'Position': table_info['position'],
+        'Page Number': table_info.get('page_number'),
+        'Render DPI': table_info.get('render_dpi'),
+        'Extraction Method': table_info['extraction_method'],
+        'Detector Version': table_info.get('detector_version')
+    }
+
+
+def extract_pymupdf_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi=300, doc_hash=None,
+                               adaptive_dpi=True):
+    """기본 엔진 프로세스 풀 워커 - 페이지 범위의 테이블을 PyMuPDF find_tables로 감지하고 페이지 너비로 잘라 저장"""
+    return extract_find_tables_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi, doc_hash,
+                                          adaptive_dpi, CROP_PAGE_WIDTH)
+
+
+# OpenCV 엔진: 감지는 항상 고정 DPI 렌더링에서 수행 (출력 DPI/패딩은 감지 캐시 키에 포함하지 않음)
+OPENCV_DETECTOR = 'opencv_table_structure'
+OPENCV_DETECT_DPI = 300
+OPENCV_PARAMS = {'detect_dpi': OPENCV_DETECT_DPI, 'adaptive_block': 15, 'adaptive_c': 10, 'line_kernel': 50,
+                 'min_area': 10000}
+OPENCV_VERSION = 1
+
+
+def get_opencv_params(pyramid=False):
+    """감지 캐시 키 파라미터 (다중 해상도 감지 시 축소 단계 DPI 포함)"""
+    return dict(OPENCV_PARAMS, coarse_dpi=COARSE_DPI) if pyramid else OPENCV_PARAMS
+
+
+def get_opencv_detector_version(dpi=300, pyramid=False):
+    """카탈로그에 기록할 감지기 버전 (감지 파라미터 + 출력 DPI)"""
+    return get_detector_version(OPENCV_DETECTOR, OPENCV_VERSION, dict(get_opencv_params(pyramid), dpi=dpi))
+
+
+def extract_opencv_page(page, page_num, processor, origin_number, table_dir, dpi=300, doc_hash=None, cache=None,
+                        pyramid=False):
+    """페이지 1개를 감지 DPI로 렌더링하여 OpenCV로 테이블을 감지하고 원본 해상도로 잘라 임시 파일로 저장
+    
+    테이블이 감지되지 않은 페이지는 전체 페이지를 저장 (full_page_fallback)
+    """
+    import cv2
+    
+    detect_params = get_opencv_params(pyramid)
+    detector_version = get_opencv_detector_version(dpi, pyramid)
+    page_image = None
+    page_pixmap = None
+    entries = []
+    
+    # 감지 결과 (캐시에 없으면 감지 DPI로 렌더링한 Pixmap에서 바로 감지)
+    table_regions = cache.get(doc_hash, page_num, OPENCV_DETECTOR, detect_params) if cache else None
+    if table_regions is None:
+        page_image, page_pixmap = page.render_array(OPENCV_DETECT_DPI)
+        gray = cv2.cvtColor(page_image, cv2.COLOR_RGB2GRAY)
+        table_regions = processor.detect_table_regions_opencv(gray, dpi=OPENCV_DETECT_DPI, pyramid=pyramid)
+        gray = None
+        if cache:
+            cache.put(doc_hash, page_num, OPENCV_DETECTOR, detect_params, table_regions)
+    else:
+        print(f"페이지 {page_num + 1} 감지 캐시 사용")
+    
+    # 출력 DPI가 다르면 렌더링한 페이지는 자르는 데 쓰지 않음
+    if dpi != OPENCV_DETECT_DPI:
+        page_image = None
+        page_pixmap = None
+    
+    if table_regions:
+        # 각 테이블 영역별로 저장
+        for table_idx, region in enumerate(table_regions):
+            table_path = get_temp_table_path(table_dir, origin_number, page_num, table_idx)
+            
+            if page_image is not None:
+                # 렌더링한 페이지 한 장에서 원본 해상도로 잘라냄
+                saved = processor.extract_table_region(page_image, region, table_path, rgb=True)
+                image_size = f"{region['width']}x{region['height']}"
+            else:
+                # 감지 DPI 좌표를 PDF 포인트로 변환하여 해당 영역만 출력 DPI로 렌더링
+                clip = page.pixels_to_rect(region['x'], region['y'], region['width'], region['height'],
+                                           OPENCV_DETECT_DPI)
+                clip_image, clip_pixmap = page.render_array(dpi, clip)
+                clip_region = {'x': 0, 'y': 0, 'width': clip_pixmap.width, 'height': clip_pixmap.height}
+                saved = processor.extract_table_region(clip_image, clip_region, table_path, rgb=True)
+                image_size = f"{clip_pixmap.width}x{clip_pixmap.height}"
+                clip_image = None
+                clip_pixmap = None
+            
+            if saved:
+                entries.append({
+                    'temp_path': table_path,
+                    'page_number': page_num + 1,
+                    'preview_text': f"PDF Page {page_num + 1} Table {table_idx + 1} - OpenCV detected",
+                    'rows': 0,
+                    'columns': 0,
+                    'size': "OPENCV_TABLE",
+                    'image_size': image_size,
+                    'position': f"Page {page_num + 1} Table {table_idx + 1}",
+                    'render_dpi': dpi,
+                    'extraction_method': 'opencv_table_detection',
+                    'detector_version': detector_version,
+                    'region_area': region['area'],
+                    'aspect_ratio': region['aspect_ratio']
+                })
+                print(f"✅ 테이블 영역 저장 완료: 페이지 {page_num + 1}, 테이블 {table_idx + 1}")
+            else:
+                print(f"❌ 테이블 영역 저장 실패: 페이지 {page_num + 1}, 테이블 {table_idx + 1}")
+    else:
+        # 테이블이 감지되지 않으면 전체 페이지를 저장 (기존 방식)
+        if page_pixmap is None:
+            page_pixmap = page.render(dpi)
+        table_path = get_temp_table_path(table_dir, origin_number, page_num, 0)
+        page_pixmap.save(table_path)
+        
+        entries.append({
+            'temp_path': table_path,
+            'page_number': page_num + 1,
+            'preview_text': f"PDF Page {page_num + 1} - full page (no table detected)",
+            'rows': 0,
+            'columns': 0,
+            'size': "FULL_PAGE",
+            'image_size': f"{page_pixmap.width}x{page_pixmap.height}",
+            'position': f"Page {page_num + 1}",
+            'render_dpi': dpi,
+            'extraction_method': 'full_page_fallback',
+            'detector_version': detector_version
+        })
+        print(f"⚠️ 테이블 미감지, 전체 페이지 저장: 페이지 {page_num + 1}")
+    
+    # 페이지 이미지와 버퍼(Pixmap) 해제
+    page_image = None
+    page_pixmap = None
+    return entries
+
+
+def extract_opencv_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi=300, doc_hash=None,
+                              pyramid=False):
+    """페이지 범위 [page_start, page_end)를 직접 렌더링하여 OpenCV로 테이블을 감지하고 원본 해상도로 잘라
+    임시 파일로 저장 (브라우저/임시 HTML/base64 없음, 프로세스 풀 워커)
+    """
+    processor = PDFTableProcessorPdfplumber(load_existing=False)
+    cache = DetectionCache() if doc_hash else None
+    entries = []
+    
+    try:
+        pdf_document = open_document(pdf_path)
+    except Exception as e:
+        print(f"PDF 열기 실패: {e}")
+        return []
+    
+    try:
+        for page in pdf_document.pages(page_start, page_end):
+            page_num = page.page_num
+            try:
+                entries.extend(extract_opencv_page(page, page_num, processor, origin_number, table_dir, dpi,
+                                                   doc_hash, cache, pyramid))
+            except Exception as page_error:
+                print(f"❌ 페이지 {page_num + 1} 처리 실패: {page_error}")
+                continue
+    finally:
+        if cache:
+            cache.close()
+        pdf_document.close()
+    
+    return entries
+
+
+# 자동 엔진: 페이지마다 분류기로 감지기를 선택 (vector → PyMuPDF find_tables, raster → OpenCV, skip → 렌더링 없음)
+AUTO_DETECTOR = 'auto_page_classifier'
+AUTO_VERSION = 1
+
+
+def get_auto_detector_version(dpi=300, adaptive_dpi=True, pyramid=False):
+    """카탈로그에 기록할 감지기 버전 (분류 기준 + 페이지별 감지기 버전)"""
+    return get_detector_version(AUTO_DETECTOR, AUTO_VERSION, dict(
+        CLASSIFIER_PARAMS,
+        vector=get_pymupdf_detector_version(dpi, adaptive_dpi),
+        raster=get_opencv_detector_version(dpi, pyramid)
+    ))
+
+
+def extract_auto_page_range(pdf_path, page_start, page_end, origin_number, table_dir, dpi=300, doc_hash=None,
+                            adaptive_dpi=True, pyramid=False):
+    """페이지 범위 [page_start, page_end)를 페이지별로 분류하여 가장 빠른 감지기로 처리 (프로세스 풀 워커)
+    
+    - vector: 괘선(수평/수직 선분)이 있는 디지털 페이지 → 기본 엔진과 같은 PyMuPDF find_tables 감지/페이지 너비 잘라내기
+      (렌더링은 테이블 영역만, adaptive_dpi 적용)
+    - raster: 이미지가 페이지 대부분을 덮는 스캔 페이지 → OpenCV 선 구조 감지
+    - skip: 둘 다 아닌 페이지 → 렌더링/감지 없이 건너뜀
+    선택된 감지기는 각 항목의 extraction_method로 기록됨
+    """
+    processor = PDFTableProcessorPdfplumber(load_existing=False)
+    cache = DetectionCache() if doc_hash else None
+    entries = []
+    
+    try:
+        pdf_document = open_document(pdf_path)
+    except Exception as e:
+        print(f"PDF 열기 실패: {e}")
+        return []
+    
+    try:
+        for page in pdf_document.pages(page_start, page_end):
+            page_num = page.page_num
+            try:
+                page_class = classify_page(page, page_num, doc_hash, cache)
+                print(f"페이지 {page_num + 1} 분류: {page_class}")
+                
+                if page_class == PAGE_VECTOR:
+                    entries.extend(extract_find_tables_page(page, page_num, origin_number, table_dir, dpi, doc_hash,
+                                                            cache, adaptive_dpi, CROP_PAGE_WIDTH))
+                elif page_class == PAGE_RASTER:
+                    entries.extend(extract_opencv_page(page, page_num, processor, origin_number, table_dir, dpi,
+                                                       doc_hash, cache, pyramid))
+            except Exception as page_error:
+                print(f"❌ 페이지 {page_num + 1} 처리 실패: {page_error}")
+                continue
+    finally:
+        if cache:
+            cache.close()
+        pdf_document.close()
+    
+    return entries
+
+
+def process_pdf_worker(pdf_filename, pdf_path, origin_number, ingest=None, engine='pymupdf', adaptive_dpi=True,
+                       pyramid=False, page_workers=1):
+    """파일 병렬 처리 워커 - PDF 1개를 처리하고 결과만 반환 (카탈로그 기록은 부모 프로세스가 담당)
+
+    감시 프로세스는 데몬이 아니므로 page_workers > 1이면 그 안에서 다시 페이지 범위 프로세스 풀을 띄울 수 있음
+    """
+    processor = PDFTableProcessorPdfplumber(page_workers=page_workers, load_existing=False, engine=engine,
+                                            adaptive_dpi=adaptive_dpi, pyramid=pyramid)
+    return processor.process_single_pdf(pdf_filename, pdf_path, origin_number, ingest)
+
 
 class PDFTableProcessorPdfplumber:
-    def __init__(self):
+    def __init__(self, page_workers=1, workers=1, memory_budget_mb=None, load_existing=True, engine='pymupdf',
+                 adaptive_dpi=True, watchdog=True, deadline=DEFAULT_DEADLINE, rss_limit_mb=DEFAULT_RSS_LIMIT_MB,
+                 pyramid=False):
+        # 한 PDF의 페이지 범위를 나누어 처리할 프로세스 수
+        self.page_workers = max(1, page_workers)
+        # 여러 PDF를 동시에 처리할 프로세스 수와 워커별 메모리 한도(MB)
+        self.workers = max(1, workers)
+        self.memory_budget_mb = memory_budget_mb
+        # 테이블 감지 엔진: 'pymupdf' (find_tables, 텍스트/선 기반), 'opencv' (렌더링 이미지 기반), 'auto' (페이지별 선택)
+        self.engine = ENGINE_ALIASES.get(engine, engine)
+        # 테이블마다 글자 크기로 렌더링 DPI 선택 (False이면 고정 300 DPI)
+        self.adaptive_dpi = adaptive_dpi
+        # OpenCV 감지(opencv 엔진, auto 엔진의 raster 페이지)를 축소 이미지 후보 → 원본 해상도 확인 순서로 수행
+        self.pyramid = pyramid
+        # PDF마다 감시되는 하위 프로세스에서 처리 (문서당 제한 시간(초), 메모리(PSS) 상한(MB))
+        self.watchdog = watchdog
+        self.deadline = deadline if watchdog else None
+        self.rss_limit_mb = rss_limit_mb if watchdog else None
+        if memory_budget_mb:
+            # 워커별 메모리 한도는 감시 프로세스의 메모리(PSS) 상한으로 적용
+            # (주소 공간 한도는 실제 사용량이 아닌 예약 크기로 걸려 정상 문서도 MemoryError로 실패함)
+            self.rss_limit_mb = min(self.rss_limit_mb or memory_budget_mb, memory_budget_mb)
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.temperal_pdf_dir = os.path.join(self.base_dir, 'temperal_pdf')
+        self.quarantine_dir = os.path.join(self.temperal_pdf_dir, 'quarantine')
         self.target_origin_dir = os.path.join(self.base_dir, 'Medical', 'Context', 'Origin')
         self.target_table_dir = os.path.join(self.base_dir, 'Medical', 'Table')
         self.excel_filename = os.path.join(self.base_dir, 'Medical_Table_Results.xlsx')
@@ -26,51 +313,74 @@ class PDFTableProcessorPdfplumber:
         for dir_path in [self.target_origin_dir, self.target_table_dir]:
             os.makedirs(dir_path, exist_ok=True)
         
-        # 기존 데이터 로드
-        self.existing_data = self.load_existing_data()
+        # 기존 데이터 로드 (파일 병렬 처리 워커는 카탈로그를 읽지 않음)
+        self.existing_data = self.load_existing_data() if load_existing else None
 
     def load_existing_data(self):
-        """기존 엑셀 파일에서 데이터 로드"""
+        """결과 저장소(SQLite)에서 기존 PDF 파일명과 최대 Origin Number 로드"""
         try:
-            if os.path.exists(self.excel_filename):
-                main_df = pd.read_excel(self.excel_filename, sheet_name='Main Results')
-                table_df = pd.read_excel(self.excel_filename, sheet_name='Table Details')
-                
-                # 기존 PDF 파일명 추출 (중복 방지용)
-                existing_pdfs = set()
-                for _, row in main_df.iterrows():
-                    url_field = str(row.get('URL', ''))
-                    if url_field.startswith('PDF_FILE:'):
-                        pdf_filename = url_field.replace('PDF_FILE: ', '').strip()
-                        existing_pdfs.add(pdf_filename)
-                
-                print(f"기존 엑셀 파일 로드: {len(main_df)}개 URL/PDF 기록")
-                
-                return {
-                    'main_data': main_df.to_dict('records'),
-                    'table_data': table_df.to_dict('records'),
-                    'existing_pdfs': existing_pdfs,
-                    'max_origin_number': int(main_df['Origin Number'].max()) if len(main_df) > 0 else 0
-                }
-            else:
-                print("새로운 엑셀 파일을 생성합니다.")
-                return {
-                    'main_data': [],
-                    'table_data': [],
-                    'existing_pdfs': set(),
-                    'max_origin_number': 0
-                }
-        except Exception as e:
-            print(f"기존 데이터 로드 실패: {e}")
+            # 저장소가 처음 생성되면 기존 엑셀 파일 기록을 가져옴
+            self.result_store = ResultStore(self.excel_filename)
+            
+            # 기존 PDF 파일명 추출 (중복 방지용)
+            existing_pdfs = set()
+            for url_field in self.result_store.existing_urls():
+                if url_field.startswith('PDF_FILE:'):
+                    pdf_filename = url_field.replace('PDF_FILE: ', '').strip()
+                    existing_pdfs.add(pdf_filename)
+            
+            max_origin_number = self.result_store.max_origin_number()
+            
+            print(f"결과 저장소 로드: {self.result_store.count_main()}개 URL/PDF 기록")
+            
             return {
-                'main_data': [],
-                'table_data': [],
-                'existing_pdfs': set(),
-                'max_origin_number': 0
+                'existing_pdfs': existing_pdfs,
+                'max_origin_number': int(max_origin_number) if max_origin_number is not None else 0
             }
+        except Exception as e:
+            print(f"기존 데이터 로드 실패: {e}")
+            raise
+
+    def index_existing_documents(self):
+        """해시가 없는 기존 PDF 항목을 Origin 디렉토리의 PDF로 색인 (최초 1회)"""
+        indexed = self.result_store.indexed_origins()
+        pending = [(origin_number, filename) for origin_number, filename in self.result_store.pdf_origins()
+                   if origin_number not in indexed]
+        if not pending:
+            return
+        
+        print(f"기존 PDF 해시 색인 중: {len(pending)}개")
+        for origin_number, filename in pending:
+            origin_pdf = os.path.join(self.target_origin_dir, f"M_origin_{origin_number}.pdf")
+            if not os.path.exists(origin_pdf):
+                continue
+            try:
+                self.result_store.record_document({
+                    'sha256': file_sha256(origin_pdf),
+                    'origin_number': origin_number,
+                    'filename': filename,
+                    'page_hashes': page_content_hashes(origin_pdf),
+                    'ingested': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                })
+            except Exception as e:
+                print(f"PDF 해시 색인 실패 (Origin {origin_number}): {e}")
+    
+    def get_previous_revision(self, filename):
+        """같은 파일명의 이전 개정본 정보 (페이지 해시, 테이블 행) - 없으면 None"""
+        document = self.result_store.latest_document(filename)
+        if not document:
+            return None
+        return {
+            'origin_number': document['origin_number'],
+            'page_hashes': self.result_store.page_hashes(document['origin_number']),
+            'tables': self.result_store.table_records(document['origin_number']),
+        }
 
     def find_pdf_files(self):
-        """temperal_pdf에서 새로운 PDF 파일 찾기"""
+        """temperal_pdf에서 새로운 PDF 파일 찾기 (내용 해시 기준 중복 검사)
+        
+        반환: (파일명, 경로, {'sha256', 'previous'}) 목록
+        """
         try:
             if not os.path.exists(self.temperal_pdf_dir):
                 print(f"temperal_pdf 디렉토리가 없습니다: {self.temperal_pdf_dir}")
@@ -86,16 +396,16 @@ class PDFTableProcessorPdfplumber:
             
             print(f"temperal_pdf에서 {len(all_pdf_files)}개의 PDF 파일을 발견했습니다.")
             
-            # 중복 PDF 확인
+            # 중복 PDF 확인 (파일명이 아닌 SHA-256 기준)
             print(f"\n=== PDF 중복 검사 ===")
             print(f"기존 PDF 개수: {len(self.existing_data['existing_pdfs'])}")
+            self.index_existing_documents()
             
-            for filename, pdf_path in all_pdf_files:
-                if filename in self.existing_data['existing_pdfs']:
-                    print(f"중복 PDF (건너뜀): {filename}")
-                else:
-                    new_pdf_files.append((filename, pdf_path))
-                    print(f"새로운 PDF (처리예정): {filename}")
+            batch_hashes = {}
+            for filename, pdf_path in sorted(all_pdf_files):
+                ingest = self.check_pdf_file(filename, pdf_path, batch_hashes)
+                if ingest:
+                    new_pdf_files.append((filename, pdf_path, ingest))
             
             print(f"총 {len(new_pdf_files)}개의 새로운 PDF를 처리합니다.")
             return new_pdf_files
@@ -104,6 +414,37 @@ class PDFTableProcessorPdfplumber:
             print(f"PDF 파일 검색 실패: {e}")
             return []
 
+    def check_pdf_file(self, filename, pdf_path, batch_hashes):
+        """PDF 1개의 격리/중복/개정본 검사 - 처리할 파일이면 {'sha256', 'previous'}, 아니면 None
+        
+        batch_hashes: 이번에 처리 중이거나 처리 예정인 PDF의 SHA-256 → 파일명 (처리 대상이면 추가됨)
+        """
+        sha256 = file_sha256(pdf_path)
+        failures = self.result_store.failure_count(sha256)
+        if failures >= QUARANTINE_AFTER:
+            print(f"격리 대상 PDF (건너뜀): {filename} - 실패 {failures}회, "
+                  f"마지막 사유: {self.result_store.last_failure(sha256)}")
+            self.quarantine_pdf(pdf_path)
+            return None
+        
+        duplicate = self.result_store.find_document(sha256)
+        if duplicate:
+            print(f"중복 PDF (건너뜀): {filename} = Origin {duplicate['origin_number']} ({duplicate['filename']})")
+            return None
+        if sha256 in batch_hashes:
+            print(f"중복 PDF (건너뜀): {filename} = {batch_hashes[sha256]}")
+            return None
+        
+        batch_hashes[sha256] = filename
+        previous = None
+        if filename in self.existing_data['existing_pdfs']:
+            previous = self.get_previous_revision(filename)
+        if previous:
+            print(f"개정된 PDF (변경 페이지만 처리예정): {filename} (이전 Origin {previous['origin_number']})")
+        else:
+            print(f"새로운 PDF (처리예정): {filename}")
+        return {'sha256': sha256, 'previous': previous}
+
     def move_pdf_to_origin(self, pdf_path, origin_number):
         """PDF 파일을 Medical/Context/Origin으로 이동"""
         try:
@@ -119,147 +460,108 @@ class PDFTableProcessorPdfplumber:
             print(f"PDF 이동 실패: {e}")
             return None
 
-    def setup_webdriver(self):
-        """Chrome WebDriver 설정"""
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.chrome.service import Service
-        from webdriver_manager.chrome import ChromeDriverManager
+    def find_structure_regions(self, horizontal_binary, vertical_binary, scale=1.0, coarse=False, min_area=10000):
+        """이진 이미지에서 테이블 구조(수평/수직선)의 윤곽 영역 찾기 (커널 크기와 면적은 해상도 비율 scale로 환산)"""
+        import cv2
+        import numpy as np
         
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-gpu")
+        # 후보 단계에서는 블록 경계에 걸친 선도 남도록 한 블록 짧은 커널 사용
+        line_kernel = max(1, int(50 * scale) - (1 if coarse else 0))
         
-        try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            return driver
-        except Exception as e:
-            print(f"WebDriver 설정 실패: {e}")
-            return None
-
-    def pdf_to_html(self, pdf_path):
-        """PDF를 HTML로 변환 (이미지 포함)"""
-        try:
-            pdf_document = fitz.open(pdf_path)
-            
-            html_content = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    body { margin: 0; padding: 20px; background: white; }
-                    .page { margin-bottom: 50px; border: 1px solid #ccc; padding: 10px; }
-                    img { max-width: 100%; height: auto; display: block; }
-                </style>
-            </head>
-            <body>
-            """
-            
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                
-                # 고해상도로 PNG 변환
-                matrix = fitz.Matrix(300/72, 300/72)  # 300 DPI
-                pix = page.get_pixmap(matrix=matrix)
-                
-                # 이미지를 base64로 변환
-                img_data = pix.tobytes("png")
-                img_base64 = base64.b64encode(img_data).decode()
-                
-                html_content += f"""
-                <div class="page" id="page_{page_num}">
-                    <h3>Page {page_num + 1}</h3>
-                    <img src="data:image/png;base64,{img_base64}" alt="Page {page_num + 1}" class="page-image">
-                </div>
-                """
-            
-            html_content += """
-            </body>
-            </html>
-            """
-            
-            pdf_document.close()
-            return html_content
-            
-        except Exception as e:
-            print(f"PDF HTML 변환 실패: {e}")
-            return None
+        # 수평선 감지를 위한 커널
+        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (line_kernel, 1))
+        horizontal_lines = cv2.morphologyEx(horizontal_binary, cv2.MORPH_OPEN, horizontal_kernel)
+        
+        # 수직선 감지를 위한 커널
+        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, line_kernel))
+        vertical_lines = cv2.morphologyEx(vertical_binary, cv2.MORPH_OPEN, vertical_kernel)
+        
+        # 수평선과 수직선 결합
+        table_structure = cv2.addWeighted(horizontal_lines, 0.5, vertical_lines, 0.5, 0.0)
+        
+        # 노이즈 제거와 구조 강화
+        kernel = np.ones((3, 3), np.uint8)
+        table_structure = cv2.morphologyEx(table_structure, cv2.MORPH_CLOSE, kernel)
+        table_structure = cv2.dilate(table_structure, kernel, iterations=2)
+        
+        # 윤곽선 찾기
+        contours, _ = cv2.findContours(table_structure, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # 최소 면적 필터 (후보 단계는 놓치지 않도록 절반으로 완화)
+        area_limit = min_area * scale * scale * (0.5 if coarse else 1.0)
+        regions = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area > area_limit:
+                x, y, w, h = cv2.boundingRect(contour)
+                regions.append({'x': x, 'y': y, 'width': w, 'height': h, 'area': area})
+        return regions
 
-    def detect_table_regions_opencv(self, image_path):
-        """OpenCV를 사용해서 이미지에서 테이블 영역 감지"""
+    def detect_table_regions_opencv(self, image, dpi=None, pyramid=False):
+        """OpenCV를 사용해서 이미지(경로 또는 이미 읽은 BGR 배열)에서 테이블 영역 감지
+        
+        dpi를 알면 커널/크기 기준(300 DPI 기준값)을 해상도에 맞춰 환산하고, pyramid이면
+        약 75 DPI 축소 이미지에서 후보를 찾은 뒤 후보 영역만 원본 해상도에서 다시 감지
+        """
         import cv2
-        import numpy as np
         
         try:
-            # 이미지 읽기
-            image = cv2.imread(image_path)
-            if image is None:
-                print(f"이미지를 읽을 수 없습니다: {image_path}")
-                return []
+            # 이미지 읽기 (경로가 주어진 경우만)
+            if isinstance(image, str):
+                image_path = image
+                image = cv2.imread(image_path)
+                if image is None:
+                    print(f"이미지를 읽을 수 없습니다: {image_path}")
+                    return []
             
             # 그레이스케일 변환
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # 이진화 (적응형 임계값 사용)
-            binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 15, 10)
-            
-            # 수평선 감지를 위한 커널
-            horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (50, 1))
-            horizontal_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, horizontal_kernel)
-            
-            # 수직선 감지를 위한 커널
-            vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 50))
-            vertical_lines = cv2.morphologyEx(binary, cv2.MORPH_OPEN, vertical_kernel)
-            
-            # 수평선과 수직선 결합
-            table_structure = cv2.addWeighted(horizontal_lines, 0.5, vertical_lines, 0.5, 0.0)
-            
-            # 노이즈 제거와 구조 강화
-            kernel = np.ones((3, 3), np.uint8)
-            table_structure = cv2.morphologyEx(table_structure, cv2.MORPH_CLOSE, kernel)
-            table_structure = cv2.dilate(table_structure, kernel, iterations=2)
-            
-            # 윤곽선 찾기
-            contours, _ = cv2.findContours(table_structure, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            
+            # 해상도 비율 (DPI를 모르면 원본 기준값 그대로 사용, 축소 감지도 하지 않음)
+            base_scale = dpi / 300 if dpi else 1.0
+            factor = get_pyramid_factor(dpi) if (pyramid and dpi) else 1
+            # 이진화 (적응형 임계값) - 축소 감지 시에는 축소 이미지와 후보 영역에만 적용
+            regions = detect_coarse_to_fine(
+                gray,
+                lambda source: cv2.adaptiveThreshold(source, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                                     cv2.THRESH_BINARY_INV, 15, 10),
+                lambda horizontal, vertical, scale, coarse: self.find_structure_regions(horizontal, vertical,
+                                                                                        base_scale * scale, coarse),
+                factor,
+                margin=int(50 * base_scale) + 2 * factor + 12
+            )
             
             # 테이블 후보 영역 필터링
             table_regions = []
-            min_area = 10000  # 최소 면적
+            image_height, image_width = image.shape[:2]
             
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > min_area:
-                    x, y, w, h = cv2.boundingRect(contour)
+            for region in regions:
+                x, y, w, h = region['x'], region['y'], region['width'], region['height']
+                
+                # 종횡비와 크기 조건 확인
+                aspect_ratio = w / h if h > 0 else 0
+                
+                # 테이블다운 영역 조건
+                if (w > 200 * base_scale and h > 100 * base_scale and  # 최소 크기
+                    0.5 < aspect_ratio < 5.0 and  # 적절한 종횡비
+                    w < image_width * 0.95 and  # 너무 크지 않음
+                    h < image_height * 0.95):
                     
-                    # 종횡비와 크기 조건 확인
-                    aspect_ratio = w / h if h > 0 else 0
+                    # 패딩 추가 (경계를 약간 넓게)
+                    padding = int(20 * base_scale)
+                    x = max(0, x - padding)
+                    y = max(0, y - padding)
+                    w = min(image_width - x, w + 2 * padding)
+                    h = min(image_height - y, h + 2 * padding)
                     
-                    # 테이블다운 영역 조건
-                    if (w > 200 and h > 100 and  # 최소 크기
-                        0.5 < aspect_ratio < 5.0 and  # 적절한 종횡비
-                        w < image.shape[1] * 0.95 and  # 너무 크지 않음
-                        h < image.shape[0] * 0.95):
-                        
-                        # 패딩 추가 (경계를 약간 넓게)
-                        padding = 20
-                        x = max(0, x - padding)
-                        y = max(0, y - padding)
-                        w = min(image.shape[1] - x, w + 2 * padding)
-                        h = min(image.shape[0] - y, h + 2 * padding)
-                        
-                        table_regions.append({
-                            'x': x,
-                            'y': y,
-                            'width': w,
-                            'height': h,
-                            'area': area,
-                            'aspect_ratio': aspect_ratio
-                        })
+                    table_regions.append({
+                        'x': x,
+                        'y': y,
+                        'width': w,
+                        'height': h,
+                        'area': region['area'],
+                        'aspect_ratio': aspect_ratio
+                    })
             
             # 면적 순으로 정렬 (큰 것부터)
             table_regions.sort(key=lambda r: r['area'], reverse=True)
@@ -274,20 +576,24 @@ class PDFTableProcessorPdfplumber:
             print(f"테이블 영역 감지 실패: {e}")
             return []
 
-    def extract_table_region(self, image_path, region, output_path):
-        """이미지에서 특정 테이블 영역 추출"""
+    def extract_table_region(self, image, region, output_path, rgb=False):
+        """이미지(경로 또는 이미 읽은 BGR 배열, rgb=True이면 RGB 배열)에서 특정 테이블 영역 추출"""
         import cv2
         import numpy as np
         
         try:
-            # 이미지 읽기
-            image = cv2.imread(image_path)
+            # 이미지 읽기 (경로가 주어진 경우만)
+            if isinstance(image, str):
+                image = cv2.imread(image)
             if image is None:
                 return False
             
             # 테이블 영역 잘라내기
             x, y, w, h = region['x'], region['y'], region['width'], region['height']
             table_image = image[y:y+h, x:x+w]
+            if rgb:
+                # 잘라낸 영역만 BGR로 변환 (페이지 전체 변환 없음)
+                table_image = cv2.cvtColor(table_image, cv2.COLOR_RGB2BGR)
             
             # 이미지 품질 향상
             # 선명도 향상
@@ -302,255 +608,92 @@ class PDFTableProcessorPdfplumber:
             print(f"테이블 영역 추출 실패: {e}")
             return False
 
-    def extract_tables_with_selenium(self, html_content, origin_number):
-        """Selenium으로 HTML에서 테이블 추출 (OpenCV 테이블 감지)"""
-        from selenium.webdriver.common.by import By
-        import cv2
-        import numpy as np
+    def current_detector_version(self, dpi=300):
+        """현재 엔진의 감지기 버전"""
+        if self.engine == 'opencv':
+            return get_opencv_detector_version(dpi, self.pyramid)
+        if self.engine == 'auto':
+            return get_auto_detector_version(dpi, self.adaptive_dpi, self.pyramid)
+        return get_pymupdf_detector_version(dpi, self.adaptive_dpi)
+
+    def reuse_previous_tables(self, previous, unchanged_pages, origin_number):
+        """변경되지 않은 페이지의 이전 테이블 이미지를 임시 파일로 복사하여 재사용
         
-        driver = self.setup_webdriver()
-        if not driver:
-            return []
+        반환: (재사용 항목 목록, 이미지가 없어 다시 추출해야 하는 페이지 인덱스 집합)
+        """
+        reused_entries = []
+        missing_pages = set()
+        page_table_counts = {}
         
-        try:
-            # 임시 HTML 파일 생성
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
-                temp_html_path = f.name
-            
-            # HTML 파일 로드
-            driver.get(f"file://{temp_html_path}")
-            time.sleep(3)
-            
-            print("페이지 이미지에서 테이블 감지 시작...")
-            
-            # 페이지 이미지들 찾기
-            page_images = driver.find_elements(By.CLASS_NAME, "page-image")
-            
-            if not page_images:
-                print("페이지 이미지를 찾을 수 없습니다.")
-                return []
-            
-            print(f"{len(page_images)}개의 페이지 이미지를 발견했습니다.")
-            
-            table_info = []
-            
-            for page_idx, img_element in enumerate(page_images):
-                try:
-                    if not img_element.is_displayed():
-                        continue
-                    
-                    # 이미지로 스크롤
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", img_element)
-                    time.sleep(2)
-                    
-                    # 이미지 크기 확인
-                    size = img_element.size
-                    if size['width'] < 100 or size['height'] < 100:
-                        print(f"페이지 {page_idx + 1} 이미지가 너무 작아 건너뜁니다.")
-                        continue
-                    
-                    # 임시로 전체 페이지 이미지 저장
-                    temp_page_path = os.path.join(tempfile.gettempdir(), f"temp_page_{origin_number}_{page_idx}.png")
-                    img_element.screenshot(temp_page_path)
-                    
-                    # OpenCV로 테이블 영역 감지
-                    table_regions = self.detect_table_regions_opencv(temp_page_path)
-                    
-                    if table_regions:
-                        # 각 테이블 영역별로 저장
-                        for table_idx, region in enumerate(table_regions):
-                            table_filename = f"M_table_{origin_number}_{len(table_info)}.png"
-                            table_path = os.path.join(self.target_table_dir, table_filename)
-                            
-                            # 테이블 영역만 추출해서 저장
-                            if self.extract_table_region(temp_page_path, region, table_path):
-                                table_info.append({
-                                    'table_number': len(table_info),
-                                    'filename': table_path,
-                                    'preview_text': f"PDF Page {page_idx + 1} Table {table_idx + 1} - OpenCV detected",
-                                    'rows': 0,
-                                    'columns': 0,
-                                    'size': "OPENCV_TABLE",
-                                    'image_size': f"{region['width']}x{region['height']}",
-                                    'position': f"Page {page_idx + 1} Table {table_idx + 1}",
-                                    'extraction_method': 'opencv_table_detection',
-                                    'region_area': region['area'],
-                                    'aspect_ratio': region['aspect_ratio']
-                                })
-                                
-                                print(f"✅ 테이블 영역 저장 완료: {table_filename} (페이지 {page_idx + 1}, 테이블 {table_idx + 1})")
-                            else:
-                                print(f"❌ 테이블 영역 저장 실패: {table_filename}")
-                    else:
-                        # 테이블이 감지되지 않으면 전체 페이지를 저장 (기존 방식)
-                        table_filename = f"M_table_{origin_number}_{len(table_info)}.png"
-                        table_path = os.path.join(self.target_table_dir, table_filename)
-                        
-                        img_element.screenshot(table_path)
-                        
-                        table_info.append({
-                            'table_number': len(table_info),
-                            'filename': table_path,
-                            'preview_text': f"PDF Page {page_idx + 1} - full page (no table detected)",
-                            'rows': 0,
-                            'columns': 0,
-                            'size': "FULL_PAGE",
-                            'image_size': f"{size['width']}x{size['height']}",
-                            'position': f"Page {page_idx + 1}",
-                            'extraction_method': 'full_page_fallback'
-                        })
-                        
-                        print(f"⚠️ 테이블 미감지, 전체 페이지 저장: {table_filename}")
-                    
-                    # 임시 파일 삭제
-                    if os.path.exists(temp_page_path):
-                        os.unlink(temp_page_path)
-                    
-                except Exception as page_error:
-                    print(f"❌ 페이지 {page_idx + 1} 처리 실패: {page_error}")
-                    continue
-            
-            # 임시 HTML 파일 삭제
-            os.unlink(temp_html_path)
-            
-            print(f"총 {len(table_info)}개의 테이블/이미지를 저장했습니다.")
-            return table_info
-            
-        except Exception as e:
-            print(f"Selenium 처리 실패: {e}")
-            return []
-        finally:
-            if driver:
-                driver.quit()
+        for record in previous['tables']:
+            page_number = get_record_page_number(record)
+            if page_number is None or page_number - 1 not in unchanged_pages:
+                continue
+            
+            table_idx = page_table_counts.get(page_number, 0)
+            page_table_counts[page_number] = table_idx + 1
+            source_path = os.path.join(self.target_table_dir, str(record.get('Table Filename')))
+            if not os.path.exists(source_path):
+                missing_pages.add(page_number - 1)
+                continue
+            
+            temp_path = get_temp_table_path(self.target_table_dir, origin_number, page_number - 1, table_idx)
+            shutil.copy2(source_path, temp_path)
+            reused_entries.append({
+                'temp_path': temp_path,
+                'page_number': page_number,
+                'preview_text': record.get('Preview Text'),
+                'rows': record.get('Rows'),
+                'columns': record.get('Columns'),
+                'size': record.get('Size'),
+                'image_size': record.get('Image Size'),
+                'position': record.get('Position'),
+                'render_dpi': record.get('Render DPI'),
+                'extraction_method': record.get('Extraction Method'),
+                'detector_version': record.get('Detector Version'),
+            })
+        
+        # 일부 이미지가 없는 페이지는 재사용하지 않고 다시 추출
+        kept_entries = [entry for entry in reused_entries if entry['page_number'] - 1 not in missing_pages]
+        for entry in reused_entries:
+            if entry['page_number'] - 1 in missing_pages:
+                os.remove(entry['temp_path'])
+        return kept_entries, missing_pages
 
-    def extract_tables_from_pdf_direct(self, pdf_path, origin_number):
-        """pdfplumber와 pdf2image를 사용해서 정확한 테이블 영역만 감지하여 추출"""
-        import pdfplumber
-        from pdf2image import convert_from_path
-        from PIL import Image
+    def extract_tables_from_pdf_direct(self, pdf_path, origin_number, dpi=300, pages=None, reused_entries=None,
+                                       doc_hash=None):
+        """엔진으로 테이블 영역을 감지하고, 테이블이 있는 영역만 PyMuPDF로 잘라 렌더링하여 추출
         
+        page_workers > 1이면 페이지 범위를 프로세스 풀에 나누어 처리 (번호는 순차 처리와 동일)
+        pages가 주어지면 해당 페이지만 추출하고 reused_entries(이전 개정본 테이블)와 페이지 순서로 병합
+        doc_hash(PDF SHA-256)가 주어지면 페이지별 감지 결과 캐시 사용
+        """
         try:
             print(f"PDF에서 테이블 영역 감지하여 추출: {pdf_path}")
             
-            # 1. PDF 페이지를 고해상도 이미지로 변환
-            print("PDF 페이지를 고해상도 이미지로 변환 중...")
-            try:
-                # 고해상도로 변환 (300 DPI)
-                pages_as_images = convert_from_path(pdf_path, dpi=300)
-                print(f"{len(pages_as_images)}개 페이지를 이미지로 변환 완료")
-            except Exception as e:
-                print(f"PDF 이미지 변환 실패 (Poppler 설치 확인): {e}")
-                return []
-            
-            # 2. pdfplumber로 테이블 위치 감지
-            table_info = []
-            
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    print(f"페이지 {page_num + 1} 테이블 감지 중...")
-                    
-                    # pdfplumber로 테이블 찾기
-                    try:
-                        tables = page.find_tables()
-                        
-                        if tables:
-                            print(f"페이지 {page_num + 1}에서 {len(tables)}개의 테이블을 발견했습니다.")
-                            
-                            # 해당 페이지의 이미지
-                            page_image = pages_as_images[page_num]
-                            
-                            for table_idx, table in enumerate(tables):
-                                try:
-                                    # 테이블의 바운딩 박스 (x0, top, x1, bottom)
-                                    bbox = table.bbox
-                                    print(f"  원본 bbox: {bbox}")
-                                    print(f"  페이지 크기: {page.width} x {page.height}")
-                                    print(f"  이미지 크기: {page_image.width} x {page_image.height}")
-                                    
-                                    # PDF 포인트를 이미지 픽셀 좌표로 변환
-                                    scale_x = page_image.width / page.width
-                                    scale_y = page_image.height / page.height
-                                    print(f"  스케일: {scale_x:.3f} x {scale_y:.3f}")
-                                    
-                                    # PIL crop 좌표 (left, top, right, bottom)
-                                    left = int(bbox[0] * scale_x)
-                                    top = int(bbox[1] * scale_y)
-                                    right = int(bbox[2] * scale_x)
-                                    bottom = int(bbox[3] * scale_y)
-                                    print(f"  변환된 좌표: left={left}, top={top}, right={right}, bottom={bottom}")
-                                    
-                                    # 테이블 영역을 페이지 전체 너비로 확장 (오른쪽 잘림 완전 해결)
-                                    original_left, original_top, original_right, original_bottom = left, top, right, bottom
-                                    
-                                    # 왼쪽은 약간 패딩, 오른쪽은 페이지 끝까지
-                                    left = max(0, left - 30)
-                                    top = max(0, top - 30) 
-                                    right = page_image.width - 20  # 페이지 오른쪽 끝에서 20픽셀만 여백
-                                    bottom = min(page_image.height, bottom + 30)
-                                    
-                                    print(f"  원본 테이블 영역: {original_left}~{original_right} (너비: {original_right-original_left})")
-                                    print(f"  확장된 영역: {left}~{right} (너비: {right-left})")
-                                    print(f"  확장된 크기: {right-left} x {bottom-top}")
-                                    
-                                    # 테이블 영역만 잘라내기
-                                    cropped_table = page_image.crop((left, top, right, bottom))
-                                    
-                                    # 테이블 이미지 저장
-                                    table_filename = f"M_table_{origin_number}_{len(table_info)}.png"
-                                    table_path = os.path.join(self.target_table_dir, table_filename)
-                                    cropped_table.save(table_path, "PNG")
-                                    
-                                    # 테이블 데이터 추출 시도
-                                    try:
-                                        table_data = table.extract()
-                                        rows = len(table_data) if table_data else 0
-                                        cols = len(table_data[0]) if table_data and len(table_data) > 0 else 0
-                                        
-                                        # 미리보기 텍스트 생성
-                                        preview_text = ""
-                                        if table_data and len(table_data) > 0:
-                                            for row_idx, row in enumerate(table_data[:2]):  # 처음 2행만
-                                                if row:
-                                                    row_text = " | ".join([str(cell) if cell else "" for cell in row])
-                                                    preview_text += row_text + " "
-                                                    if len(preview_text) > 100:
-                                                        break
-                                            preview_text = preview_text.strip()[:150] + ("..." if len(preview_text) > 150 else "")
-                                        
-                                        if not preview_text:
-                                            preview_text = f"Page {page_num + 1} Table {table_idx + 1}"
-                                            
-                                    except Exception as data_error:
-                                        print(f"테이블 데이터 추출 실패: {data_error}")
-                                        rows, cols = 0, 0
-                                        preview_text = f"Page {page_num + 1} Table {table_idx + 1}"
-                                    
-                                    table_info.append({
-                                        'table_number': len(table_info),
-                                        'filename': table_path,
-                                        'preview_text': preview_text,
-                                        'rows': rows,
-                                        'columns': cols,
-                                        'size': f"{rows}x{cols}" if rows > 0 and cols > 0 else "DETECTED",
-                                        'image_size': f"{cropped_table.width}x{cropped_table.height}",
-                                        'position': f"Page {page_num + 1} Table {table_idx + 1}",
-                                        'extraction_method': 'pdfplumber_table_detection'
-                                    })
-                                    
-                                    print(f"✅ 테이블 영역 추출 완료: {table_filename} (페이지 {page_num + 1}, 테이블 {table_idx + 1}) - 크기: {cropped_table.width}x{cropped_table.height}")
-                                    
-                                except Exception as table_error:
-                                    print(f"❌ 페이지 {page_num + 1}의 테이블 {table_idx + 1} 추출 실패: {table_error}")
-                                    continue
-                        
-                        else:
-                            # 테이블이 감지되지 않은 경우 - 건너뜀 (전체 페이지 저장하지 않음)
-                            print(f"⚠️ 페이지 {page_num + 1}에서 테이블을 감지하지 못했습니다. (건너뛰기)")
-                    
-                    except Exception as page_error:
-                        print(f"❌ 페이지 {page_num + 1} 처리 실패: {page_error}")
-                        continue
+            page_count = get_page_count(pdf_path)
+            worker_fn = {
+                'opencv': extract_opencv_page_range,
+                'auto': extract_auto_page_range,
+            }.get(self.engine, extract_pymupdf_page_range)
+            worker_args = (origin_number, self.target_table_dir, dpi, doc_hash)
+            if self.engine != 'opencv':
+                # OpenCV 엔진은 감지용 렌더링에서 잘라내므로 고정 DPI
+                worker_args += (self.adaptive_dpi,)
+            if self.engine != 'pymupdf':
+                worker_args += (self.pyramid,)
+            entries = run_page_shards(worker_fn, pdf_path, page_count, self.page_workers, *worker_args, pages=pages,
+                                      table_dir=self.target_table_dir, origin_number=origin_number)
+            if reused_entries:
+                entries = sorted(entries + reused_entries, key=lambda entry: entry['page_number'])
+            
+            # 페이지 순서대로 최종 파일명 부여
+            table_info = finalize_table_files(
+                entries,
+                lambda entry, table_number: os.path.join(self.target_table_dir, f"M_table_{origin_number}_{table_number}.png")
+            )
+            for entry in table_info:
+                print(f"✅ 테이블 영역 추출 완료: {os.path.basename(entry['filename'])} ({entry['position']}) - 크기: {entry['image_size']}")
             
             print(f"총 {len(table_info)}개의 테이블을 추출했습니다.")
             
@@ -564,11 +707,15 @@ class PDFTableProcessorPdfplumber:
             print(f"PDF 테이블 추출 실패: {e}")
             return []
 
-    def process_single_pdf(self, pdf_filename, pdf_path):
-        """단일 PDF 파일 처리"""
+    def process_single_pdf(self, pdf_filename, pdf_path, origin_number=None, ingest=None):
+        """단일 PDF 파일 처리
+        
+        ingest['previous']가 있으면 (같은 파일명의 이전 개정본) 내용이 바뀐 페이지만 다시 추출
+        """
         try:
-            # 다음 Origin Number 계산
-            origin_number = self.existing_data['max_origin_number'] + 1
+            # 다음 Origin Number 계산 (미리 배정되지 않은 경우)
+            if origin_number is None:
+                origin_number = self.existing_data['max_origin_number'] + 1
             
             print(f"\n{'='*50}")
             print(f"처리 중: {pdf_filename}")
@@ -580,8 +727,24 @@ class PDFTableProcessorPdfplumber:
             if not pdf_target_path:
                 return None
             
+            # 문서/페이지 내용 해시
+            sha256 = ingest['sha256'] if ingest else file_sha256(pdf_path)
+            page_hashes = page_content_hashes(pdf_path)
+            previous = ingest.get('previous') if ingest else None
+            
+            pages = None
+            reused_entries = None
+            if previous and previous['page_hashes']:
+                changed_pages = set(find_changed_pages(page_hashes, previous['page_hashes']))
+                unchanged_pages = set(range(len(page_hashes))) - changed_pages
+                reused_entries, missing_pages = self.reuse_previous_tables(previous, unchanged_pages, origin_number)
+                pages = sorted(changed_pages | missing_pages)
+                print(f"개정본 비교 (이전 Origin {previous['origin_number']}): "
+                      f"변경 {len(changed_pages)}페이지, 재사용 테이블 {len(reused_entries)}개")
+            
             # PyMuPDF로 실제 테이블 영역만 추출
-            table_info = self.extract_tables_from_pdf_direct(pdf_path, origin_number)
+            table_info = self.extract_tables_from_pdf_direct(pdf_path, origin_number, pages=pages,
+                                                             reused_entries=reused_entries, doc_hash=sha256)
             
             # 결과 정리
             result = {
@@ -593,6 +756,9 @@ class PDFTableProcessorPdfplumber:
                 'table_count': len(table_info),
                 'table_info': table_info,
                 'processing_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'sha256': sha256,
+                'page_hashes': page_hashes,
+                'detector_version': self.current_detector_version(),
             }
             
             print(f"PDF 처리 완료: {len(table_info)}개 페이지 이미지 추출")
@@ -603,7 +769,7 @@ class PDFTableProcessorPdfplumber:
             return None
 
     def update_excel_data(self, result):
-        """엑셀 데이터 업데이트"""
+        """결과 저장소에 처리 결과 추가 (항목마다 O(1) 기록)"""
         try:
             # 메인 데이터 추가
             main_entry = {
@@ -612,26 +778,25 @@ class PDFTableProcessorPdfplumber:
                 'Page Title': result['page_title'],
                 'PNG Filename': result['png_filename'],
                 'Table Count': result['table_count'],
-                'Processing Time': result['processing_time']
+                'Processing Time': result['processing_time'],
+                'Detector Version': result.get('detector_version')
             }
-            self.existing_data['main_data'].append(main_entry)
-            
             # 테이블 상세 데이터 추가
-            for table_info in result['table_info']:
-                table_entry = {
-                    'Origin Number': result['origin_number'],
-                    'URL': result['url'],
-                    'Table Number': table_info['table_number'],
-                    'Table Filename': os.path.basename(table_info['filename']),
-                    'Preview Text': table_info['preview_text'],
-                    'Rows': table_info['rows'],
-                    'Columns': table_info['columns'],
-                    'Size': table_info['size'],
-                    'Image Size': table_info['image_size'],
-                    'Position': table_info['position'],
-                    'Extraction Method': table_info['extraction_method']
+            table_entries = [build_table_entry(result['origin_number'], result['url'], table_info)
+                             for table_info in result['table_info']]
+            
+            # PDF 내용 해시 (중복/개정본 판단용)
+            document = None
+            if result.get('sha256'):
+                document = {
+                    'sha256': result['sha256'],
+                    'origin_number': result['origin_number'],
+                    'filename': result['url'].replace('PDF_FILE: ', '').strip(),
+                    'page_hashes': result['page_hashes'],
+                    'ingested': result['processing_time'],
                 }
-                self.existing_data['table_data'].append(table_entry)
+            
+            self.result_store.append_result(main_entry, table_entries, document)
             
             # 처리된 PDF를 기존 PDF 세트에 추가
             if result['url'].startswith('PDF_FILE:'):
@@ -643,21 +808,15 @@ class PDFTableProcessorPdfplumber:
                 self.existing_data['max_origin_number'] = result['origin_number']
                 
         except Exception as e:
-            print(f"엑셀 데이터 업데이트 실패: {e}")
+            print(f"결과 저장소 기록 실패: {e}")
 
     def save_to_excel(self):
-        """전체 데이터를 엑셀 파일로 저장"""
+        """결과 저장소 전체를 엑셀 파일로 내보내기 (실행 종료 시)"""
         try:
-            print(f"\n엑셀 파일 업데이트 중: {self.excel_filename}")
+            print(f"\n엑셀 파일 내보내기 중: {self.excel_filename}")
             
-            with pd.ExcelWriter(self.excel_filename, engine='openpyxl') as writer:
-                # 메인 결과 시트
-                main_df = pd.DataFrame(self.existing_data['main_data'])
-                main_df.to_excel(writer, sheet_name='Main Results', index=False)
-                
-                # 테이블 상세 시트
-                table_df = pd.DataFrame(self.existing_data['table_data'])
-                table_df.to_excel(writer, sheet_name='Table Details', index=False)
+            # Main Results, Table Details 시트
+            main_count, table_count = self.result_store.export_excel(self.excel_filename)
             
             print(f"엑셀 파일 저장 완료: {self.excel_filename}")
             
@@ -665,8 +824,8 @@ class PDFTableProcessorPdfplumber:
             print(f"\n{'='*60}")
             print(f"전체 데이터베이스 현황")
             print(f"{'='*60}")
-            print(f"총 처리된 항목: {len(self.existing_data['main_data'])}개 (URL + PDF)")
-            print(f"엑셀에 기록된 테이블: {len(self.existing_data['table_data'])}개")
+            print(f"총 처리된 항목: {main_count}개 (URL + PDF)")
+            print(f"엑셀에 기록된 테이블: {table_count}개")
             
             # 실제 파일 개수
             if os.path.exists(self.target_table_dir):
@@ -690,9 +849,193 @@ class PDFTableProcessorPdfplumber:
         except Exception as e:
             print(f"PDF 파일 삭제 실패: {e}")
 
+    def record_result(self, result, pdf_path):
+        """처리 결과를 카탈로그에 기록하고 원본 PDF 정리 (단일 기록자)"""
+        if not result:
+            return
+        
+        # 결과 저장소에 즉시 기록 (엑셀은 종료 시 내보내기)
+        self.update_excel_data(result)
+        print(f"결과 저장소 기록 완료 (Origin {result['origin_number']})")
+        
+        # 처리 완료된 PDF 삭제
+        self.cleanup_temperal_pdf(pdf_path)
+    
+    def get_parallel_worker_count(self):
+        """워커 수 결정 - 메모리 한도가 있으면 사용 가능한 메모리로 제한"""
+        workers = self.workers
+        if self.memory_budget_mb:
+            try:
+                import psutil
+                available_mb = psutil.virtual_memory().available / (1024 * 1024)
+                workers = max(1, min(workers, int(available_mb // self.memory_budget_mb)))
+            except ImportError:
+                pass
+        return workers
+    
+    def quarantine_pdf(self, pdf_path):
+        """반복 실패한 PDF를 temperal_pdf/quarantine으로 이동 (다음 실행부터 검색되지 않음)"""
+        try:
+            os.makedirs(self.quarantine_dir, exist_ok=True)
+            target_path = os.path.join(self.quarantine_dir, os.path.basename(pdf_path))
+            shutil.move(pdf_path, target_path)
+            print(f"⛔ PDF 격리: {target_path}")
+        except Exception as e:
+            print(f"PDF 격리 실패: {e}")
+
+    def cleanup_failed_output(self, origin_number):
+        """중단된 처리가 남긴 Origin PDF 복사본과 임시 테이블 이미지 삭제"""
+        origin_pdf = os.path.join(self.target_origin_dir, f"M_origin_{origin_number}.pdf")
+        temp_prefix = f".tmp_M_table_{origin_number}_p"
+        try:
+            if os.path.exists(origin_pdf):
+                os.remove(origin_pdf)
+            for filename in os.listdir(self.target_table_dir):
+                if filename.startswith(temp_prefix):
+                    os.remove(os.path.join(self.target_table_dir, filename))
+        except Exception as e:
+            print(f"중단된 처리 파일 정리 실패 (Origin {origin_number}): {e}")
+
+    def record_failure(self, task, reason):
+        """감시 프로세스가 중단시킨 PDF를 실패로 기록하고, 실패가 누적되면 격리"""
+        origin_number, pdf_filename, pdf_path, ingest = task
+        print(f"❌ PDF 처리 중단 ({pdf_filename}): {reason}")
+        self.cleanup_failed_output(origin_number)
+        
+        try:
+            sha256 = ingest['sha256'] if ingest else file_sha256(pdf_path)
+            failures = self.result_store.record_failure(sha256, pdf_filename, origin_number, reason,
+                                                        datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        except Exception as e:
+            print(f"실패 기록 실패: {e}")
+            return
+        
+        if failures >= QUARANTINE_AFTER:
+            self.quarantine_pdf(pdf_path)
+        else:
+            print(f"실패 {failures}회 - {QUARANTINE_AFTER}회가 되면 격리됩니다.")
+
+    def run_parallel(self, tasks):
+        """PDF마다 감시되는 하위 프로세스에서 처리 (동시에 최대 workers개) - 결과는 입력 순서대로 부모 프로세스에서만 기록
+        
+        제한 시간/메모리 상한을 넘거나 비정상 종료된 PDF는 강제 종료 후 실패로 기록하고 배치는 계속 진행
+        """
+        workers = self.get_parallel_worker_count()
+        print(f"PDF 처리 감시: 워커 {workers}개" +
+              (f", 제한 시간 {self.deadline}초" if self.deadline else "") +
+              (f", 메모리 상한 {self.rss_limit_mb}MB" if self.rss_limit_mb else ""))
+        
+        pending_results = {}
+        next_index = 0
+        completed = 0
+        
+        task_args = [(pdf_filename, pdf_path, origin_number, ingest, self.engine, self.adaptive_dpi, self.pyramid,
+                      self.page_workers)
+                     for origin_number, pdf_filename, pdf_path, ingest in tasks]
+        for index, result, failure in run_supervised(process_pdf_worker, task_args, workers,
+                                                     self.deadline, self.rss_limit_mb):
+            origin_number, pdf_filename, pdf_path, _ = tasks[index]
+            if failure:
+                self.record_failure(tasks[index], failure)
+            pending_results[index] = result
+            
+            completed += 1
+            print(f"진행상황: {completed}/{len(tasks)} ({pdf_filename}, Origin {origin_number})")
+            
+            # 입력 순서대로 카탈로그에 기록
+            while next_index in pending_results:
+                result = pending_results.pop(next_index)
+                self.record_result(result, tasks[next_index][2])
+                next_index += 1
+    
+    def warm_up(self):
+        """감시 모드: 엔진 모듈을 미리 불러와 하위 프로세스(fork)가 물려받도록 함"""
+        modules = {
+            'opencv': ['cv2'],
+            'auto': ['cv2'],
+        }.get(self.engine, [])
+        for module_name in modules:
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                print(f"모듈 미리 불러오기 실패 ({module_name}): {e}")
+
+    def next_origin_number(self, in_flight):
+        """처리 중인 PDF에 배정된 번호 다음의 Origin Number"""
+        return max([self.existing_data['max_origin_number']] + list(in_flight)) + 1
+
+    def run_watch(self, settle_seconds=DEFAULT_SETTLE_SECONDS, poll_interval=DEFAULT_POLL_INTERVAL):
+        """감시 모드: temperal_pdf에 복사가 끝난 PDF를 바로 처리하는 상주 루프 (Ctrl+C로 종료)
+        
+        모듈, 결과 저장소 연결, 감지 캐시는 프로세스가 살아 있는 동안 유지되고,
+        PDF마다 감시되는 하위 프로세스(최대 workers개)에서 처리. 엑셀은 대기열이 빌 때마다 내보냄
+        """
+        watcher = HotFolderWatcher(self.temperal_pdf_dir, settle_seconds=settle_seconds, poll_interval=poll_interval)
+        supervisor = Supervisor(process_pdf_worker, self.get_parallel_worker_count(), self.deadline,
+                                self.rss_limit_mb)
+        
+        print(f"PDF 감시 모드 시작 ({self.engine} 기반, {watcher.mode}, 워커 {supervisor.workers}개)")
+        print(f"감시 폴더: {self.temperal_pdf_dir}")
+        self.index_existing_documents()
+        self.warm_up()
+        
+        queue = []
+        in_flight = {}  # Origin Number → (Origin Number, 파일명, 경로, ingest)
+        dirty = False
+        
+        try:
+            while True:
+                queue.extend(path for path in watcher.scan() if path not in queue)
+                
+                # 빈 워커 자리만큼 새 PDF 시작
+                while queue and supervisor.has_capacity():
+                    pdf_path = queue.pop(0)
+                    pdf_filename = os.path.basename(pdf_path)
+                    if not os.path.exists(pdf_path):
+                        continue
+                    try:
+                        batch_hashes = {task[3]['sha256']: task[1] for task in in_flight.values()}
+                        ingest = self.check_pdf_file(pdf_filename, pdf_path, batch_hashes)
+                    except Exception as e:
+                        print(f"PDF 검사 실패 ({pdf_filename}): {e}")
+                        continue
+                    if not ingest:
+                        continue
+                    
+                    origin_number = self.next_origin_number(in_flight)
+                    in_flight[origin_number] = (origin_number, pdf_filename, pdf_path, ingest)
+                    supervisor.submit(origin_number, (pdf_filename, pdf_path, origin_number, ingest,
+                                                      self.engine, self.adaptive_dpi, self.pyramid,
+                                                      self.page_workers))
+                    print(f"처리 시작: {pdf_filename} (Origin {origin_number})")
+                
+                if not in_flight:
+                    # 처리할 것이 없으면 쌓인 결과를 엑셀로 내보내고 다음 알림까지 대기
+                    if dirty and not queue:
+                        self.save_to_excel()
+                        dirty = False
+                    watcher.wait()
+                    continue
+                
+                # 끝난 PDF는 완료 순서대로 바로 기록
+                for origin_number, result, failure in supervisor.poll():
+                    task = in_flight.pop(origin_number)
+                    if failure:
+                        self.record_failure(task, failure)
+                    self.record_result(result, task[2])
+                    dirty = dirty or bool(result)
+        
+        except KeyboardInterrupt:
+            print("\nPDF 감시 모드를 종료합니다.")
+        finally:
+            supervisor.stop_all()
+            watcher.close()
+            if dirty:
+                self.save_to_excel()
+
     def run(self):
         """메인 실행 함수"""
-        print("PDF 테이블 처리 시작 (Selenium 기반)")
+        print(f"PDF 테이블 처리 시작 ({self.engine} 기반)")
         print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # temperal_pdf 디렉토리에서 새로운 PDF 파일 찾기
@@ -705,30 +1048,28 @@ class PDFTableProcessorPdfplumber:
         
         print(f"총 {len(pdf_files)}개의 PDF 파일을 처리합니다.\n")
         
-        # 각 PDF 파일 처리
-        for idx, (pdf_filename, pdf_path) in enumerate(pdf_files, 1):
-            print(f"진행상황: {idx}/{len(pdf_files)}")
-            
-            # PDF 처리
-            result = self.process_single_pdf(pdf_filename, pdf_path)
-            
-            if result:
-                # 엑셀 데이터 업데이트
-                self.update_excel_data(result)
-                
-                # 중간 저장
-                self.save_to_excel()
-                print(f"중간 저장 완료 (Origin {result['origin_number']})")
+        # Origin Number는 입력 순서대로 미리 배정 (병렬 처리 결과도 순차 처리와 동일)
+        first_origin = self.existing_data['max_origin_number'] + 1
+        tasks = [(first_origin + idx, pdf_filename, pdf_path, ingest)
+                 for idx, (pdf_filename, pdf_path, ingest) in enumerate(pdf_files)]
+        
+        if self.watchdog or self.workers > 1:
+            self.run_parallel(tasks)
+        else:
+            # 각 PDF 파일 처리
+            for idx, (origin_number, pdf_filename, pdf_path, ingest) in enumerate(tasks, 1):
+                print(f"진행상황: {idx}/{len(tasks)}")
                 
-                # 처리 완료된 PDF 삭제
-                self.cleanup_temperal_pdf(pdf_path)
+                # PDF 처리
+                result = self.process_single_pdf(pdf_filename, pdf_path, origin_number, ingest)
+                self.record_result(result, pdf_path)
                 
-                if idx < len(pdf_files):
+                if result and idx < len(tasks):
                     print("다음 PDF 처리를 위해 1초 대기...")
                     time.sleep(1)
         
-        # 최종 저장
-        print("\n최종 엑셀 파일 저장 확인...")
+        # 최종 엑셀 내보내기
+        print("\n최종 엑셀 파일 내보내기...")
         self.save_to_excel()
         
         print(f"\n모든 PDF 처리가 완료되었습니다!")
@@ -736,11 +1077,53 @@ class PDFTableProcessorPdfplumber:
 
 def main():
     """프로그램 진입점"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PDF 테이블 추출 (PyMuPDF 기반)")
+    parser.add_argument('--page-workers', type=int, default=1, help="한 PDF의 페이지를 나누어 처리할 프로세스 수")
+    parser.add_argument('--workers', type=int, default=1, help="여러 PDF를 동시에 처리할 프로세스 수")
+    parser.add_argument('--memory-budget-mb', type=int, default=None, help="파일 병렬 처리 워커별 메모리 한도 (MB) - 워커 수 제한과 메모리(PSS) 상한으로 적용")
+    parser.add_argument('--engine', choices=['pymupdf', 'opencv', 'auto'] + sorted(ENGINE_ALIASES), default='pymupdf',
+                        help="테이블 감지 엔진 (pymupdf: PyMuPDF find_tables로 감지 / "
+                             "opencv: 렌더링한 페이지에서 선 구조로 감지, 미감지 시 전체 페이지 저장 / "
+                             "auto: 페이지마다 괘선/스캔 여부로 감지기 선택 / pdfplumber: pymupdf의 이전 이름, 사용 중단 예정)")
+    parser.add_argument('--fixed-dpi', action='store_true',
+                        help="테이블별 DPI 자동 선택 대신 고정 300 DPI로 렌더링")
+    parser.add_argument('--pyramid', action='store_true',
+                        help="OpenCV 감지(opencv/auto 엔진)를 약 75 DPI 후보 탐색 후 후보 영역만 원본 해상도로 수행")
+    parser.add_argument('--deadline', type=int, default=DEFAULT_DEADLINE, help="PDF 1개 처리 제한 시간 (초)")
+    parser.add_argument('--rss-limit-mb', type=int, default=DEFAULT_RSS_LIMIT_MB,
+                        help="PDF 1개 처리 프로세스 메모리 상한 (MB, 하위 프로세스 포함 PSS 기준)")
+    parser.add_argument('--no-watchdog', action='store_true',
+                        help="감시 프로세스 없이 현재 프로세스에서 순서대로 처리 (--workers 1일 때)")
+    parser.add_argument('--watch', action='store_true',
+                        help="감시 모드: 종료하지 않고 temperal_pdf에 새로 복사된 PDF를 바로 처리")
+    parser.add_argument('--settle-seconds', type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="감시 모드: 파일 크기가 이 시간 동안 변하지 않으면 복사 완료로 판단 (초)")
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="감시 모드: inotify가 없을 때 폴더 확인 주기 (초)")
+    args = parser.parse_args()
+    if args.engine in ENGINE_ALIASES:
+        print(f"⚠️ 사용 중단 예정인 엔진 이름: {args.engine} → {ENGINE_ALIASES[args.engine]}로 처리합니다.")
+    
     try:
         print("디렉토리 설정 완료")
         
-        processor = PDFTableProcessorPdfplumber()
-        processor.run()
+        processor = PDFTableProcessorPdfplumber(
+            page_workers=args.page_workers,
+            workers=args.workers,
+            memory_budget_mb=args.memory_budget_mb,
+            engine=args.engine,
+            adaptive_dpi=not args.fixed_dpi,
+            watchdog=not args.no_watchdog,
+            deadline=args.deadline,
+            rss_limit_mb=args.rss_limit_mb,
+            pyramid=args.pyramid
+        )
+        if args.watch:
+            processor.run_watch(args.settle_seconds, args.poll_interval)
+        else:
+            processor.run()
         
     except KeyboardInterrupt:
         print("\n\n사용자가 프로그램을 중단했습니다.")
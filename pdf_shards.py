@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+PDF 페이지 분할 병렬 처리
+한 PDF의 페이지 범위를 프로세스 풀에 나누어 처리하고, 결과를 페이지 순서대로 합쳐
+M_table_{origin}_{n} 번호가 순차 처리와 동일하게 유지되도록 함
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def get_page_count(pdf_path):
+    """PDF 페이지 수"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as document:
+        return len(document)
+
+
+def split_page_ranges(page_count, shard_count):
+    """페이지를 연속된 범위 [start, end)로 균등 분할"""
+    shard_count = max(1, min(shard_count, page_count))
+    base, extra = divmod(page_count, shard_count)
+    ranges = []
+    start = 0
+    for index in range(shard_count):
+        end = start + base + (1 if index < extra else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def get_temp_table_path(table_dir, origin_number, page_num, table_idx):
+    """워커가 쓰는 임시 테이블 이미지 경로 (최종 번호는 병합 후 부여)"""
+    return os.path.join(table_dir, f".tmp_M_table_{origin_number}_p{page_num:05d}_{table_idx}.png")
+
+
+def group_page_ranges(pages):
+    """페이지 인덱스 목록을 연속된 범위 [start, end) 목록으로 묶기"""
+    ranges = []
+    for page_idx in sorted(set(pages)):
+        if ranges and ranges[-1][1] == page_idx:
+            ranges[-1] = (ranges[-1][0], page_idx + 1)
+        else:
+            ranges.append((page_idx, page_idx + 1))
+    return ranges
+
+
+def remove_temp_table_files(table_dir, origin_number):
+    """Origin의 임시 테이블 이미지(.tmp_M_table_{origin}_p*) 모두 삭제 (실패한 추출 정리)"""
+    prefix = f".tmp_M_table_{origin_number}_p"
+    try:
+        names = os.listdir(table_dir)
+    except OSError:
+        return 0
+
+    removed = 0
+    for name in names:
+        if name.startswith(prefix):
+            try:
+                os.remove(os.path.join(table_dir, name))
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def run_page_shards(worker_fn, pdf_path, page_count, workers, *args, shards_per_worker=4, pages=None,
+                    table_dir=None, origin_number=None):
+    """페이지 범위별로 worker_fn(pdf_path, start, end, *args)를 실행하고 페이지 순서대로 결과 병합
+
+    workers가 1 이하이면 현재 프로세스에서 전체 범위를 한 번에 처리
+    pages가 주어지면 해당 페이지(0부터)만 처리 (개정본의 변경 페이지 재추출)
+    table_dir/origin_number가 주어지면 범위 하나라도 실패할 때 이미 쓴 임시 테이블 이미지를 삭제한 뒤 예외 전달
+    """
+    try:
+        return collect_page_shards(worker_fn, pdf_path, page_count, workers, args, shards_per_worker, pages)
+    except BaseException:
+        if table_dir is not None:
+            removed = remove_temp_table_files(table_dir, origin_number)
+            if removed:
+                print(f"실패한 추출의 임시 테이블 이미지 {removed}개 삭제 (Origin {origin_number})")
+        raise
+
+
+def collect_page_shards(worker_fn, pdf_path, page_count, workers, args, shards_per_worker, pages):
+    """run_page_shards 본체 - 범위별 실행과 페이지 순서 병합"""
+    if pages is not None:
+        ranges = group_page_ranges(pages)
+        if workers <= 1:
+            merged = []
+            for start, end in ranges:
+                merged.extend(worker_fn(pdf_path, start, end, *args))
+            return merged
+    elif workers <= 1 or page_count <= 1:
+        return worker_fn(pdf_path, 0, page_count, *args)
+    else:
+        ranges = split_page_ranges(page_count, workers * shards_per_worker)
+    print(f"페이지 분할 병렬 처리: {page_count}페이지 → {len(ranges)}개 범위, 워커 {workers}개")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker_fn, pdf_path, start, end, *args) for start, end in ranges]
+        # 범위 순서대로 결과 수집 (= 페이지 순서)
+        merged = []
+        try:
+            for future in futures:
+                merged.extend(future.result())
+        except BaseException:
+            # 아직 시작하지 않은 범위는 취소 (실행 중인 범위는 with 종료 시 끝날 때까지 대기)
+            for future in futures:
+                future.cancel()
+            raise
+    return merged
+
+
+def assign_table_files(entries, name_fn):
+    """페이지 순서대로 table_number와 최종 파일 경로('filename') 부여 - 임시 파일은 아직 옮기지 않음
+
+    name_fn(entry, table_number) → 최종 파일 경로
+    """
+    table_info = []
+    for entry in entries:
+        table_number = len(table_info)
+        table_info.append({'table_number': table_number, 'filename': name_fn(entry, table_number), **entry})
+    return table_info
+
+
+def commit_table_files(table_info):
+    """assign_table_files 결과의 임시 파일('temp_path')을 최종 경로로 변경"""
+    for entry in table_info:
+        os.replace(entry.pop('temp_path'), entry['filename'])
+    return table_info
+
+
+def discard_table_files(table_info):
+    """assign_table_files 결과의 임시 파일 삭제 (최종 경로의 기존 파일은 그대로 유지)"""
+    for entry in table_info:
+        temp_path = entry.pop('temp_path', None)
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def finalize_table_files(entries, name_fn):
+    """임시 파일을 페이지 순서대로 최종 이름으로 변경하고 table_number 부여
+
+    name_fn(entry, table_number) → 최종 파일 경로
+    """
+    return commit_table_files(assign_table_files(entries, name_fn))
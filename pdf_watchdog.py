@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+PDF 처리 감시 (하위 프로세스 격리)
+문서마다 별도 프로세스에서 실행하고 부모 프로세스가 제한 시간과 메모리(하위 프로세스 포함 PSS) 상한을 감시.
+초과하거나 비정상 종료되면 해당 프로세스만 강제 종료하고 실패 사유를 돌려주어 배치는 계속 진행
+"""
+
+import os
+import time
+import signal
+import multiprocessing
+from multiprocessing.connection import wait
+
+DEFAULT_DEADLINE = 900          # 문서 1개 제한 시간 (초)
+DEFAULT_RSS_LIMIT_MB = 4096     # 문서 1개 처리 프로세스 메모리 상한 (MB)
+QUARANTINE_AFTER = 2            # 같은 문서(SHA-256)가 이 횟수만큼 실패하면 격리
+POLL_INTERVAL = 0.5
+
+
+def read_proc_kb(path, field):
+    """/proc의 'Field:  값 kB' 형식 파일에서 값 읽기 (MB) - 읽을 수 없으면 None"""
+    try:
+        with open(path) as proc_file:
+            for line in proc_file:
+                if line.startswith(field):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def get_proc_pss_mb(pid):
+    """/proc에서 읽은 프로세스 1개의 PSS (MB) - smaps_rollup이 없는 커널이면 RSS, 둘 다 안 되면 None
+
+    PSS는 공유 페이지를 공유하는 프로세스 수로 나누어 더하므로, fork로 물려받은 copy-on-write
+    페이지를 부모와 하위 프로세스 합계에서 한 번만 셈
+    """
+    pss_mb = read_proc_kb(f'/proc/{pid}/smaps_rollup', 'Pss:')
+    if pss_mb is not None:
+        return pss_mb
+    return read_proc_kb(f'/proc/{pid}/status', 'VmRSS:')
+
+
+def get_proc_descendants(pid):
+    """/proc/<pid>/task/*/children를 재귀로 따라간 하위 프로세스 pid 목록 - 지원하지 않는 커널이면 None"""
+    if not os.path.exists(f'/proc/{pid}/task/{pid}/children'):
+        return None  # CONFIG_PROC_CHILDREN 미지원 (또는 이미 종료된 프로세스)
+
+    descendants = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            task_ids = os.listdir(f'/proc/{current}/task')
+        except OSError:
+            continue  # 확인 중에 종료된 프로세스
+        for task_id in task_ids:
+            try:
+                with open(f'/proc/{current}/task/{task_id}/children') as children_file:
+                    children = [int(child) for child in children_file.read().split()]
+            except (OSError, ValueError):
+                continue  # 확인 중에 끝난 스레드
+            descendants.extend(children)
+            stack.extend(children)
+    return descendants
+
+
+def get_memory_mb(pid):
+    """프로세스와 모든 하위 프로세스(페이지 범위 프로세스 풀 등)의 PSS 합계 (MB)
+
+    /proc 우선, 없으면 psutil, 둘 다 안 되면 None
+    """
+    memory_mb = get_proc_pss_mb(pid)
+    if memory_mb is not None:
+        descendants = get_proc_descendants(pid)
+        if descendants is not None:
+            for child in descendants:
+                memory_mb += get_proc_pss_mb(child) or 0
+            return memory_mb
+    try:
+        import psutil
+
+        def get_process_bytes(process):
+            try:
+                return process.memory_full_info().pss
+            except (AttributeError, psutil.AccessDenied):
+                return process.memory_info().rss  # PSS를 지원하지 않는 플랫폼
+
+        process = psutil.Process(pid)
+        total = get_process_bytes(process)
+        for child in process.children(recursive=True):
+            try:
+                total += get_process_bytes(child)
+            except psutil.Error:
+                continue  # 확인 중에 종료된 하위 프로세스
+        return total / (1024 * 1024)
+    except Exception:
+        return memory_mb
+
+
+def run_child(conn, worker_fn, args, initializer, initargs):
+    """하위 프로세스 진입점 - 결과 또는 예외 메시지를 파이프로 전송"""
+    try:
+        if initializer:
+            initializer(*initargs)
+        conn.send(('ok', worker_fn(*args)))
+    except BaseException as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def get_descendant_pids(pid):
+    """모든 하위 프로세스 pid 목록 - /proc 우선, 없으면 psutil, 둘 다 안 되면 빈 목록"""
+    descendants = get_proc_descendants(pid)
+    if descendants is not None:
+        return descendants
+    try:
+        import psutil
+        return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+    except Exception:
+        return []
+
+
+def stop_process(process):
+    """하위 프로세스 강제 종료 - 그 안에서 띄운 프로세스 풀 워커도 함께 종료 (고아로 남지 않도록)"""
+    if process.is_alive():
+        descendants = get_descendant_pids(process.pid)
+        process.kill()
+        for child in descendants:
+            try:
+                os.kill(child, signal.SIGKILL)
+            except OSError:
+                pass  # 이미 종료됨
+    process.join()
+
+
+def get_process_context():
+    """하위 프로세스 시작 방식 - 가능하면 fork (부모가 불러온 모듈을 그대로 물려받아 시작이 빠름)"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+class Supervisor:
+    def __init__(self, worker_fn, workers=1, deadline=DEFAULT_DEADLINE, rss_limit_mb=DEFAULT_RSS_LIMIT_MB,
+                 initializer=None, initargs=()):
+        self.worker_fn = worker_fn
+        self.workers = max(1, workers)
+        # deadline/rss_limit_mb가 None이면 해당 감시는 하지 않음 (비정상 종료 격리는 항상 적용)
+        self.deadline = deadline
+        self.rss_limit_mb = rss_limit_mb
+        self.initializer = initializer
+        self.initargs = initargs
+        self.context = get_process_context()
+        self.running = {}  # 수신 파이프 → (key, 프로세스, 시작 시각)
+
+    def __len__(self):
+        return len(self.running)
+
+    def has_capacity(self):
+        """새 작업을 시작할 수 있는지 (동시에 최대 workers개)"""
+        return len(self.running) < self.workers
+
+    def submit(self, key, args):
+        """worker_fn(*args)를 새 하위 프로세스에서 시작"""
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=run_child,
+                                       args=(sender, self.worker_fn, args, self.initializer, self.initargs))
+        process.start()
+        sender.close()
+        self.running[receiver] = (key, process, time.monotonic())
+
+    def poll(self, timeout=POLL_INTERVAL):
+        """최대 timeout초 기다려 끝난 작업 목록 반환 - (key, result, failure)
+
+        성공하면 failure는 None, 실패하면 result는 None이고 failure는 사유
+        (제한 시간 초과, 메모리 초과, 비정상 종료, 예외)
+        """
+        finished = []
+
+        # 결과 수신 (결과 없이 파이프가 닫히면 비정상 종료)
+        for conn in wait(list(self.running), timeout=timeout):
+            key, process, _ = self.running.pop(conn)
+            try:
+                status, value = conn.recv()
+            except (EOFError, OSError):
+                process.join()
+                status, value = 'crashed', f"비정상 종료 (exit code {process.exitcode})"
+            else:
+                process.join()
+            finally:
+                conn.close()
+
+            if status == 'ok':
+                finished.append((key, value, None))
+            elif status == 'error':
+                finished.append((key, None, f"예외 - {value}"))
+            else:
+                finished.append((key, None, value))
+
+        # 제한 시간/메모리 상한 확인
+        now = time.monotonic()
+        for conn, (key, process, started) in list(self.running.items()):
+            reason = None
+            if self.deadline and now - started > self.deadline:
+                reason = f"제한 시간 초과 ({self.deadline}초)"
+            elif self.rss_limit_mb:
+                memory_mb = get_memory_mb(process.pid)
+                if memory_mb is not None and memory_mb > self.rss_limit_mb:
+                    reason = f"메모리 초과 (PSS {memory_mb:.0f}MB > {self.rss_limit_mb}MB)"
+
+            if reason:
+                stop_process(process)
+                conn.close()
+                del self.running[conn]
+                finished.append((key, None, reason))
+
+        return finished
+
+    def stop_all(self):
+        """실행 중인 하위 프로세스 모두 강제 종료 (중단 시 정리)"""
+        for conn, (_, process, _) in self.running.items():
+            stop_process(process)
+            conn.close()
+        self.running = {}
+
+
+def run_supervised(worker_fn, task_args, workers=1, deadline=DEFAULT_DEADLINE, rss_limit_mb=DEFAULT_RSS_LIMIT_MB,
+                   initializer=None, initargs=()):
+    """task_args의 인자 튜플마다 worker_fn을 별도 프로세스에서 실행 (동시에 최대 workers개)
+
+    끝나는 순서대로 (index, result, failure)를 반환 - 성공하면 failure는 None,
+    실패하면 result는 None이고 failure는 사유 (제한 시간 초과, 메모리 초과, 비정상 종료, 예외).
+    deadline/rss_limit_mb가 None이면 해당 감시는 하지 않음 (비정상 종료 격리는 항상 적용)
+    """
+    supervisor = Supervisor(worker_fn, workers, deadline, rss_limit_mb, initializer, initargs)
+    pending = list(enumerate(task_args))
+
+    try:
+        while pending or len(supervisor):
+            # 빈 자리만큼 새 프로세스 시작
+            while pending and supervisor.has_capacity():
+                supervisor.submit(*pending.pop(0))
+
+            for finished in supervisor.poll():
+                yield finished
+    finally:
+        # 중단(KeyboardInterrupt 등) 시 남은 프로세스 정리
+        supervisor.stop_all()
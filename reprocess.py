@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+통합 PDF 테이블 재처리
+결과 저장소(카탈로그)에서 PDF 항목을 Origin 범위, 감지기 버전, 추출 방식으로 선택하여
+프로세스 풀로 다시 추출하고 Table Details 행을 제자리에서 갱신합니다.
+기록된 감지기 버전(감지기, 코드 버전, 파라미터)이 이미 같은 항목은 건너뜁니다.
+
+실행 방법:
+python reprocess.py                                  # 기본 엔진(PyMuPDF find_tables)으로 오래된 항목만 재처리
+python reprocess.py --engine pymupdf_padded --workers 4  # PyMuPDF find_tables, 사방 20pt 여백, 400 DPI (강제 재처리 방식)
+python reprocess.py --engine opencv --method full_page_fallback  # 전체 페이지로 저장된 항목을 OpenCV 엔진으로
+python reprocess.py --origin-from 10 --origin-to 20 --method image_based_table_detection
+python reprocess.py --detector-version none --force  # 감지기 버전 기록이 없는 항목 강제 재처리
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from result_store import ResultStore, DEFAULT_EXCEL_FILENAME
+from pdf_shards import (get_page_count, assign_table_files, commit_table_files, discard_table_files,
+                        remove_temp_table_files)
+from pdf_hashes import file_sha256
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ORIGIN_DIR = os.path.join(BASE_DIR, 'Medical', 'Context', 'Origin')
+TABLE_DIR = os.path.join(BASE_DIR, 'Medical', 'Table')
+
+# 엔진별 기본 출력 DPI
+ENGINE_DPI = {
+    'pymupdf': 300,
+    'pymupdf_padded': 400,
+    'image': 300,
+    'opencv': 300,
+    'auto': 300,
+}
+# 이전 엔진 이름 → 현재 이름 (CLI 호환용 별칭)
+ENGINE_ALIASES = {'pdfplumber': 'pymupdf'}
+
+
+def get_engine_detector_version(engine, dpi, adaptive_dpi=True, pyramid=False):
+    """엔진의 현재 감지기 버전 문자열"""
+    if engine == 'pymupdf':
+        from pdf_processor_pdfplumber import get_pymupdf_detector_version
+        return get_pymupdf_detector_version(dpi, adaptive_dpi)
+    if engine == 'pymupdf_padded':
+        from force_reprocess_tables import get_pymupdf_padded_detector_version
+        return get_pymupdf_padded_detector_version(dpi, adaptive_dpi)
+    if engine == 'opencv':
+        from pdf_processor_pdfplumber import get_opencv_detector_version
+        return get_opencv_detector_version(dpi, pyramid)
+    if engine == 'auto':
+        from pdf_processor_pdfplumber import get_auto_detector_version
+        return get_auto_detector_version(dpi, adaptive_dpi, pyramid)
+    from pdf_image_table_extractor import get_image_detector_version
+    return get_image_detector_version(dpi, pyramid)
+
+
+def extract_with_engine(engine, pdf_path, page_count, origin_number, dpi, doc_hash, adaptive_dpi=True,
+                        pyramid=False):
+    """엔진의 페이지 범위 추출 함수로 전체 페이지 처리 (임시 파일 항목 반환)
+    
+    adaptive_dpi는 테이블 영역만 렌더링하는 엔진(pymupdf, pymupdf_padded, auto)에만,
+    pyramid는 OpenCV 감지를 쓰는 엔진(opencv, auto, image)에만 적용
+    """
+    if engine == 'pymupdf':
+        from pdf_processor_pdfplumber import extract_pymupdf_page_range
+        return extract_pymupdf_page_range(pdf_path, 0, page_count, origin_number, TABLE_DIR, dpi, doc_hash,
+                                          adaptive_dpi)
+    if engine == 'pymupdf_padded':
+        from force_reprocess_tables import extract_pymupdf_padded_page_range
+        return extract_pymupdf_padded_page_range(pdf_path, 0, page_count, origin_number, TABLE_DIR, dpi, doc_hash,
+                                                 adaptive_dpi)
+    if engine == 'opencv':
+        from pdf_processor_pdfplumber import extract_opencv_page_range
+        return extract_opencv_page_range(pdf_path, 0, page_count, origin_number, TABLE_DIR, dpi, doc_hash, pyramid)
+    if engine == 'auto':
+        from pdf_processor_pdfplumber import extract_auto_page_range
+        return extract_auto_page_range(pdf_path, 0, page_count, origin_number, TABLE_DIR, dpi, doc_hash,
+                                       adaptive_dpi, pyramid)
+    from pdf_image_table_extractor import extract_image_page_range
+    return extract_image_page_range(pdf_path, 0, page_count, origin_number, dpi, doc_hash, pyramid=pyramid)
+
+
+def reprocess_document(engine, origin_number, pdf_path, dpi, adaptive_dpi=True, pyramid=False):
+    """PDF 1개 재추출 (프로세스 풀 워커) - 새 테이블 정보만 반환, 카탈로그 기록은 부모 프로세스가 담당
+
+    새 이미지는 임시 파일로 남겨 두고 최종 파일명만 정함. 기존 이미지는 부모 프로세스가
+    카탈로그 갱신을 마친 뒤 교체하므로 중간에 실패해도 카탈로그와 파일이 어긋나지 않음
+    """
+    doc_hash = file_sha256(pdf_path)  # 감지 캐시 키
+    page_count = get_page_count(pdf_path)
+    try:
+        entries = extract_with_engine(engine, pdf_path, page_count, origin_number, dpi, doc_hash, adaptive_dpi,
+                                      pyramid)
+    except BaseException:
+        remove_temp_table_files(TABLE_DIR, origin_number)
+        raise
+
+    # 페이지 순서대로 최종 파일명 부여 (파일 교체는 카탈로그 갱신 후)
+    table_info = assign_table_files(
+        entries,
+        lambda entry, table_number: os.path.join(TABLE_DIR, f"M_table_{origin_number}_{table_number}.png")
+    )
+
+    return {
+        'origin_number': origin_number,
+        'table_info': table_info,
+        'processing_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+class PDFReprocessor:
+    def __init__(self, engine='pymupdf', dpi=None, workers=1, excel_filename=DEFAULT_EXCEL_FILENAME,
+                 adaptive_dpi=True, pyramid=False):
+        self.engine = ENGINE_ALIASES.get(engine, engine)
+        self.dpi = dpi or ENGINE_DPI[self.engine]
+        self.workers = max(1, workers)
+        # 테이블별 DPI 자동 선택 (self.dpi는 텍스트가 없는 영역의 기본값)
+        self.adaptive_dpi = adaptive_dpi
+        # OpenCV 감지 엔진(opencv, auto, image)의 다중 해상도 감지
+        self.pyramid = pyramid
+        self.result_store = ResultStore(excel_filename)
+        self.target_version = get_engine_detector_version(engine, self.dpi, adaptive_dpi, pyramid)
+
+        os.makedirs(TABLE_DIR, exist_ok=True)
+
+    def select_entries(self, origin_from=None, origin_to=None, detector_version=None, method=None, force=False):
+        """카탈로그에서 재처리할 PDF 항목 선택"""
+        selected = []
+        skipped = 0
+
+        for record in self.result_store.load_records('main_results'):
+            url = str(record.get('URL') or '')
+            if not url.startswith('PDF_FILE:') or record.get('Origin Number') is None:
+                continue
+
+            origin_number = int(record['Origin Number'])
+            if origin_from is not None and origin_number < origin_from:
+                continue
+            if origin_to is not None and origin_number > origin_to:
+                continue
+
+            tables = self.result_store.table_records(origin_number)
+            recorded_version = record.get('Detector Version')
+
+            # 감지기 버전 필터 ('none'은 기록이 없는 항목)
+            if detector_version is not None:
+                if detector_version == 'none' and recorded_version:
+                    continue
+                if detector_version != 'none' and recorded_version != detector_version:
+                    continue
+
+            # 추출 방식 필터
+            if method and method not in {table.get('Extraction Method') for table in tables}:
+                continue
+
+            # 이미 같은 감지기 버전/파라미터로 추출된 항목은 건너뜀
+            if not force and recorded_version == self.target_version:
+                skipped += 1
+                continue
+
+            pdf_path = os.path.join(ORIGIN_DIR, f'M_origin_{origin_number}.pdf')
+            if not os.path.exists(pdf_path):
+                print(f"❌ PDF 파일 없음: {pdf_path}")
+                continue
+
+            selected.append({
+                'origin_number': origin_number,
+                'url': url,
+                'pdf_path': pdf_path,
+                'old_filenames': [table.get('Table Filename') for table in tables],
+            })
+
+        print(f"📋 재처리 대상: {len(selected)}개 (최신 감지기 버전으로 건너뜀: {skipped}개)")
+        return selected
+
+    def record_result(self, entry, result):
+        """재추출 결과로 카탈로그 행을 제자리에서 갱신한 뒤 테이블 이미지 교체
+
+        카탈로그 갱신이 실패하면 새 임시 파일만 삭제하고 기존 이미지는 그대로 유지
+        """
+        from pdf_processor_pdfplumber import build_table_entry
+
+        table_entries = [build_table_entry(entry['origin_number'], entry['url'], table_info)
+                         for table_info in result['table_info']]
+        try:
+            self.result_store.replace_tables(entry['origin_number'], table_entries, {
+                'Table Count': len(table_entries),
+                'Processing Time': result['processing_time'],
+                'Detector Version': self.target_version,
+            })
+        except Exception:
+            discard_table_files(result['table_info'])
+            raise
+
+        # 새 이미지로 교체 (기존 파일 덮어쓰기)
+        commit_table_files(result['table_info'])
+
+        # 새 결과에 없는 기존 테이블 이미지 삭제 (테이블 수가 줄어든 경우)
+        new_filenames = {os.path.basename(table_info['filename']) for table_info in result['table_info']}
+        for filename in entry['old_filenames']:
+            if filename and filename not in new_filenames:
+                old_path = os.path.join(TABLE_DIR, filename)
+                if os.path.exists(old_path):
+                    os.remove(old_path)
+
+        print(f"✅ 카탈로그 갱신: Origin {entry['origin_number']} ({len(table_entries)}개 테이블)")
+
+    def run(self, entries):
+        """선택된 항목을 병렬로 재추출하고 카탈로그 갱신"""
+        print(f"🔄 PDF 테이블 재처리 시작 (엔진: {self.engine}, {self.dpi} DPI, 워커 {self.workers}개)")
+        print(f"감지기 버전: {self.target_version}")
+        print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        total_tables = 0
+        completed = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(reprocess_document, self.engine, entry['origin_number'], entry['pdf_path'],
+                                self.dpi, self.adaptive_dpi, self.pyramid): entry
+                for entry in entries
+            }
+
+            for future in as_completed(futures):
+                entry = futures[future]
+                completed += 1
+                print(f"\n진행상황: {completed}/{len(entries)} (Origin {entry['origin_number']})")
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ 재처리 실패 (Origin {entry['origin_number']}): {e}")
+                    continue
+
+                try:
+                    self.record_result(entry, result)
+                except Exception as e:
+                    print(f"❌ 카탈로그 갱신 실패 (Origin {entry['origin_number']}) - 기존 이미지 유지: {e}")
+                    continue
+                total_tables += len(result['table_info'])
+
+        # 엑셀 내보내기
+        try:
+            main_count, table_count = self.result_store.export_excel()
+            print(f"\n엑셀 내보내기 완료: {main_count}개 항목, {table_count}개 테이블")
+        except Exception as e:
+            print(f"엑셀 내보내기 실패: {e}")
+
+        print(f"🎉 재처리 완료: {len(entries)}개 PDF, {total_tables}개 테이블")
+        print(f"완료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return True
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="통합 PDF 테이블 재처리 (카탈로그 갱신)")
+    parser.add_argument('--engine', choices=sorted(ENGINE_DPI) + sorted(ENGINE_ALIASES), default='pymupdf',
+                        help="테이블 감지 엔진 (pymupdf: 기본 엔진과 같은 find_tables 감지/페이지 너비 잘라내기 / "
+                             "pymupdf_padded: 강제 재처리 방식 / pdfplumber: pymupdf의 이전 이름, 사용 중단 예정)")
+    parser.add_argument('--dpi', type=int, default=None, help="출력 DPI (기본값: 엔진별, DPI 자동 선택 시 텍스트 없는 영역에 사용)")
+    parser.add_argument('--fixed-dpi', action='store_true', help="테이블별 DPI 자동 선택 대신 --dpi로 고정")
+    parser.add_argument('--pyramid', action='store_true',
+                        help="OpenCV 감지(opencv/auto/image 엔진)를 축소 이미지 후보 탐색 후 후보 영역만 원본 해상도로 수행")
+    parser.add_argument('--workers', type=int, default=1, help="동시에 재처리할 PDF 프로세스 수")
+    parser.add_argument('--origin-from', type=int, default=None, help="Origin Number 시작 (포함)")
+    parser.add_argument('--origin-to', type=int, default=None, help="Origin Number 끝 (포함)")
+    parser.add_argument('--detector-version', default=None, help="기록된 감지기 버전으로 선택 ('none'은 기록 없음)")
+    parser.add_argument('--method', default=None, help="기록된 Extraction Method로 선택")
+    parser.add_argument('--force', action='store_true', help="감지기 버전이 같아도 재처리")
+    parser.add_argument('--dry-run', action='store_true', help="대상만 출력")
+    args = parser.parse_args()
+    if args.engine in ENGINE_ALIASES:
+        print(f"⚠️ 사용 중단 예정인 엔진 이름: {args.engine} → {ENGINE_ALIASES[args.engine]}로 처리합니다.")
+
+    try:
+        reprocessor = PDFReprocessor(engine=args.engine, dpi=args.dpi, workers=args.workers,
+                                     adaptive_dpi=not args.fixed_dpi, pyramid=args.pyramid)
+        entries = reprocessor.select_entries(args.origin_from, args.origin_to, args.detector_version,
+                                             args.method, args.force)
+
+        if args.dry_run:
+            for entry in entries:
+                print(f"  Origin {entry['origin_number']}: {entry['url']}")
+            return True
+
+        if not entries:
+            print("재처리할 항목이 없습니다.")
+            return True
+
+        return reprocessor.run(entries)
+
+    except KeyboardInterrupt:
+        print("\n재처리가 중단되었습니다.")
+        return False
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
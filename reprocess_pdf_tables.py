@@ -6,7 +6,7 @@ PDF 테이블 재처리 스크립트
 
 import os
 import shutil
-import pandas as pd
+from result_store import ResultStore
 from datetime import datetime
 
 def reprocess_pdf_tables():
@@ -24,13 +24,16 @@ def reprocess_pdf_tables():
     # temperal_pdf 디렉토리 생성
     os.makedirs(temperal_pdf_dir, exist_ok=True)
     
-    # 기존 엑셀 파일에서 PDF 파일 정보 읽기
+    # 결과 저장소에서 PDF 파일 정보 읽기 (저장소가 없으면 기존 엑셀 파일에서 가져옴)
     try:
-        main_df = pd.read_excel(excel_file, sheet_name='Main Results')
-        pdf_entries = main_df[main_df['URL'].str.startswith('PDF_FILE:')]
-        print(f"📋 엑셀 파일에서 {len(pdf_entries)}개의 PDF 항목 발견")
+        store = ResultStore(excel_file)
+        try:
+            pdf_entries = store.pdf_origins()
+        finally:
+            store.close()
+        print(f"📋 결과 저장소에서 {len(pdf_entries)}개의 PDF 항목 발견")
     except Exception as e:
-        print(f"❌ 엑셀 파일 읽기 실패: {e}")
+        print(f"❌ 결과 저장소 읽기 실패: {e}")
         return False
     
     if len(pdf_entries) == 0:
@@ -40,15 +43,10 @@ def reprocess_pdf_tables():
     # Origin 디렉토리에서 PDF 파일 찾아서 temperal_pdf로 복사
     pdf_files_copied = 0
     
-    for idx, row in pdf_entries.iterrows():
-        origin_number = row['Origin Number']
+    for origin_number, pdf_filename in pdf_entries:
         pdf_file_path = os.path.join(origin_dir, f'M_origin_{origin_number}.pdf')
         
         if os.path.exists(pdf_file_path):
-            # PDF 파일명 추출
-            url_field = row['URL']
-            pdf_filename = url_field.replace('PDF_FILE: ', '').strip()
-            
             # temperal_pdf로 복사
             target_path = os.path.join(temperal_pdf_dir, pdf_filename)
             shutil.copy2(pdf_file_path, target_path)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+추가 전용 결과 저장소 (SQLite WAL)
+URL/PDF 처리 결과를 항목마다 O(1)로 기록하고, Excel 파일은 실행 종료 시 또는 요청 시
+같은 두 시트(Main Results, Table Details)로 내보내기
+
+실행 방법 (Excel 내보내기):
+python result_store.py
+"""
+
+import os
+import sys
+import json
+import math
+import sqlite3
+import threading
+
+DEFAULT_EXCEL_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Medical_Table_Results.xlsx')
+
+
+def get_store_path(excel_filename):
+    """Excel 파일명에 대응하는 SQLite 파일 경로"""
+    return os.path.splitext(excel_filename)[0] + '.sqlite'
+
+
+def clean_value(value):
+    """Excel에서 읽은 값을 JSON으로 저장 가능한 값으로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if hasattr(value, 'item'):  # numpy 스칼라
+        return value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class ResultStore:
+    def __init__(self, excel_filename=DEFAULT_EXCEL_FILENAME, db_path=None):
+        self.excel_filename = excel_filename
+        self.db_path = db_path or get_store_path(excel_filename)
+        self.lock = threading.Lock()
+
+        is_new = not os.path.exists(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+        # 최초 생성 시 기존 Excel 기록을 가져옴
+        if is_new and os.path.exists(self.excel_filename):
+            self.import_excel(self.excel_filename)
+
+    def create_tables(self):
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS main_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    origin_number INTEGER,
+                    url TEXT,
+                    record TEXT NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS table_details (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    origin_number INTEGER,
+                    url TEXT,
+                    record TEXT NOT NULL
+                )
+            """)
+            # PDF 내용 해시 인덱스 (문서 SHA-256, 페이지별 내용 해시)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pdf_documents (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sha256 TEXT NOT NULL,
+                    origin_number INTEGER,
+                    filename TEXT,
+                    page_count INTEGER,
+                    ingested TEXT
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pdf_pages (
+                    origin_number INTEGER,
+                    page_number INTEGER,
+                    page_hash TEXT,
+                    PRIMARY KEY (origin_number, page_number)
+                )
+            """)
+            # 감시 프로세스가 중단시킨 PDF 기록 (반복 실패 문서 격리 판단용)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pdf_failures (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sha256 TEXT NOT NULL,
+                    filename TEXT,
+                    origin_number INTEGER,
+                    reason TEXT,
+                    failed_at TEXT
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_main_url ON main_results(url)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_main_origin ON main_results(origin_number)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_table_origin ON table_details(origin_number)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_document_sha ON pdf_documents(sha256)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_document_filename ON pdf_documents(filename)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_failure_sha ON pdf_failures(sha256)")
+
+    def import_excel(self, excel_filename):
+        """기존 Excel 두 시트를 저장소로 가져오기"""
+        import pandas as pd
+
+        try:
+            main_df = pd.read_excel(excel_filename, sheet_name='Main Results')
+            table_df = pd.read_excel(excel_filename, sheet_name='Table Details')
+        except Exception as e:
+            print(f"기존 엑셀 파일 가져오기 실패: {e}")
+            return
+
+        with self.lock, self.conn:
+            for record in main_df.to_dict('records'):
+                self.insert_row('main_results', {k: clean_value(v) for k, v in record.items()})
+            for record in table_df.to_dict('records'):
+                self.insert_row('table_details', {k: clean_value(v) for k, v in record.items()})
+
+        print(f"기존 엑셀 파일을 결과 저장소로 가져왔습니다: {len(main_df)}개 항목, {len(table_df)}개 테이블")
+
+    def insert_row(self, table_name, record):
+        origin_number = record.get('Origin Number')
+        self.conn.execute(
+            f"INSERT INTO {table_name} (origin_number, url, record) VALUES (?, ?, ?)",
+            (int(origin_number) if origin_number is not None else None,
+             record.get('URL'),
+             json.dumps(record, ensure_ascii=False, default=str))
+        )
+
+    def insert_document(self, document):
+        self.conn.execute(
+            "INSERT INTO pdf_documents (sha256, origin_number, filename, page_count, ingested) VALUES (?, ?, ?, ?, ?)",
+            (document['sha256'], document['origin_number'], document['filename'],
+             len(document['page_hashes']), document['ingested'])
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pdf_pages (origin_number, page_number, page_hash) VALUES (?, ?, ?)",
+            [(document['origin_number'], page_number, page_hash)
+             for page_number, page_hash in enumerate(document['page_hashes'], 1)]
+        )
+
+    def append_result(self, main_entry, table_entries, document=None):
+        """처리 결과 1건(메인 행 + 테이블 행들 + PDF 해시)을 한 트랜잭션으로 추가"""
+        with self.lock, self.conn:
+            self.insert_row('main_results', main_entry)
+            for table_entry in table_entries:
+                self.insert_row('table_details', table_entry)
+            if document:
+                self.insert_document(document)
+
+    def record_document(self, document):
+        """PDF 해시만 기록 (기존 Origin PDF 색인용)"""
+        with self.lock, self.conn:
+            self.insert_document(document)
+
+    def find_document(self, sha256):
+        """SHA-256이 같은 PDF 기록 반환 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT origin_number, filename FROM pdf_documents WHERE sha256 = ? ORDER BY id LIMIT 1",
+                (sha256,)
+            ).fetchone()
+        return {'origin_number': row[0], 'filename': row[1]} if row else None
+
+    def latest_document(self, filename):
+        """같은 파일명의 가장 최근 PDF 기록 반환 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT origin_number, sha256 FROM pdf_documents WHERE filename = ? ORDER BY id DESC LIMIT 1",
+                (filename,)
+            ).fetchone()
+        return {'origin_number': row[0], 'sha256': row[1]} if row else None
+
+    def indexed_origins(self):
+        """해시가 기록된 Origin Number 집합"""
+        with self.lock:
+            rows = self.conn.execute("SELECT DISTINCT origin_number FROM pdf_documents").fetchall()
+        return {row[0] for row in rows}
+
+    def pdf_origins(self):
+        """PDF 항목의 (Origin Number, 파일명) 목록"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT origin_number, url FROM main_results WHERE url LIKE 'PDF_FILE:%' ORDER BY id"
+            ).fetchall()
+        return [(row[0], row[1].replace('PDF_FILE: ', '').strip()) for row in rows]
+
+    def page_hashes(self, origin_number):
+        """Origin의 페이지별 내용 해시 목록 (페이지 순서)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT page_hash FROM pdf_pages WHERE origin_number = ? ORDER BY page_number",
+                (origin_number,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def table_records(self, origin_number):
+        """Origin의 테이블 상세 행 (기록 순서)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT record FROM table_details WHERE origin_number = ? ORDER BY id",
+                (origin_number,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def record_failure(self, sha256, filename, origin_number, reason, failed_at):
+        """PDF 처리 실패 기록 후 해당 문서의 누적 실패 횟수 반환"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO pdf_failures (sha256, filename, origin_number, reason, failed_at) VALUES (?, ?, ?, ?, ?)",
+                (sha256, filename, origin_number, reason, failed_at)
+            )
+            return self.conn.execute("SELECT COUNT(*) FROM pdf_failures WHERE sha256 = ?", (sha256,)).fetchone()[0]
+
+    def failure_count(self, sha256):
+        """SHA-256이 같은 PDF의 누적 실패 횟수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pdf_failures WHERE sha256 = ?", (sha256,)).fetchone()[0]
+
+    def last_failure(self, sha256):
+        """가장 최근 실패 사유 (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT reason FROM pdf_failures WHERE sha256 = ? ORDER BY id DESC LIMIT 1", (sha256,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def existing_urls(self):
+        """기록된 모든 URL (PDF는 'PDF_FILE: ...' 형식)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT DISTINCT url FROM main_results WHERE url IS NOT NULL").fetchall()
+        return {row[0] for row in rows}
+
+    def origin_for_url(self, url):
+        """URL에 배정된 가장 최근 Origin Number (없으면 None)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT origin_number FROM main_results WHERE url = ? ORDER BY id DESC LIMIT 1", (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def max_origin_number(self):
+        """가장 큰 Origin Number (기록이 없으면 None)"""
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(origin_number) FROM main_results").fetchone()
+        return row[0]
+
+    def count_main(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM main_results").fetchone()[0]
+
+    def count_tables(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM table_details").fetchone()[0]
+
+    def load_records(self, table_name, order_by='id'):
+        """기록 순서대로 모든 행 반환"""
+        with self.lock:
+            rows = self.conn.execute(f"SELECT record FROM {table_name} ORDER BY {order_by}").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def replace_tables(self, origin_number, table_entries, main_updates=None):
+        """Origin의 테이블 상세 행을 제자리에서 갱신 (재처리용)
+
+        기존 행은 순서대로 덮어쓰고, 남는 기존 행은 삭제, 부족한 행은 추가.
+        main_updates가 있으면 해당 Origin의 메인 행 값도 갱신
+        """
+        with self.lock, self.conn:
+            row_ids = [row[0] for row in self.conn.execute(
+                "SELECT id FROM table_details WHERE origin_number = ? ORDER BY id", (origin_number,)
+            ).fetchall()]
+
+            for row_id, table_entry in zip(row_ids, table_entries):
+                self.conn.execute(
+                    "UPDATE table_details SET url = ?, record = ? WHERE id = ?",
+                    (table_entry.get('URL'), json.dumps(table_entry, ensure_ascii=False, default=str), row_id)
+                )
+            for row_id in row_ids[len(table_entries):]:
+                self.conn.execute("DELETE FROM table_details WHERE id = ?", (row_id,))
+            for table_entry in table_entries[len(row_ids):]:
+                self.insert_row('table_details', table_entry)
+
+            if main_updates:
+                row = self.conn.execute(
+                    "SELECT id, record FROM main_results WHERE origin_number = ? ORDER BY id DESC LIMIT 1",
+                    (origin_number,)
+                ).fetchone()
+                if row:
+                    record = json.loads(row[1])
+                    record.update(main_updates)
+                    self.conn.execute(
+                        "UPDATE main_results SET record = ? WHERE id = ?",
+                        (json.dumps(record, ensure_ascii=False, default=str), row[0])
+                    )
+
+    def export_excel(self, excel_filename=None):
+        """저장소 전체를 Excel 두 시트로 내보내기"""
+        import pandas as pd
+
+        excel_filename = excel_filename or self.excel_filename
+        temp_filename = os.path.join(os.path.dirname(os.path.abspath(excel_filename)),
+                                     '~tmp_' + os.path.basename(excel_filename))
+
+        with pd.ExcelWriter(temp_filename, engine='openpyxl') as writer:
+            # 메인 결과 시트
+            main_df = pd.DataFrame(self.load_records('main_results'))
+            main_df.to_excel(writer, sheet_name='Main Results', index=False)
+
+            # 테이블 상세 시트
+            # (재처리로 추가된 행도 해당 Origin 위치에 오도록 Origin 순서로 정렬)
+            table_df = pd.DataFrame(self.load_records('table_details', order_by='origin_number, id'))
+            table_df.to_excel(writer, sheet_name='Table Details', index=False)
+
+        os.replace(temp_filename, excel_filename)
+        return len(main_df), len(table_df)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def main():
+    """결과 저장소를 Excel로 내보내기"""
+    excel_filename = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_EXCEL_FILENAME
+    store = ResultStore(excel_filename)
+    try:
+        main_count, table_count = store.export_excel()
+        print(f"엑셀 내보내기 완료: {excel_filename} ({main_count}개 항목, {table_count}개 테이블)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
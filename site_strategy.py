@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+사이트별 처리 전략 테이블
+정적 HTML에 테이블이 있는 페이지는 브라우저 없이 처리하고, 테이블이 없거나 스크립트로
+생성되는 페이지만 브라우저로 처리. 결정은 호스트/경로 패턴별로 파일에 저장하여 재사용
+"""
+
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+STRATEGY_STATIC = 'static'
+STRATEGY_BROWSER = 'browser'
+
+STRATEGY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'site_strategy.json')
+
+BROWSER_AFTER = 3           # 브라우저 필요 판정이 연속 이 횟수만큼 나와야 패턴을 browser로 전환
+STATIC_RECHECK_EVERY = 20   # browser 패턴도 이 횟수마다 한 번씩 정적 HTML을 다시 시도
+
+# 기존에 코드로 고정되어 있던 규칙 (단일 HTML에 모든 표가 숨겨진 사이트)
+DEFAULT_RULES = {
+    'davoshospital.co.kr': STRATEGY_STATIC,
+    '*/page06_new.html': STRATEGY_STATIC,
+}
+
+# 테이블을 스크립트로 생성하는 페이지의 흔적
+SCRIPT_TABLE_MARKERS = [
+    "createElement('table')", 'createElement("table")', '.DataTable(', 'jqGrid', 'ag-grid',
+    '__NEXT_DATA__', 'ng-app', 'data-reactroot',
+]
+
+
+def get_url_pattern(url):
+    """URL을 호스트/경로 패턴으로 변환 (숫자는 *로 치환, 쿼리 제외)"""
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    path = re.sub(r'\d+', '*', parsed.path or '/')
+    return f"{host}{path}"
+
+
+def is_data_table(table):
+    """데이터 테이블 판정 - 다른 테이블을 감싸지 않고(레이아웃/내비게이션 테이블 제외) 2행 이상, 2칸 이상, 텍스트 있음"""
+    if table.find('table') is not None:
+        return False
+    rows = table.find_all('tr')
+    if len(rows) < 2:
+        return False
+    if max(len(row.find_all(['td', 'th'])) for row in rows) < 2:
+        return False
+    return bool(table.get_text(strip=True))
+
+
+def find_data_tables(soup):
+    """정적 HTML의 데이터 테이블(중첩 테이블 중 가장 안쪽) 목록 - 문서 순서"""
+    return [table for table in soup.find_all('table') if is_data_table(table)]
+
+
+def analyze_static_html(soup, html_text):
+    """정적 HTML에서 데이터 테이블 존재 여부와 스크립트 생성 흔적 분석"""
+    script_markers = [marker for marker in SCRIPT_TABLE_MARKERS if marker in html_text]
+    return {
+        'data_tables': len(find_data_tables(soup)),
+        'script_markers': script_markers,
+    }
+
+
+def decide_strategy(analysis):
+    """정적 분석 결과로 처리 전략 결정
+
+    스크립트 생성 흔적이 있으면 정적 HTML에 테이블이 있어도 browser
+    (정적 테이블은 일부일 뿐 실제 데이터 테이블은 스크립트가 만들 수 있음)
+    """
+    if analysis['script_markers']:
+        return STRATEGY_BROWSER, f"스크립트 생성 테이블 ({', '.join(analysis['script_markers'][:3])})"
+    if analysis['data_tables'] > 0:
+        return STRATEGY_STATIC, f"정적 HTML에 데이터 테이블 {analysis['data_tables']}개"
+    return STRATEGY_BROWSER, "정적 HTML에 테이블 없음"
+
+
+class SiteStrategyTable:
+    def __init__(self, path=STRATEGY_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = self.load()
+        self.browser_uses = {}  # browser 패턴별 마지막 정적 재확인 이후 사용 횟수 (메모리에만 유지)
+
+    def load(self):
+        """저장된 전략 테이블 로드"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"사이트 전략 테이블 로드 실패: {e}")
+        return {}
+
+    def save(self):
+        """전략 테이블 저장 (임시 파일 후 교체)"""
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"사이트 전략 테이블 저장 실패: {e}")
+
+    def lookup(self, url):
+        """URL에 대해 기억된 전략 반환 (없으면 None)
+
+        browser로 기억된 패턴도 STATIC_RECHECK_EVERY번마다 None을 반환하여 정적 HTML을 다시 확인
+        """
+        pattern = get_url_pattern(url)
+        host = (urlparse(url).hostname or '').lower()
+
+        with self.lock:
+            entry = self.entries.get(pattern)
+            if entry and entry.get('strategy') == STRATEGY_BROWSER:
+                uses = self.browser_uses.get(pattern, 0) + 1
+                self.browser_uses[pattern] = uses % STATIC_RECHECK_EVERY
+                if uses >= STATIC_RECHECK_EVERY:
+                    return None
+        if entry and entry.get('strategy'):
+            return entry['strategy']
+
+        for rule, strategy in DEFAULT_RULES.items():
+            if rule.startswith('*/'):
+                if url.split('?')[0].endswith(rule[1:]):
+                    return strategy
+            elif host == rule or host.endswith('.' + rule):
+                return strategy
+        return None
+
+    def remember(self, url, strategy, reason):
+        """URL 패턴에 대한 관찰 결과 저장
+
+        정적 처리 성공은 바로 static으로 기록 (browser 판정 횟수 초기화),
+        브라우저 필요 판정은 연속 BROWSER_AFTER번 나와야 browser로 전환
+        """
+        pattern = get_url_pattern(url)
+        with self.lock:
+            entry = self.entries.get(pattern, {})
+            previous = entry.get('strategy')
+            if strategy == STRATEGY_BROWSER:
+                browser_votes = entry.get('browser_votes', 0) + 1
+                decided = STRATEGY_BROWSER if browser_votes >= BROWSER_AFTER else previous
+            else:
+                browser_votes = 0
+                decided = strategy
+                self.browser_uses.pop(pattern, None)
+
+            self.entries[pattern] = {
+                'strategy': decided,
+                'reason': reason,
+                'browser_votes': browser_votes,
+                'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self.save()
+        if previous != decided:
+            print(f"사이트 전략 기록: {pattern} → {decided} ({reason})")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+매우 긴 페이지를 위한 타일 캡처
+뷰포트 크기 스트립 단위로 스크린샷을 찍고, 스트립을 이어붙인 행을 PNG 파일로 바로 기록하여
+페이지 높이와 관계없이 메모리 사용량을 스트립 1개 수준으로 유지
+"""
+
+import io
+import struct
+import zlib
+from PIL import Image
+
+# position: fixed/sticky 요소 숨기기 (첫 스트립 이후 반복 캡처 방지)
+HIDE_STICKY_SCRIPT = """
+var hidden = 0;
+var elements = document.body ? document.body.getElementsByTagName('*') : [];
+for (var i = 0; i < elements.length; i++) {
+    var el = elements[i];
+    var position = window.getComputedStyle(el).position;
+    if (position === 'fixed' || position === 'sticky') {
+        el.setAttribute('data-tiled-capture-visibility', el.style.visibility || '');
+        el.style.visibility = 'hidden';
+        hidden++;
+    }
+}
+return hidden;
+"""
+
+RESTORE_STICKY_SCRIPT = """
+var elements = document.querySelectorAll('[data-tiled-capture-visibility]');
+for (var i = 0; i < elements.length; i++) {
+    elements[i].style.visibility = elements[i].getAttribute('data-tiled-capture-visibility');
+    elements[i].removeAttribute('data-tiled-capture-visibility');
+}
+"""
+
+
+class StreamingPNGWriter:
+    """행 단위로 픽셀을 받아 IDAT 청크로 바로 기록하는 RGB PNG 작성기"""
+
+    def __init__(self, path, width, height, compress_level=6, chunk_size=1 << 20):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.chunk_size = chunk_size
+
+        self.file = open(path, 'wb')
+        self.compressor = zlib.compressobj(compress_level)
+        self.pending = bytearray()
+
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        # 8비트 RGB, 비인터레이스
+        self.write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def write_chunk(self, chunk_type, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    def write_rows(self, image):
+        """RGB 이미지(너비 = PNG 너비)의 모든 행을 기록"""
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        if image.width != self.width:
+            # 스크롤바 등으로 너비가 다르면 자르거나 흰색으로 채움
+            fitted = Image.new('RGB', (self.width, image.height), 'white')
+            fitted.paste(image.crop((0, 0, min(image.width, self.width), image.height)), (0, 0))
+            image = fitted
+
+        rows = min(image.height, self.height - self.rows_written)
+        raw = image.tobytes()
+        stride = self.width * 3
+        for row in range(rows):
+            # 필터 타입 0(None) + 행 데이터
+            self.pending += b'\x00'
+            self.pending += raw[row * stride:(row + 1) * stride]
+            if len(self.pending) >= self.chunk_size:
+                self.flush_pending()
+        self.rows_written += rows
+
+    def flush_pending(self):
+        compressed = self.compressor.compress(bytes(self.pending))
+        self.pending = bytearray()
+        if compressed:
+            self.write_chunk(b'IDAT', compressed)
+
+    def close(self):
+        """남은 행을 흰색으로 채우고 파일 마무리"""
+        while self.rows_written < self.height:
+            rows = min(1024, self.height - self.rows_written)
+            self.write_rows(Image.new('RGB', (self.width, rows), 'white'))
+        self.flush_pending()
+        self.write_chunk(b'IDAT', self.compressor.flush())
+        self.write_chunk(b'IEND', b'')
+        self.file.close()
+
+
+def capture_page_tiled(driver, png_filename, total_width, total_height, waiter=None, strip_height=1080):
+    """뷰포트 높이 스트립으로 전체 페이지를 캡처하여 PNG로 스트리밍 저장"""
+    # 너비는 페이지 너비로, 높이는 스트립 높이로 고정 (렌더러 메모리 제한)
+    driver.set_window_size(total_width, strip_height)
+    driver.execute_script("window.scrollTo(0, 0);")
+    if waiter:
+        waiter.wait_for_settle(driver, 1)
+
+    viewport_height = driver.execute_script("return window.innerHeight;")
+    viewport_width = driver.execute_script("return document.documentElement.clientWidth;")
+
+    first_strip = Image.open(io.BytesIO(driver.get_screenshot_as_png()))
+    scale = first_strip.height / viewport_height if viewport_height else 1.0
+
+    out_width = int(round(min(viewport_width, total_width) * scale))
+    out_height = int(round(total_height * scale))
+    writer = StreamingPNGWriter(png_filename, out_width, out_height)
+
+    strips = 0
+    sticky_hidden = False
+    try:
+        strip = first_strip
+        strip_top = 0
+        while True:
+            # 이미 기록한 행과 겹치는 부분은 건너뛰기 (마지막 스트립은 스크롤이 페이지 끝에서 고정됨)
+            skip = max(0, writer.rows_written - int(round(strip_top * scale)))
+            if skip < strip.height:
+                writer.write_rows(strip.crop((0, skip, strip.width, strip.height)))
+            strip.close()
+            strips += 1
+
+            if writer.rows_written >= out_height:
+                break
+
+            # 첫 스트립 이후에는 고정/스티키 헤더가 반복되지 않도록 숨김
+            if not sticky_hidden:
+                driver.execute_script(HIDE_STICKY_SCRIPT)
+                sticky_hidden = True
+
+            driver.execute_script(f"window.scrollTo(0, {int(writer.rows_written / scale)});")
+            if waiter:
+                waiter.wait_for_settle(driver, 0.3, quiet_ms=100)
+            strip_top = driver.execute_script("return window.scrollY || window.pageYOffset;")
+            strip = Image.open(io.BytesIO(driver.get_screenshot_as_png()))
+
+            # 스크롤이 더 이상 진행되지 않으면 종료 (남은 부분은 흰색)
+            if int(round((strip_top + viewport_height) * scale)) <= writer.rows_written:
+                strip.close()
+                break
+    finally:
+        if sticky_hidden:
+            driver.execute_script(RESTORE_STICKY_SCRIPT)
+        writer.close()
+        driver.execute_script("window.scrollTo(0, 0);")
+
+    print(f"타일 캡처 완료: {strips}개 스트립, {out_width}x{out_height}")
+    return True
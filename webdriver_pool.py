@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Chrome WebDriver 풀
+브라우저를 한 번만 띄워 여러 URL에 재사용하고, 드라이버 경로는 캐시하여 오프라인에서도 사용
+"""
+
+import os
+import json
+import queue
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DRIVER_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.chromedriver_path.json')
+
+_driver_path_lock = threading.Lock()
+_resolved_driver_path = None
+
+
+def resolve_chromedriver_path(cache_file=DRIVER_CACHE_FILE):
+    """ChromeDriver 경로를 한 번만 확인하고 파일에 캐시 (네트워크 조회 최소화)"""
+    global _resolved_driver_path
+
+    with _driver_path_lock:
+        if _resolved_driver_path and os.path.exists(_resolved_driver_path):
+            return _resolved_driver_path
+
+        # 캐시된 경로 우선 사용
+        try:
+            if os.path.exists(cache_file):
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cached_path = json.load(f).get('driver_path')
+                if cached_path and os.path.exists(cached_path):
+                    _resolved_driver_path = cached_path
+                    print(f"캐시된 ChromeDriver 사용: {cached_path}")
+                    return cached_path
+        except Exception as e:
+            print(f"ChromeDriver 캐시 읽기 실패: {e}")
+
+        # 캐시가 없거나 무효하면 webdriver-manager로 설치/조회
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+        _resolved_driver_path = driver_path
+
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'driver_path': driver_path}, f)
+        except Exception as e:
+            print(f"ChromeDriver 캐시 저장 실패: {e}")
+
+        print(f"ChromeDriver 경로 확인: {driver_path}")
+        return driver_path
+
+
+class WebDriverPool:
+    def __init__(self, options_factory, size=1, max_pages_per_driver=50, max_memory_mb=1500,
+                 window_size=(1920, 1080)):
+        self.options_factory = options_factory
+        self.size = max(1, size)
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_memory_mb = max_memory_mb
+        self.window_size = window_size
+
+        self._idle = queue.Queue()
+        self._page_counts = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        if self.max_memory_mb and psutil is None:
+            print("psutil이 설치되지 않아 브라우저 메모리 기준 재시작을 사용하지 않습니다 (pip install psutil).")
+
+    def create_driver(self):
+        """새 Chrome 브라우저 생성"""
+        service = Service(resolve_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=self.options_factory())
+        driver.set_window_size(*self.window_size)
+        return driver
+
+    def acquire(self, timeout=None):
+        """유휴 브라우저를 가져오고, 없으면 풀 크기 안에서 새로 생성"""
+        if self._closed:
+            raise RuntimeError("WebDriver 풀이 이미 종료되었습니다.")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                driver = self.create_driver()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self._page_counts[id(driver)] = 0
+            print(f"WebDriver 풀: 브라우저 시작 ({self._created}/{self.size})")
+            return driver
+
+        return self._idle.get(timeout=timeout)
+
+    def release(self, driver, broken=False):
+        """사용한 브라우저를 상태 초기화 후 풀에 반환 (필요시 재시작)"""
+        if driver is None:
+            return
+
+        self._page_counts[id(driver)] = self._page_counts.get(id(driver), 0) + 1
+
+        if not broken and not self._closed:
+            if self._page_counts[id(driver)] >= self.max_pages_per_driver:
+                print(f"WebDriver 풀: {self.max_pages_per_driver}페이지 처리 후 브라우저 재시작")
+                broken = True
+            elif self.max_memory_mb and self.get_driver_memory_mb(driver) > self.max_memory_mb:
+                print(f"WebDriver 풀: 메모리 한도({self.max_memory_mb}MB) 초과로 브라우저 재시작")
+                broken = True
+            elif not self.reset_driver(driver):
+                broken = True
+
+        if broken or self._closed:
+            self.discard(driver)
+            return
+
+        self._idle.put(driver)
+
+    def discard(self, driver):
+        """브라우저를 종료하고 풀 슬롯 반환"""
+        self._page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"WebDriver 종료 실패: {e}")
+        with self._lock:
+            self._created -= 1
+
+    def reset_driver(self, driver):
+        """다음 URL을 위해 쿠키, 스토리지, 윈도우 크기 초기화"""
+        try:
+            origin = None
+            try:
+                origin = driver.execute_script(
+                    "window.localStorage.clear(); window.sessionStorage.clear(); return window.location.origin;")
+            except Exception:
+                pass  # about:blank 등 스토리지 접근이 불가한 페이지
+            driver.delete_all_cookies()
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                if origin and origin != 'null':
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            except Exception:
+                pass
+            driver.get('about:blank')
+            driver.set_window_size(*self.window_size)
+            return True
+        except Exception as e:
+            print(f"WebDriver 상태 초기화 실패: {e}")
+            return False
+
+    def get_driver_memory_mb(self, driver):
+        """chromedriver와 하위 브라우저 프로세스의 RSS 합계 (MB) - psutil이 없으면 0"""
+        if psutil is None:
+            return 0
+
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def close_all(self):
+        """풀의 모든 브라우저 종료"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(driver)
+        print("WebDriver 풀 종료")